@@ -0,0 +1,117 @@
+"""
+AsyncTangoAPIClient проти локального фейкового gateway.
+
+aiohttp-сервер на 127.0.0.1 відтворює check-in (видає Tango-VT з exp
+у JWT) і профіль стрімера (liveStats.points), з затримкою на кожен
+запит. Два прогони:
+
+  * пропускна здатність — REQUESTS запитів get_diamonds через пул
+    TANGO_HTTP_MAX_CONNECTIONS з'єднань, друкується запитів/с;
+  * відкликання токену — gateway перестає приймати поточний токен,
+    BURST одночасних запитів отримують 401 і повторюють запит. Очікується
+    рівно одна нова реєстрація і жодного втраченого результату.
+
+    python benchmarks/bench_tango_gateway.py
+"""
+import asyncio
+import base64
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.tango_api_client import AsyncTangoAPIClient, TangoAPIClient
+
+API_LATENCY = 0.005      # секунди на запит профілю
+CHECK_IN_LATENCY = 0.2   # секунди на реєстрацію visitor token
+REQUESTS = 3000
+BURST = 200
+
+
+class FakeGateway:
+    """Мінімальний Tango gateway: check-in і профіль"""
+
+    def __init__(self):
+        self.check_ins = 0
+        self.profiles = 0
+        self.rejected = 0
+        self.valid_token = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post('/visitor-lobby/api/public/visitors/v1/check-in', self.check_in)
+        app.router.add_get('/proxycador/api/profiles/v2/single', self.profile)
+        return app
+
+    def revoke(self) -> None:
+        """Поточний токен більше не приймається (exp у ньому ще не минув)"""
+        self.valid_token = None
+
+    async def check_in(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(CHECK_IN_LATENCY)
+        self.check_ins += 1
+        payload = json.dumps({'exp': int(time.time()) + 7 * 86400}).encode()
+        self.valid_token = 'h.{}.s{}'.format(
+            base64.b64encode(payload).decode().rstrip('='), self.check_ins
+        )
+        response = web.json_response({})
+        response.set_cookie('Tango-VT', self.valid_token)
+        return response
+
+    async def profile(self, request: web.Request) -> web.Response:
+        await asyncio.sleep(API_LATENCY)
+        if request.cookies.get('Tango-VT') != self.valid_token:
+            self.rejected += 1
+            return web.Response(status=401)
+        self.profiles += 1
+        return web.json_response({'liveStats': {'points': int(request.query['id'])}})
+
+
+async def main() -> None:
+    gateway = FakeGateway()
+    server = TestServer(gateway.app(), host='127.0.0.1')
+    await server.start_server()
+    token_file = os.path.join(tempfile.mkdtemp(prefix='bench_tango_'), 'tango_token.json')
+    client = AsyncTangoAPIClient(
+        TangoAPIClient(token_file=token_file, gateway=str(server.make_url('')).rstrip('/'))
+    )
+
+    try:
+        # Прогрів: перша реєстрація і з'єднання пулу
+        await asyncio.gather(*(client.get_diamonds(str(i)) for i in range(client.max_connections)))
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(client.get_diamonds(str(i)) for i in range(REQUESTS)))
+        elapsed = time.perf_counter() - started
+        assert results == list(range(REQUESTS))
+        print(
+            f"пропускна здатність: {REQUESTS} запитів за {elapsed:.2f} с — "
+            f"{REQUESTS / elapsed:.0f} запитів/с (пул {client.max_connections})"
+        )
+
+        check_ins, rejected = gateway.check_ins, gateway.rejected
+        gateway.revoke()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(client.get_diamonds(str(i)) for i in range(BURST)))
+        elapsed = time.perf_counter() - started
+        print(
+            f"відкликання токену: {BURST} запитів за {elapsed:.2f} с, "
+            f"401: {gateway.rejected - rejected}, реєстрацій: {gateway.check_ins - check_ins}, "
+            f"втрачено: {sum(r is None for r in results)}"
+        )
+        assert results == list(range(BURST))
+        assert gateway.check_ins - check_ins == 1
+    finally:
+        await client.close()
+        client.token_client.close()
+        await server.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
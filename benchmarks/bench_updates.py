@@ -0,0 +1,153 @@
+"""
+Затримка callback'ів під паралельними користувачами.
+
+Справжні Application (python-telegram-bot) і обробники TangoBot на
+тимчасовій SQLite-базі; мережа Bot API підмінена FakeTelegram
+(API_LATENCY на виклик). Один користувач тримає потік БД повільною
+операцією (як VACUUM чи важкий звіт), решта тисне «Головне меню».
+Порівнюються послідовна обробка апдейтів (як було) і
+PerUserUpdateProcessor, друкуються p50/p90/p99 затримки.
+
+    python benchmarks/bench_updates.py
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update
+from telegram.ext import Application, CallbackQueryHandler, TypeHandler
+from telegram.request import BaseRequest
+
+from bot import TangoBot
+from handlers.update_processor import PerUserUpdateProcessor
+
+API_LATENCY = 0.02    # секунди на виклик Bot API
+USERS = 20
+CLICKS_PER_USER = 8
+SLOW_USER = 999
+SLOW_SECONDS = 1.5    # тривалість повільної операції в потоці БД
+
+
+class FakeTelegram(BaseRequest):
+    """Bot API без мережі: кожен виклик триває API_LATENCY"""
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    @property
+    def read_timeout(self):
+        return 5
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        await asyncio.sleep(API_LATENCY)
+        name = url.rsplit('/', 1)[-1]
+        if name == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'bench', 'username': 'bench'}
+        elif name == 'editMessageText':
+            result = {'message_id': 1, 'date': 0, 'chat': {'id': 1, 'type': 'private'}, 'text': '-'}
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+
+def callback_update(bot, update_id: int, user_id: int, data: str) -> Update:
+    user = {'id': user_id, 'is_bot': False, 'first_name': f'user{user_id}'}
+    return Update.de_json({
+        'update_id': update_id,
+        'callback_query': {
+            'id': str(update_id), 'from': user, 'chat_instance': 'bench', 'data': data,
+            'message': {'message_id': 1, 'date': 0, 'text': 'menu',
+                        'chat': {'id': user_id, 'type': 'private'}},
+        },
+    }, bot)
+
+
+async def run(concurrent: bool, warm_cache: bool) -> list:
+    """Затримки (мс) callback'ів звичайних користувачів"""
+    bot = TangoBot('1:bench')
+    for user_id in list(range(1, USERS + 1)) + [SLOW_USER]:
+        bot.db.add_bot_user(user_id, f'user{user_id}', 'admin', 1)
+    if warm_cache:
+        for user_id in range(1, USERS + 1):
+            bot.db.get_bot_user_by_telegram_id(user_id)
+
+    bot.db.bench_slow = lambda: time.sleep(SLOW_SECONDS)
+
+    async def slow(query, user_id, arg):
+        await bot.adb.bench_slow()
+    bot.callback_router.registry.exact('bench_slow', slow)
+
+    builder = (
+        Application.builder().token('1:bench').updater(None)
+        .request(FakeTelegram()).get_updates_request(FakeTelegram())
+    )
+    if concurrent:
+        builder = builder.concurrent_updates(PerUserUpdateProcessor(64))
+    app = builder.build()
+    bot.application = app
+    app.bot_data['bot_instance'] = bot
+
+    sent, done = {}, {}
+
+    async def finished(update, context):
+        done[update.update_id] = time.perf_counter()
+    app.add_handler(CallbackQueryHandler(bot.button_callback))
+    app.add_handler(TypeHandler(Update, finished), group=1)
+
+    random.seed(1)
+    schedule = [(0.0, SLOW_USER, 'bench_slow'), (1.0, SLOW_USER, 'bench_slow')]
+    schedule += [
+        (random.uniform(0, 2.5), user_id, 'main_menu')
+        for user_id in range(1, USERS + 1) for _ in range(CLICKS_PER_USER)
+    ]
+    schedule.sort()
+
+    await app.initialize()
+    await app.start()
+    started = time.perf_counter()
+    for update_id, (at, user_id, data) in enumerate(schedule, 1):
+        await asyncio.sleep(max(0.0, started + at - time.perf_counter()))
+        sent[update_id] = time.perf_counter()
+        await app.update_queue.put(callback_update(app.bot, update_id, user_id, data))
+    while len(done) < len(schedule):
+        await asyncio.sleep(0.01)
+    await app.stop()
+    await app.shutdown()
+    bot.adb.close()
+    bot.db.close()
+
+    return sorted(
+        (done[update_id] - sent[update_id]) * 1000
+        for update_id, (_, user_id, _) in enumerate(schedule, 1) if user_id != SLOW_USER
+    )
+
+
+async def main() -> None:
+    for concurrent, warm_cache, label in (
+        (False, False, 'послідовно'),
+        (True, False, 'PerUserUpdateProcessor'),
+        (True, True, 'PerUserUpdateProcessor, теплий UserCache'),
+    ):
+        # Кожен прогін — на чистій базі у тимчасовій теці
+        os.chdir(tempfile.mkdtemp(prefix='bench_updates_'))
+        latencies = await run(concurrent, warm_cache)
+
+        def pct(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+        print(
+            f"{label:42} n={len(latencies)}  p50={pct(0.5):7.1f}  p90={pct(0.9):7.1f}  "
+            f"p99={pct(0.99):7.1f}  max={latencies[-1]:7.1f} мс"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
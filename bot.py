@@ -1,41 +1,66 @@
 """
 Основний клас Tango Bot
 """
+import asyncio
 import logging
-from typing import Dict
+import os
+import time
+from typing import Optional
+
 from telegram import Update
 from telegram.ext import ContextTypes
 
-from database_manager import DatabaseManager
-from services.tango_api_client import TangoAPIClient
-from services.gifter_search import GifterSearcher
+from database_manager import AsyncDatabaseManager, DatabaseManager
 from handlers.menu_handlers import MenuHandlers
 from handlers.streamer_handlers import StreamerHandlers
 from handlers.gifter_handlers import GifterHandlers
 from handlers.search_handlers import SearchHandlers
 from handlers.mentor_handlers import MentorHandlers
 from handlers.callback_router import CallbackRouter
+from handlers.state_router import StateRouter
 from handlers.bot_users_handlers import BotUsersHandlers
 from services.diamonds_service import DiamondsService
 from services.google_sheets_service import GoogleSheetsService
+from notification_service import NotificationService
 from services.scheduler import TaskScheduler
+from services.search_jobs import SearchJobRunner
+from services.session_store import SessionStore
 from handlers.diamonds_handlers import DiamondsHandlers
+from handlers.audit_handlers import AuditHandlers
+from config import STARTUP_RSS_BUDGET_MB, STARTUP_TIME_BUDGET
+
+
+def _current_rss_mb() -> Optional[float]:
+    """Поточний (не піковий) RSS процесу, МБ; None — якщо /proc недоступний (Windows)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
 
 
 class TangoBot:
     """Основний клас Telegram бота для роботи з Tango"""
     
     def __init__(self, token: str):
+        self._init_started = time.perf_counter()
         self.token = token
         self.application = None  # Буде встановлено в main.py
         self.db = DatabaseManager()
+        self.adb = AsyncDatabaseManager(self.db)  # для async handler'ів
         self.diamonds_service = DiamondsService(db=self.db, bot=self)
         self.sheets_service = GoogleSheetsService(db=self.db, bot=self)
         self.scheduler = TaskScheduler(bot=self)
-        self.api_client = TangoAPIClient()  # API клієнт
-        self.gifter_searcher = GifterSearcher()  # Пошук дарувальників
-        self.user_states: Dict[int, str] = {}
-        self.temp_data: Dict[int, Dict] = {}
+        self.search_jobs = SearchJobRunner(bot=self)  # фонова черга пошуку дарувальників
+        # API клієнти створюються при першому зверненні (див. властивості нижче);
+        # браузери для selenium-пошуку запускає SearchJobRunner (BrowserPool) у фоні
+        self._api_client = None
+        self._async_api_client = None
+        self._missed_update_task: Optional[asyncio.Task] = None
+        # Стан розмови: TTL рахується від встановлення стану, не від читання
+        self.user_states = SessionStore('user_states', touch_on_read=False)
+        self.temp_data = SessionStore('temp_data')
         
         # Ініціалізуємо handler'и
         self.menu_handlers = MenuHandlers(self)
@@ -43,11 +68,33 @@ class TangoBot:
         self.gifter_handlers = GifterHandlers(self)
         self.search_handlers = SearchHandlers(self)
         self.mentor_handlers = MentorHandlers(self)
-        self.callback_router = CallbackRouter(self)
         self.bot_users_handlers = BotUsersHandlers(self)
         self.diamonds_handlers = DiamondsHandlers(bot=self)
+        self.audit_handlers = AuditHandlers(self)
+        # Роутери останніми: handler'и реєструють у них свої callback'и та стани
+        self.callback_router = CallbackRouter(self)
+        self.state_router = StateRouter(self)
+        self.state_router.load_sessions()
 
         logging.info("TangoBot initialized successfully")
+
+    # ── ліниві клієнти Tango API ──
+
+    @property
+    def api_client(self):
+        """Синхронний клієнт Tango API (requests), створюється при першому зверненні"""
+        if self._api_client is None:
+            from services.tango_api_client import TangoAPIClient
+            self._api_client = TangoAPIClient()
+        return self._api_client
+
+    @property
+    def async_api_client(self):
+        """Асинхронний клієнт Tango API (aiohttp), ділить токен з api_client"""
+        if self._async_api_client is None:
+            from services.tango_api_client import AsyncTangoAPIClient
+            self._async_api_client = AsyncTangoAPIClient(self.api_client)
+        return self._async_api_client
     
     async def on_startup(application) -> None:
         """Викликається після ініціалізації бота"""
@@ -58,14 +105,59 @@ class TangoBot:
         # Запуск фонових сервісів
         await bot.sheets_service.start_background_worker()
         await bot.scheduler.start()
+        await bot.search_jobs.start()
+        await bot.state_router.start_sweeper()
 
-        # Перевірка пропущеного місячного оновлення
-        await bot.diamonds_service.check_missed_monthly_update()
+        # Сповіщення в канал на основі журналу змін (потрібен application.bot)
+        bot.notification_service = NotificationService(application.bot, bot.db)
+        await bot.notification_service.start_change_listener()
 
         # Початкова синхронізація з Sheets (у фоні)
         bot.sheets_service.schedule_all()
 
-        logging.info("Bot startup complete")
+        # Бот готовий приймати /start: міряємо тут, до довгих фонових задач
+        bot._check_startup_budget()
+
+        # Пропущене місячне оновлення може тривати хвилини — у фоні, не блокуючи /start
+        bot._missed_update_task = asyncio.create_task(bot._run_missed_monthly_update())
+
+    async def on_shutdown(application) -> None:
+        """Викликається при зупинці бота"""
+        bot = application.bot_data.get('bot_instance')
+        if bot is None:
+            return
+
+        await bot.state_router.save_sessions()
+        await bot.search_jobs.stop()
+        # Перерваний місячний run продовжиться при наступному старті
+        if bot._missed_update_task is not None and not bot._missed_update_task.done():
+            bot._missed_update_task.cancel()
+        # Закриваємо лише клієнти, які встигли створитись
+        if bot._async_api_client is not None:
+            await bot._async_api_client.close()
+        if bot._api_client is not None:
+            bot._api_client.close()
+
+    def _check_startup_budget(self) -> None:
+        """Час холодного старту і поточний RSS — у лог; перевищення бюджету — warning"""
+        elapsed = time.perf_counter() - self._init_started
+        rss = _current_rss_mb()
+        startup = f"{elapsed:.2f} с" + (f", RSS {rss:.1f} МБ" if rss is not None else "")
+        if elapsed > STARTUP_TIME_BUDGET or (rss is not None and rss > STARTUP_RSS_BUDGET_MB):
+            logging.warning(
+                f"Bot startup over budget: {startup} "
+                f"(бюджет {STARTUP_TIME_BUDGET} с, {STARTUP_RSS_BUDGET_MB} МБ)"
+            )
+        else:
+            logging.info(f"Bot startup complete: {startup}")
+
+    async def _run_missed_monthly_update(self) -> None:
+        try:
+            await self.diamonds_service.check_missed_monthly_update()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logging.error(f"check_missed_monthly_update: {exc}")
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Команда /start - показати головне меню або обробити активацію"""
@@ -91,11 +183,11 @@ class TangoBot:
                 return
         
         # Звичайний старт - перевірка доступу
-        role = self.db.get_user_role(user_id)
+        role = await self.adb.get_user_role(user_id)
         
         # Якщо користувач - власник, але немає в БД
         if user_id == OWNER_ID and role is None:
-            self.db.add_bot_user(user_id, username, 'owner', user_id)
+            await self.adb.add_bot_user(user_id, username, 'owner', user_id)
             role = 'owner'
         
         # Якщо користувача немає в системі
@@ -115,57 +207,4 @@ class TangoBot:
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Обробка текстових повідомлень"""
-        user_id = update.effective_user.id
-        text = update.message.text
-        
-        if user_id in self.user_states:
-            state = self.user_states[user_id]
-            
-            # Роутинг по станам
-            if state == 'waiting_streamer_url':
-                await self.streamer_handlers.process_streamer_url(update, text, user_id)
-            elif state == 'waiting_gifter_url':
-                await self.gifter_handlers.process_gifter_url(update, text, user_id)
-            elif state == 'waiting_telegram_url':
-                await self.streamer_handlers.process_telegram_url(update, text, user_id)
-            elif state == 'waiting_instagram_url':
-                await self.streamer_handlers.process_instagram_url(update, text, user_id)
-            elif state == 'waiting_search_query':
-                await self.streamer_handlers.process_search_query(update, text, user_id)
-            elif state == 'waiting_get_id_url':
-                await self.streamer_handlers.process_get_id_url(update, text, user_id)
-            elif state == 'waiting_edit_name':
-                await self.streamer_handlers.process_edit_name(update, text, user_id)
-            elif state == 'waiting_edit_telegram':
-                await self.streamer_handlers.process_edit_telegram(update, text, user_id)
-            elif state == 'waiting_edit_instagram':
-                await self.streamer_handlers.process_edit_instagram(update, text, user_id)
-            elif state == 'waiting_new_user_username':
-                await self.bot_users_handlers.process_new_user_username(update, text, user_id)
-            elif state == 'waiting_new_user_id':
-                await self.bot_users_handlers.process_new_user_id(update, text, user_id)
-
-            # Ментори - додавання
-            elif state == 'waiting_mentor_name':
-                await self.mentor_handlers.process_mentor_name(update, text, user_id)
-            elif state == 'waiting_mentor_url':
-                await self.mentor_handlers.process_mentor_url(update, text, user_id)
-            elif state == 'waiting_mentor_telegram':
-                await self.mentor_handlers.process_mentor_telegram(update, text, user_id)
-            elif state == 'waiting_mentor_instagram':
-                await self.mentor_handlers.process_mentor_instagram(update, text, user_id)
-            
-            # Ментори - редагування
-            elif state == 'waiting_edit_mentor_url':
-                await self.mentor_handlers.process_edit_mentor_url(update, text, user_id)
-            elif state == 'waiting_edit_mentor_telegram':
-                await self.mentor_handlers.process_edit_mentor_telegram(update, text, user_id)
-            elif state == 'waiting_edit_mentor_instagram':
-                await self.mentor_handlers.process_edit_mentor_instagram(update, text, user_id)
-            
-            else:
-                await update.message.reply_text("❌ Невідомий стан. Використовуйте /start")
-        else:
-            await update.message.reply_text(
-                "👋 Використовуйте /start для відображення меню"
-            )
\ No newline at end of file
+        await self.state_router.handle_message(update, context)
@@ -28,18 +28,74 @@ SHEET_ERRORS = "Помилки"
 # Затримка між запитами до Google Sheets (секунди)
 SHEETS_SYNC_INTERVAL = 30
 
+# 'incremental' — пишемо лише змінені рядки (batch_update)
+# 'full'        — ws.clear() + повний перезапис (стара поведінка)
+SHEETS_SYNC_MODE = os.getenv("SHEETS_SYNC_MODE", "incremental")
+
+# Як часто (секунди) інкрементальний режим робить повний перезапис,
+# щоб відновити порядок рядків як у БД
+SHEETS_FULL_RESYNC_INTERVAL = 6 * 3600
+
 # ================================
 # ШЛЯХИ ДО ФАЙЛІВ
 # ================================
 DB_NAME = 'tango_bot.db'
 SEARCH_RESULTS_DIR = 'search_results'
 
+# ================================
+# БАЗА ДАНИХ
+# ================================
+# 'pooled'    — постійне з'єднання на кожен потік, PRAGMA застосовуються один раз
+# 'per_query' — нове з'єднання на кожен запит (стара поведінка)
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "pooled")
+
+# PRAGMA для постійних з'єднань (режим 'pooled')
+DB_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,      # ~16 МБ (від'ємне значення — у КБ)
+    'mmap_size': 134217728,    # 128 МБ
+    'temp_store': 'MEMORY',
+}
+
+# Журнал змін (change_journal): скільки днів зберігати записи,
+# навіть якщо якийсь consumer їх ще не прочитав
+CHANGE_JOURNAL_RETENTION_DAYS = 7
+
+# Кеш користувачів бота (роль/профіль за telegram_id) для перевірки доступу
+USER_CACHE_TTL = 300      # секунди життя запису
+USER_CACHE_SIZE = 1024    # максимум записів (LRU)
+
+# ================================
+# СТАНИ РОЗМОВИ (user_states)
+# ================================
+STATE_DEFAULT_TIMEOUT = 30 * 60   # секунди, після яких покинутий стан скидається
+STATE_SWEEP_INTERVAL = 5 * 60     # як часто прибирати прострочені стани
+
+# Сховище сесій (user_states / temp_data)
+SESSION_TTL = 24 * 3600           # секунди без звернень, після яких сесія вилучається
+SESSION_MAX_SIZE = 10000          # максимум сесій у кожному сховищі (LRU)
+# 'memory' — лише в пам'яті; 'sqlite' — знімок у БД, сесії переживають рестарт
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+
 # ================================
 # КОНСТАНТИ ДЛЯ ПАГІНАЦІЇ
 # ================================
 STREAMERS_PER_PAGE = 10
 DELETE_ITEMS_PER_PAGE = 10
 
+# ================================
+# ПОШУК (FTS5)
+# ================================
+SEARCH_RESULT_LIMIT = 50          # максимум результатів одного пошуку
+SEARCH_FUZZY_THRESHOLD = 0.5      # частка спільних триграм для нечіткого збігу
+
+# ================================
+# ЕКСПОРТ ДАНИХ
+# ================================
+EXPORT_BATCH_SIZE = 1000                  # рядків за один fetchmany
+EXPORT_SPOOL_MAX_MEMORY = 8 * 1024 * 1024  # байт у пам'яті, далі — анонімний temp-файл
+
 # ================================
 # СЛОВНИК МІСЯЦІВ
 # ================================
@@ -76,6 +132,17 @@ ROLE_EMOJI = {
     'guest': '👤'
 }
 
+# ================================
+# ЗАПУСК БОТА
+# ================================
+# Бюджет холодного старту (TangoBot.__init__ → готовність приймати /start);
+# перевищення пишеться в лог як warning
+STARTUP_TIME_BUDGET = 5.0         # секунди
+STARTUP_RSS_BUDGET_MB = 150       # поточний RSS процесу після старту, МБ
+# Апдейти різних користувачів обробляються паралельно (PerUserUpdateProcessor);
+# апдейти одного користувача, що чекають своєї черги, теж займають місце в ліміті
+MAX_CONCURRENT_UPDATES = 64
+
 # ================================
 # ДІАМАНТИ
 # ================================
@@ -83,8 +150,48 @@ DIAMONDS_API_URL = (
     "https://gateway.tango.me/proxycador/api/profiles/v2/single"
     "?id={user_id}&basicProfile=true&liveStats=true&followStats=true"
 )
-DIAMONDS_REQUEST_DELAY = 0.5   # секунди між запитами
+DIAMONDS_REQUEST_DELAY = 0.5   # секунди між повторними спробами
 DIAMONDS_MAX_RETRIES = 3       # кількість спроб при помилці
+DIAMONDS_WORKERS = 8           # кількість паралельних воркерів
+DIAMONDS_RATE_LIMIT = 5.0      # максимум запитів до Tango на секунду
+DIAMONDS_WRITE_BATCH = 50      # результатів на один запис у БД
+
+# ================================
+# HTTP-КЛІЄНТ TANGO API
+# ================================
+TANGO_GATEWAY = "https://gateway.tango.me"
+TANGO_HTTP_TIMEOUT = 15            # секунди на один запит
+TANGO_HTTP_MAX_CONNECTIONS = 16    # розмір пулу keep-alive з'єднань
+TANGO_HTTP_KEEPALIVE = 60          # секунди утримання простою з'єднання
+
+# ================================
+# ПОШУК ДАРУВАЛЬНИКІВ
+# ================================
+# 'api'      — прямі запити до feed/topGifters через AsyncTangoAPIClient
+# 'selenium' — через браузер (GifterSearcher, потрібен example.ini і chromedriver)
+GIFTER_SEARCH_ENGINE = os.getenv("GIFTER_SEARCH_ENGINE", "api")
+GIFTER_SEARCH_CONCURRENCY = 10   # одночасних запитів topGifters
+
+# Фонові задачі пошуку (SearchJobRunner)
+SEARCH_JOBS_MAX_CONCURRENT = 2    # пошуків одночасно на весь бот
+SEARCH_JOBS_PER_USER = 1          # активних (у черзі + виконуються) пошуків на користувача
+SEARCH_PROGRESS_INTERVAL = 3.0    # секунди між оновленнями прогресу в чаті
+
+# Пул прогрітих браузерів для GIFTER_SEARCH_ENGINE='selenium' (BrowserPool)
+BROWSER_POOL_SIZE = SEARCH_JOBS_MAX_CONCURRENT   # браузерів одночасно
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "true").lower() == "true"
+# Профіль Chrome; браузер слота N > 0 пулу отримує власну копію з суфіксом _N
+BROWSER_PROFILE_DIR = os.getenv(
+    "BROWSER_PROFILE_DIR",
+    "C:\\Users\\Admin\\\\AppData\\Local\\Google\\Chrome\\User Data\\Default"
+)
+BROWSER_MAX_AGE = 3600            # секунди життя браузера, потім — перезапуск
+BROWSER_MAX_USES = 50             # пошуків на один браузер
+BROWSER_MAX_HEAP_MB = 512         # JS heap сторінки, понад який браузер перезапускається
+
+# Спільний кеш сторінок feed і topGifters стрімів для всіх пошуків (SnapshotCache)
+SEARCH_SNAPSHOT_TTL = 60          # секунди, поки знімок вважається свіжим
+SEARCH_SNAPSHOT_SIZE = 500        # максимум знімків у кеші (LRU)
 
 # ================================
 # НАЛАШТУВАННЯ СПОВІЩЕНЬ
@@ -95,6 +202,12 @@ NOTIFICATIONS = {
     'new_user_role': True,
 }
 
+# Канал для сповіщень про стрімерів (порожньо — вимкнено)
+NOTIFICATION_CHANNEL_ID = os.getenv("NOTIFICATION_CHANNEL_ID")
+
+# Як часто (секунди) NotificationService читає журнал змін
+NOTIFICATION_POLL_INTERVAL = 15
+
 # ================================
 # НАЛАШТУВАННЯ АУДИТ-ЛОГУ
 # ================================
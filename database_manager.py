@@ -1,32 +1,159 @@
 """
 Менеджер бази даних SQLite
 """
+import asyncio
+import functools
+import json
 import logging
 import os
+import re
 import secrets
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from config import (
+    CHANGE_JOURNAL_RETENTION_DAYS,
+    DB_CONNECTION_MODE,
+    DB_NAME,
+    DB_PRAGMAS,
+    EXPORT_BATCH_SIZE,
+    SEARCH_FUZZY_THRESHOLD,
+    SEARCH_RESULT_LIMIT,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
+
+# Таблиці, зміни яких тригери пишуть у change_journal, і поля знімка рядка
+CHANGE_JOURNAL_TABLES = {
+    'streamers':       ('user_id', 'name', 'profile_url', 'platform', 'mentor_name'),
+    'mentors':         ('user_id', 'mentor_name', 'telegram_chat_id'),
+    'gifters':         ('user_id', 'name', 'owner_id'),
+    'diamonds_errors': ('streamer_id', 'streamer_name'),
+}
+
+# Повнотекстові індекси (FTS5, trigram): таблиця → (поля, ваги bm25 для полів)
+SEARCH_INDEXES = {
+    'streamers':   (('name', 'user_id', 'tg_name', 'instagram_url', 'mentor_name'),
+                    (10.0, 5.0, 3.0, 2.0, 1.0)),
+    'user_donors': (('donor_name', 'donor_tango_id', 'notes'),
+                    (10.0, 5.0, 1.0)),
+}
+
+# Поля search_jobs, які змінює update_search_job
+SEARCH_JOB_FIELDS = (
+    'status', 'done', 'total', 'found', 'result_path', 'error',
+    'started_at', 'finished_at',
+)
+
+
+def _casefold(value):
+    """SQL-функція casefold(): NULL лишається NULL, числа — як текст"""
+    return None if value is None else str(value).casefold()
+
+
+class UserCache:
+    """
+    TTL + LRU кеш профілів bot_users за telegram_id.
+    Кешуються й відсутні користувачі (None), щоб спроби доступу
+    сторонніх не ходили в БД. Потокобезпечний: читають event loop і потік БД.
+    """
+
+    MISSING = object()
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, maxsize: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[int, Tuple[float, Optional[Dict]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, telegram_id: int):
+        """Повертає копію профілю, None (користувача немає) або UserCache.MISSING"""
+        with self._lock:
+            entry = self._data.get(telegram_id)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[telegram_id]
+                self.misses += 1
+                return self.MISSING
+            self._data.move_to_end(telegram_id)
+            self.hits += 1
+            return dict(entry[1]) if entry[1] is not None else None
+
+    def put(self, telegram_id: int, user: Optional[Dict]) -> None:
+        with self._lock:
+            self._data[telegram_id] = (
+                time.monotonic() + self.ttl, dict(user) if user is not None else None
+            )
+            self._data.move_to_end(telegram_id)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, telegram_id: Optional[int] = None) -> None:
+        """Скидає один запис або (telegram_id=None) весь кеш"""
+        with self._lock:
+            if telegram_id is None:
+                self._data.clear()
+            else:
+                self._data.pop(telegram_id, None)
 
-from config import DB_NAME
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
 
 
 class DatabaseManager:
 
-    def __init__(self, db_file: str = DB_NAME):
+    def __init__(self, db_file: str = DB_NAME, mode: str = DB_CONNECTION_MODE):
         self.db_file = db_file
+        self.pooled = mode == 'pooled'
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.user_cache = UserCache()
         self.init_database()
 
     # ================================================================
     # ПІДКЛЮЧЕННЯ
     # ================================================================
 
-    @contextmanager
     def get_connection(self):
-        conn = sqlite3.connect(self.db_file)
+        """
+        Контекстний менеджер з'єднання.
+        У режимі 'pooled' повертає постійне з'єднання поточного потоку,
+        інакше — відкриває нове з'єднання на кожен виклик.
+        """
+        if self.pooled:
+            return self._pooled_connection()
+        return self._per_query_connection()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, check_same_thread=not self.pooled)
         conn.row_factory = sqlite3.Row
+        # LIKE у SQLite ігнорує регістр лише для ASCII — для кирилиці casefold()
+        conn.create_function('casefold', 1, _casefold, deterministic=True)
         conn.execute("PRAGMA foreign_keys = ON")
+        if self.pooled:
+            for name, value in DB_PRAGMAS.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    @contextmanager
+    def _per_query_connection(self):
+        conn = self._open_connection()
         try:
             yield conn
             conn.commit()
@@ -37,6 +164,45 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @contextmanager
+    def _pooled_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.depth = 0
+            with self._connections_lock:
+                self._connections.append(conn)
+
+        # Методи можуть змінювати row_factory — відновлюємо після виходу
+        prev_factory = conn.row_factory
+        conn.row_factory = sqlite3.Row
+        self._local.depth += 1
+        outermost = self._local.depth == 1
+        try:
+            yield conn
+            if outermost:
+                conn.commit()
+        except Exception as exc:
+            if outermost:
+                conn.rollback()
+            logging.error(f"Database error: {exc}")
+            raise
+        finally:
+            self._local.depth -= 1
+            conn.row_factory = prev_factory
+
+    def close(self) -> None:
+        """Закриває всі постійні з'єднання (при зупинці бота)"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as exc:
+                logging.error(f"close connection: {exc}")
+        self._local = threading.local()
+
     # ================================================================
     # ІНІЦІАЛІЗАЦІЯ СХЕМИ
     # ================================================================
@@ -196,6 +362,120 @@ class DatabaseManager:
                 )
             ''')
 
+            # ── diamonds_monthly_runs (чекпоінти місячної ротації) ─
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS diamonds_monthly_runs (
+                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_date    TEXT NOT NULL,
+                    status      TEXT DEFAULT 'running',
+                    total       INTEGER DEFAULT 0,
+                    started_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS diamonds_monthly_run_items (
+                    run_id      INTEGER NOT NULL,
+                    user_id     TEXT NOT NULL,
+                    name        TEXT,
+                    old_current INTEGER DEFAULT 0,
+                    status      TEXT DEFAULT 'pending',
+                    updated_at  TIMESTAMP,
+                    PRIMARY KEY (run_id, user_id)
+                )
+            ''')
+
+            # ── change_journal (CDC) ──────────────────────────────
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS change_journal (
+                    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+                    table_name TEXT NOT NULL,
+                    row_id     INTEGER NOT NULL,
+                    op         TEXT NOT NULL,
+                    row_data   TEXT,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS change_cursors (
+                    consumer   TEXT PRIMARY KEY,
+                    last_seq   INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            for table, fields in CHANGE_JOURNAL_TABLES.items():
+                # Ранній тригер update (без WHEN) журналював кожен UPDATE рядка,
+                # зокрема оновлення діамантів — замінюємо його
+                row = cur.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+                    (f'trg_{table}_journal_update',)
+                ).fetchone()
+                if row and 'WHEN' not in row[0]:
+                    cur.execute(f'DROP TRIGGER trg_{table}_journal_update')
+                for sql in self._change_journal_triggers(table, fields):
+                    cur.execute(sql)
+
+            # ── sessions (SESSION_BACKEND='sqlite') ───────────────
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    namespace  TEXT NOT NULL,
+                    key        TEXT NOT NULL,
+                    value      TEXT NOT NULL,
+                    touched_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            ''')
+
+            # ── search_jobs (фонові пошуки дарувальників) ─────────
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS search_jobs (
+                    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_telegram_id INTEGER NOT NULL,
+                    chat_id          INTEGER NOT NULL,
+                    message_id       INTEGER NOT NULL,
+                    gifter_ids       TEXT NOT NULL,
+                    engine           TEXT NOT NULL,
+                    status           TEXT NOT NULL DEFAULT 'queued',
+                    done             INTEGER DEFAULT 0,
+                    total            INTEGER DEFAULT 0,
+                    found            INTEGER DEFAULT 0,
+                    result_path      TEXT,
+                    error            TEXT,
+                    created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    started_at       TIMESTAMP,
+                    finished_at      TIMESTAMP
+                )
+            ''')
+
+            # ── streamer_period_counts (агрегат для фільтрів) ─────
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS streamer_period_counts (
+                    year        INTEGER NOT NULL,
+                    month       INTEGER NOT NULL,
+                    mentor_name TEXT NOT NULL DEFAULT '',
+                    cnt         INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (year, month, mentor_name)
+                )
+            ''')
+            for sql in self._streamer_period_triggers():
+                cur.execute(sql)
+
+            # ── streamers.mentor_id + mentor_streamer_counts ──────
+            self._migrate_streamer_mentor_ids(cur)
+            cur.execute('''
+                CREATE TABLE IF NOT EXISTS mentor_streamer_counts (
+                    mentor_id       INTEGER PRIMARY KEY
+                                    REFERENCES mentors(id) ON DELETE CASCADE,
+                    cnt             INTEGER NOT NULL DEFAULT 0,
+                    last_created_at TIMESTAMP
+                )
+            ''')
+            for sql in self._mentor_counter_triggers():
+                cur.execute(sql)
+
+            # ── повнотекстовий пошук ──────────────────────────────
+            self.fts_enabled = self._init_search_index(cur)
+
             # ── індекси ───────────────────────────────────────────
             indexes = [
                 "CREATE INDEX IF NOT EXISTS idx_bot_users_telegram_id ON bot_users(telegram_id)",
@@ -203,15 +483,349 @@ class DatabaseManager:
                 "CREATE INDEX IF NOT EXISTS idx_mentors_activation_code ON mentors(activation_code)",
                 "CREATE INDEX IF NOT EXISTS idx_streamers_user_id ON streamers(user_id)",
                 "CREATE INDEX IF NOT EXISTS idx_streamers_created_at ON streamers(created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_streamers_created_at_id ON streamers(created_at, id)",
                 "CREATE INDEX IF NOT EXISTS idx_streamers_mentor_name ON streamers(mentor_name)",
+                "CREATE INDEX IF NOT EXISTS idx_streamers_mentor_created_at ON streamers(mentor_name, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_streamers_mentor_id_created_at ON streamers(mentor_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_mentors_mentor_name ON mentors(mentor_name)",
                 "CREATE INDEX IF NOT EXISTS idx_gifters_user_id ON gifters(user_id)",
                 "CREATE INDEX IF NOT EXISTS idx_gifters_owner_id ON gifters(owner_id)",
+                "CREATE INDEX IF NOT EXISTS idx_search_jobs_status ON search_jobs(status, id)",
+                # audit_log: кожен фільтр + сортування (created_at, id) йдуть по індексу
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_created_action ON audit_log(created_at, action_type)",
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_action_created ON audit_log(action_type, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_user_created ON audit_log(user_telegram_id, created_at)",
+                "CREATE INDEX IF NOT EXISTS idx_audit_log_target_created ON audit_log(target_type, target_id, created_at)",
             ]
             for sql in indexes:
                 cur.execute(sql)
 
+            # Агрегат створено на вже заповненій БД — перераховуємо
+            total = cur.execute('SELECT COUNT(*) FROM streamers').fetchone()[0]
+            counted = cur.execute(
+                'SELECT COALESCE(SUM(cnt), 0) FROM streamer_period_counts'
+            ).fetchone()[0]
+            if total != counted:
+                self._fill_streamer_period_counts(cur)
+                logging.info("streamer_period_counts перераховано")
+
+            assigned = cur.execute(
+                'SELECT COUNT(*) FROM streamers WHERE mentor_id IS NOT NULL'
+            ).fetchone()[0]
+            counted = cur.execute(
+                'SELECT COALESCE(SUM(cnt), 0) FROM mentor_streamer_counts'
+            ).fetchone()[0]
+            if assigned != counted:
+                self._fill_mentor_streamer_counts(cur)
+                logging.info("mentor_streamer_counts перераховано")
+
             logging.info("Database initialized successfully")
 
+    @staticmethod
+    def _change_journal_triggers(table: str, fields: Tuple[str, ...]) -> List[str]:
+        """
+        AFTER INSERT/UPDATE/DELETE тригери, що пишуть у change_journal
+        знімок рядка (NEW, для delete — OLD); для update — ще й 'old'.
+        UPDATE журналюється лише при зміні відстежуваних полів, тож
+        оновлення діамантів чи updated_at журнал не чіпають.
+        """
+        def pairs(alias: str) -> str:
+            return ', '.join(f"'{f}', {alias}.{f}" for f in fields)
+
+        cols = ', '.join(fields)
+        changed = '\n              OR '.join(f'OLD.{f} IS NOT NEW.{f}' for f in fields)
+
+        new_data = f"json_object({pairs('NEW')})"
+        old_data = f"json_object({pairs('OLD')})"
+        update_data = f"json_object({pairs('NEW')}, 'old', {old_data})"
+        return [
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_journal_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO change_journal (table_name, row_id, op, row_data)
+                VALUES ('{table}', NEW.id, 'insert', {new_data});
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_journal_update
+            AFTER UPDATE OF {cols} ON {table}
+            WHEN {changed}
+            BEGIN
+                INSERT INTO change_journal (table_name, row_id, op, row_data)
+                VALUES ('{table}', NEW.id, 'update', {update_data});
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_journal_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO change_journal (table_name, row_id, op, row_data)
+                VALUES ('{table}', OLD.id, 'delete', {old_data});
+            END
+            ''',
+        ]
+
+    @staticmethod
+    def _streamer_period_triggers() -> List[str]:
+        """
+        Тригери, що тримають streamer_period_counts у синхроні зі streamers.
+        UPDATE реагує лише на зміну mentor_name/created_at, тож оновлення
+        діамантів агрегат не чіпають.
+        """
+        def key(alias: str) -> str:
+            return (
+                f"CAST(strftime('%Y', {alias}.created_at) AS INTEGER), "
+                f"CAST(strftime('%m', {alias}.created_at) AS INTEGER), "
+                f"COALESCE({alias}.mentor_name, '')"
+            )
+
+        def increment(alias: str) -> str:
+            return f'''
+                INSERT INTO streamer_period_counts (year, month, mentor_name, cnt)
+                VALUES ({key(alias)}, 1)
+                ON CONFLICT (year, month, mentor_name) DO UPDATE SET cnt = cnt + 1;
+            '''
+
+        def decrement(alias: str) -> str:
+            match = (
+                f"year = CAST(strftime('%Y', {alias}.created_at) AS INTEGER) "
+                f"AND month = CAST(strftime('%m', {alias}.created_at) AS INTEGER) "
+                f"AND mentor_name = COALESCE({alias}.mentor_name, '')"
+            )
+            return f'''
+                UPDATE streamer_period_counts SET cnt = cnt - 1 WHERE {match};
+                DELETE FROM streamer_period_counts WHERE {match} AND cnt <= 0;
+            '''
+
+        return [
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_period_insert
+            AFTER INSERT ON streamers
+            BEGIN
+                {increment('NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_period_update
+            AFTER UPDATE OF mentor_name, created_at ON streamers
+            WHEN OLD.mentor_name IS NOT NEW.mentor_name
+              OR OLD.created_at IS NOT NEW.created_at
+            BEGIN
+                {decrement('OLD')}
+                {increment('NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_period_delete
+            AFTER DELETE ON streamers
+            BEGIN
+                {decrement('OLD')}
+            END
+            ''',
+        ]
+
+    @staticmethod
+    def _fill_streamer_period_counts(cur) -> None:
+        cur.execute('DELETE FROM streamer_period_counts')
+        cur.execute('''
+            INSERT INTO streamer_period_counts (year, month, mentor_name, cnt)
+            SELECT CAST(strftime('%Y', created_at) AS INTEGER),
+                   CAST(strftime('%m', created_at) AS INTEGER),
+                   COALESCE(mentor_name, ''), COUNT(*)
+            FROM streamers
+            GROUP BY 1, 2, 3
+        ''')
+
+    def rebuild_streamer_period_counts(self) -> bool:
+        """Повний перерахунок streamer_period_counts зі streamers"""
+        try:
+            with self.get_connection() as conn:
+                self._fill_streamer_period_counts(conn)
+                return True
+        except Exception as exc:
+            logging.error(f"rebuild_streamer_period_counts: {exc}")
+            return False
+
+    @staticmethod
+    def _migrate_streamer_mentor_ids(cur) -> None:
+        """
+        Додає streamers.mentor_id (FK на mentors) і заповнює його за mentor_name.
+        Стрімери видаленого ментора отримують NULL і повертаються до нього
+        при відновленні (restore_mentor).
+        """
+        columns = {row[1] for row in cur.execute('PRAGMA table_info(streamers)')}
+        if 'mentor_id' in columns:
+            return
+        cur.execute(
+            'ALTER TABLE streamers ADD COLUMN mentor_id INTEGER '
+            'REFERENCES mentors(id) ON DELETE SET NULL'
+        )
+        cur.execute('''
+            UPDATE streamers
+            SET mentor_id = (
+                SELECT MIN(m.id) FROM mentors m
+                WHERE m.mentor_name = streamers.mentor_name
+            )
+            WHERE mentor_name IS NOT NULL AND mentor_name != ''
+        ''')
+        logging.info("streamers.mentor_id додано та заповнено за mentor_name")
+
+    @staticmethod
+    def _mentor_counter_triggers() -> List[str]:
+        """
+        Тригери, що тримають mentor_streamer_counts у синхроні зі
+        streamers.mentor_id: лічильник +1/-1, а last_created_at при
+        видаленні/перепризначенні перераховується по індексу (mentor_id, created_at).
+        """
+        def increment(alias: str) -> str:
+            return f'''
+                INSERT INTO mentor_streamer_counts (mentor_id, cnt, last_created_at)
+                SELECT {alias}.mentor_id, 1, {alias}.created_at
+                WHERE {alias}.mentor_id IS NOT NULL
+                ON CONFLICT (mentor_id) DO UPDATE SET
+                    cnt = cnt + 1,
+                    last_created_at = MAX(COALESCE(last_created_at, ''), excluded.last_created_at);
+            '''
+
+        def decrement(alias: str) -> str:
+            return f'''
+                UPDATE mentor_streamer_counts
+                SET cnt = cnt - 1,
+                    last_created_at = (
+                        SELECT MAX(created_at) FROM streamers
+                        WHERE mentor_id = {alias}.mentor_id
+                    )
+                WHERE mentor_id = {alias}.mentor_id;
+            '''
+
+        return [
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_mentor_insert
+            AFTER INSERT ON streamers
+            BEGIN
+                {increment('NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_mentor_update
+            AFTER UPDATE OF mentor_id ON streamers
+            WHEN OLD.mentor_id IS NOT NEW.mentor_id
+            BEGIN
+                {decrement('OLD')}
+                {increment('NEW')}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_streamers_mentor_delete
+            AFTER DELETE ON streamers
+            BEGIN
+                {decrement('OLD')}
+            END
+            ''',
+        ]
+
+    @staticmethod
+    def _fill_mentor_streamer_counts(cur) -> None:
+        cur.execute('DELETE FROM mentor_streamer_counts')
+        cur.execute('''
+            INSERT INTO mentor_streamer_counts (mentor_id, cnt, last_created_at)
+            SELECT mentor_id, COUNT(*), MAX(created_at)
+            FROM streamers
+            WHERE mentor_id IN (SELECT id FROM mentors)
+            GROUP BY mentor_id
+        ''')
+
+    def _init_search_index(self, cur) -> bool:
+        """
+        Створює FTS5-індекси SEARCH_INDEXES (external content + тригери).
+        Якщо SQLite зібрано без FTS5 / trigram — пошук працює через LIKE.
+        """
+        try:
+            for table, (fields, _) in SEARCH_INDEXES.items():
+                fts = f'{table}_fts'
+                exists = cur.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+                ).fetchone()
+                cur.execute(f'''
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        {', '.join(fields)},
+                        content='{table}', content_rowid='id', tokenize='trigram'
+                    )
+                ''')
+                for sql in self._search_index_triggers(table, fields):
+                    cur.execute(sql)
+                if not exists:
+                    cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as exc:
+            logging.warning(f"FTS5 недоступний, пошук через LIKE: {exc}")
+            return False
+
+    @staticmethod
+    def _search_index_triggers(table: str, fields: Tuple[str, ...]) -> List[str]:
+        """
+        Тригери синхронізації {table}_fts; UPDATE реагує лише на індексовані
+        поля, тож оновлення діамантів індекс не чіпають.
+        """
+        fts = f'{table}_fts'
+        cols = ', '.join(fields)
+
+        def values(alias: str) -> str:
+            return ', '.join(f'{alias}.{f}' for f in fields)
+
+        insert = f"INSERT INTO {fts}(rowid, {cols}) VALUES (NEW.id, {values('NEW')});"
+        delete = (
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) "
+            f"VALUES ('delete', OLD.id, {values('OLD')});"
+        )
+        return [
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                {insert}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_update
+            AFTER UPDATE OF {cols} ON {table}
+            BEGIN
+                {delete}
+                {insert}
+            END
+            ''',
+            f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_fts_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                {delete}
+            END
+            ''',
+        ]
+
+    @staticmethod
+    def _resolve_mentor_id(conn, mentor_name: Optional[str]) -> Optional[int]:
+        """id ментора за іменем (найстаріший при збігу імен) або None"""
+        if not mentor_name:
+            return None
+        row = conn.execute(
+            'SELECT MIN(id) FROM mentors WHERE mentor_name = ?', (mentor_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _period_range(year: int, month: Optional[int] = None) -> Tuple[str, str]:
+        """
+        Межі [start, end) періоду для порівняння з created_at
+        ('YYYY-MM-DD HH:MM:SS' порівнюється як рядок і йде по індексу)
+        """
+        if month is None:
+            return f'{year:04d}-01-01', f'{year + 1:04d}-01-01'
+        if month == 12:
+            return f'{year:04d}-12-01', f'{year + 1:04d}-01-01'
+        return f'{year:04d}-{month:02d}-01', f'{year:04d}-{month + 1:02d}-01'
+
     # ================================================================
     # SYSTEM SETTINGS
     # ================================================================
@@ -241,19 +855,132 @@ class DatabaseManager:
             logging.error(f"set_setting {key}: {exc}")
 
     # ================================================================
-    # BOT USERS
+    # CHANGE JOURNAL (CDC)
     # ================================================================
 
-    def get_user_role(self, telegram_id: int) -> Optional[str]:
+    def get_changes(
+        self, consumer: str, tables: Optional[List[str]] = None, limit: int = 1000,
+        after_seq: Optional[int] = None
+    ) -> Tuple[List[Dict], int]:
+        """
+        Зміни після курсора consumer (або після after_seq — для читання
+        наступної сторінки до ack), за зростанням seq.
+        Повертає (changes, cursor): cursor передається в ack_changes після обробки.
+        Новий consumer стартує з кінця журналу (історію не переграє).
+        """
         try:
             with self.get_connection() as conn:
                 row = conn.execute(
-                    'SELECT role FROM bot_users WHERE telegram_id = ?', (telegram_id,)
+                    'SELECT last_seq FROM change_cursors WHERE consumer = ?', (consumer,)
                 ).fetchone()
-                return row['role'] if row else None
+                head = conn.execute(
+                    'SELECT COALESCE(MAX(seq), 0) AS head FROM change_journal'
+                ).fetchone()['head']
+                if row is None:
+                    conn.execute(
+                        'INSERT INTO change_cursors (consumer, last_seq) VALUES (?, ?)',
+                        (consumer, head)
+                    )
+                    return [], head
+
+                sql = (
+                    'SELECT seq, table_name, row_id, op, row_data, changed_at '
+                    'FROM change_journal WHERE seq > ? AND seq <= ?'
+                )
+                start = row['last_seq'] if after_seq is None else max(after_seq, row['last_seq'])
+                params: list = [start, head]
+                if tables:
+                    sql += f" AND table_name IN ({','.join('?' * len(tables))})"
+                    params.extend(tables)
+                sql += ' ORDER BY seq LIMIT ?'
+                params.append(limit)
+
+                changes = []
+                for r in conn.execute(sql, params).fetchall():
+                    change = dict(r)
+                    change['row'] = json.loads(change.pop('row_data') or '{}')
+                    changes.append(change)
+
+                # Неповна сторінка — все до head переглянуто (чужі таблиці теж)
+                cursor = changes[-1]['seq'] if len(changes) >= limit else head
+                return changes, cursor
         except Exception as exc:
-            logging.error(f"get_user_role: {exc}")
-            return None
+            logging.error(f"get_changes {consumer}: {exc}")
+            return [], 0
+
+    def ack_changes(self, consumer: str, cursor: int) -> None:
+        """Зсуває курсор consumer (лише вперед)"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    UPDATE change_cursors
+                    SET last_seq = MAX(last_seq, ?), updated_at = CURRENT_TIMESTAMP
+                    WHERE consumer = ?
+                ''', (cursor, consumer))
+        except Exception as exc:
+            logging.error(f"ack_changes {consumer}: {exc}")
+
+    def prune_change_journal(self) -> int:
+        """
+        Видаляє записи, які прочитали всі consumer'и, а також старші
+        за CHANGE_JOURNAL_RETENTION_DAYS (щоб покинутий курсор не тримав журнал).
+        """
+        cutoff = (datetime.utcnow() - timedelta(days=CHANGE_JOURNAL_RETENTION_DAYS)).strftime(
+            '%Y-%m-%d %H:%M:%S'
+        )
+        try:
+            with self.get_connection() as conn:
+                cur = conn.execute('''
+                    DELETE FROM change_journal
+                    WHERE seq <= (SELECT MIN(last_seq) FROM change_cursors)
+                       OR changed_at < ?
+                ''', (cutoff,))
+                return cur.rowcount
+        except Exception as exc:
+            logging.error(f"prune_change_journal: {exc}")
+            return 0
+
+    # ================================================================
+    # СЕСІЇ
+    # ================================================================
+
+    def save_sessions(self, namespace: str, rows: List[Tuple[str, str, float]]) -> bool:
+        """Замінює знімок сесій namespace (rows з SessionStore.dump)"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('DELETE FROM sessions WHERE namespace = ?', (namespace,))
+                conn.executemany(
+                    'INSERT INTO sessions (namespace, key, value, touched_at) VALUES (?, ?, ?, ?)',
+                    [(namespace, key, value, stamp) for key, value, stamp in rows]
+                )
+                return True
+        except Exception as exc:
+            logging.error(f"save_sessions {namespace}: {exc}")
+            return False
+
+    def load_sessions(self, namespace: str) -> List[Tuple[str, str, float]]:
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    'SELECT key, value, touched_at FROM sessions WHERE namespace = ?',
+                    (namespace,)
+                ).fetchall()
+                return [(r['key'], r['value'], r['touched_at']) for r in rows]
+        except Exception as exc:
+            logging.error(f"load_sessions {namespace}: {exc}")
+            return []
+
+    # ================================================================
+    # BOT USERS
+    # ================================================================
+
+    def get_user_role(self, telegram_id: int) -> Optional[str]:
+        user = self.get_bot_user_by_telegram_id(telegram_id)
+        return user['role'] if user else None
+
+    def get_user_cache_stats(self) -> Dict:
+        """Розмір кешу користувачів і лічильники hit/miss"""
+        return self.user_cache.stats()
 
     def add_bot_user(
         self, telegram_id: int, username: Optional[str], role: str, added_by: int,
@@ -267,7 +994,9 @@ class DatabaseManager:
                         (telegram_id, username, first_name, last_name, role, status, added_by)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 ''', (telegram_id, username, first_name, last_name, role, status, added_by))
-                return True
+            # REPLACE міг видалити рядок іншого telegram_id з тим самим username
+            self.user_cache.invalidate()
+            return True
         except Exception as exc:
             logging.error(f"add_bot_user: {exc}")
             return False
@@ -315,7 +1044,8 @@ class DatabaseManager:
                         activation_code = NULL, updated_at = CURRENT_TIMESTAMP
                     WHERE activation_code = ?
                 ''', (telegram_id, activation_code))
-                return True
+            self.user_cache.invalidate(telegram_id)
+            return True
         except Exception as exc:
             logging.error(f"activate_bot_user: {exc}")
             return False
@@ -329,6 +1059,13 @@ class DatabaseManager:
         return d
 
     def get_bot_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict]:
+        cached = self.user_cache.get(telegram_id)
+        if cached is not UserCache.MISSING:
+            return cached
+        return self._load_bot_user(telegram_id)
+
+    def _load_bot_user(self, telegram_id: int) -> Optional[Dict]:
+        """Читає користувача з БД і кладе результат у user_cache"""
         try:
             with self.get_connection() as conn:
                 row = conn.execute(
@@ -337,7 +1074,9 @@ class DatabaseManager:
                        FROM bot_users WHERE telegram_id = ?''',
                     (telegram_id,)
                 ).fetchone()
-                return self._hydrate_user(row) if row else None
+            user = self._hydrate_user(row) if row else None
+            self.user_cache.put(telegram_id, user)
+            return user
         except Exception as exc:
             logging.error(f"get_bot_user_by_telegram_id: {exc}")
             return None
@@ -364,7 +1103,8 @@ class DatabaseManager:
                         (telegram_id, username, full_name, first_name, role, status, added_by)
                     VALUES (?, ?, ?, ?, ?, ?, ?)
                 ''', (telegram_id, username or None, full_name, full_name, role, status, created_by))
-                return telegram_id if cur.rowcount else None
+            self.user_cache.invalidate()
+            return telegram_id if cur.rowcount else None
         except Exception as exc:
             logging.error(f"add_user: {exc}")
             return None
@@ -438,7 +1178,8 @@ class DatabaseManager:
                     'WHERE telegram_id = ?',
                     (new_role, telegram_id)
                 )
-                return True
+            self.user_cache.invalidate(telegram_id)
+            return True
         except Exception as exc:
             logging.error(f"update_bot_user_role: {exc}")
             return False
@@ -451,7 +1192,8 @@ class DatabaseManager:
                     'WHERE username = ?',
                     (new_role, username)
                 )
-                return cur.rowcount > 0
+            self.user_cache.invalidate()
+            return cur.rowcount > 0
         except Exception as exc:
             logging.error(f"update_bot_user_role_by_username: {exc}")
             return False
@@ -464,7 +1206,8 @@ class DatabaseManager:
                     "WHERE telegram_id = ?",
                     (telegram_id,)
                 )
-                return cur.rowcount > 0
+            self.user_cache.invalidate(telegram_id)
+            return cur.rowcount > 0
         except Exception as exc:
             logging.error(f"deactivate_bot_user: {exc}")
             return False
@@ -475,7 +1218,8 @@ class DatabaseManager:
                 cur = conn.execute(
                     'DELETE FROM bot_users WHERE telegram_id = ?', (telegram_id,)
                 )
-                return cur.rowcount > 0
+            self.user_cache.invalidate(telegram_id)
+            return cur.rowcount > 0
         except Exception as exc:
             logging.error(f"delete_bot_user: {exc}")
             return False
@@ -486,7 +1230,8 @@ class DatabaseManager:
                 cur = conn.execute(
                     'DELETE FROM bot_users WHERE username = ?', (username,)
                 )
-                return cur.rowcount > 0
+            self.user_cache.invalidate()
+            return cur.rowcount > 0
         except Exception as exc:
             logging.error(f"delete_bot_user_by_username: {exc}")
             return False
@@ -571,10 +1316,16 @@ class DatabaseManager:
         self, name: str, user_id: str, profile_url: str,
         tg_name: Optional[str] = None, tg_url: Optional[str] = None,
         instagram_url: Optional[str] = None, platform: Optional[str] = None,
-        mentor_name: Optional[str] = None
+        mentor_name: Optional[str] = None, mentor_id: Optional[int] = None
     ) -> bool:
+        """
+        Додає або оновлює стрімера. mentor_id, якщо не передано,
+        визначається за mentor_name.
+        """
         try:
             with self.get_connection() as conn:
+                if mentor_name and mentor_id is None:
+                    mentor_id = self._resolve_mentor_id(conn, mentor_name)
                 existing = conn.execute(
                     'SELECT id FROM streamers WHERE user_id = ?', (user_id,)
                 ).fetchone()
@@ -588,18 +1339,19 @@ class DatabaseManager:
                             instagram_url = COALESCE(?, instagram_url),
                             platform    = COALESCE(?, platform),
                             mentor_name = COALESCE(?, mentor_name),
+                            mentor_id   = CASE WHEN ? IS NULL THEN mentor_id ELSE ? END,
                             updated_at  = CURRENT_TIMESTAMP
                         WHERE user_id = ?
-                    ''', (name, profile_url, tg_name, tg_url,
-                          instagram_url, platform, mentor_name, user_id))
+                    ''', (name, profile_url, tg_name, tg_url, instagram_url,
+                          platform, mentor_name, mentor_name, mentor_id, user_id))
                 else:
                     conn.execute('''
                         INSERT INTO streamers
                             (name, user_id, profile_url, tg_name, tg_url,
-                             instagram_url, platform, mentor_name)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                             instagram_url, platform, mentor_name, mentor_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                     ''', (name, user_id, profile_url, tg_name, tg_url,
-                          instagram_url, platform, mentor_name))
+                          instagram_url, platform, mentor_name, mentor_id))
                 return True
         except Exception as exc:
             logging.error(f"add_streamer: {exc}")
@@ -632,6 +1384,60 @@ class DatabaseManager:
             logging.error(f"get_all_streamers: {exc}")
             return []
 
+    def count_streamers(self) -> int:
+        try:
+            with self.get_connection() as conn:
+                return conn.execute('SELECT COUNT(*) AS cnt FROM streamers').fetchone()['cnt']
+        except Exception as exc:
+            logging.error(f"count_streamers: {exc}")
+            return 0
+
+    def get_streamers_page(
+        self, limit: int, after_id: Optional[int] = None,
+        before_id: Optional[int] = None, offset: int = 0
+    ) -> List[Tuple]:
+        """
+        Keyset-пагінація у порядку get_all_streamers (created_at DESC, id DESC).
+        after_id  — сторінка після рядка з цим id (наступна),
+        before_id — сторінка перед рядком з цим id (попередня).
+        Якщо якірного рядка вже немає (видалено) — запасний варіант через OFFSET.
+        Повертає tuples як get_all_streamers + id останнім полем.
+        """
+        columns = '''name, user_id, profile_url, tg_name, tg_url,
+                     instagram_url, platform, mentor_name, created_at, id'''
+        try:
+            with self.get_connection() as conn:
+                conn.row_factory = None
+                anchor_id = after_id if after_id is not None else before_id
+                anchor = None
+                if anchor_id is not None:
+                    anchor = conn.execute(
+                        'SELECT created_at, id FROM streamers WHERE id = ?', (anchor_id,)
+                    ).fetchone()
+
+                if anchor and after_id is not None:
+                    rows = conn.execute(f'''
+                        SELECT {columns} FROM streamers
+                        WHERE (created_at, id) < (?, ?)
+                        ORDER BY created_at DESC, id DESC LIMIT ?
+                    ''', (*anchor, limit)).fetchall()
+                elif anchor:
+                    rows = conn.execute(f'''
+                        SELECT {columns} FROM streamers
+                        WHERE (created_at, id) > (?, ?)
+                        ORDER BY created_at ASC, id ASC LIMIT ?
+                    ''', (*anchor, limit)).fetchall()
+                    rows.reverse()
+                else:
+                    rows = conn.execute(f'''
+                        SELECT {columns} FROM streamers
+                        ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+                    ''', (limit, offset)).fetchall()
+                return rows
+        except Exception as exc:
+            logging.error(f"get_streamers_page: {exc}")
+            return []
+
     def get_all_streamers_full(self) -> List[Dict]:
         """Всі поля для Google Sheets"""
         try:
@@ -660,46 +1466,60 @@ class DatabaseManager:
             return []
 
     def get_streamers_count_by_period(self) -> dict:
-        """Повертає {\'YYYY-MM\': count} для статистики"""
+        """Повертає {'YYYY-MM': count} для статистики (з streamer_period_counts)"""
         try:
             with self.get_connection() as conn:
                 rows = conn.execute('''
-                    SELECT strftime(\'%Y-%m\', created_at) AS period, COUNT(*) AS cnt
-                    FROM streamers
-                    GROUP BY period
-                    ORDER BY period DESC
+                    SELECT printf('%04d-%02d', year, month) AS period, SUM(cnt) AS cnt
+                    FROM streamer_period_counts
+                    GROUP BY year, month
+                    ORDER BY year DESC, month DESC
                 ''').fetchall()
                 return {r['period']: r['cnt'] for r in rows}
         except Exception as exc:
             logging.error(f"get_streamers_count_by_period: {exc}")
             return {}
 
-    def get_available_years(self) -> list:
+    def get_streamer_year_counts(self, mentor_name: Optional[str] = None) -> List[Tuple[int, int]]:
+        """[(рік, кількість)] від нового до старого; mentor_name — лише його стрімери"""
         try:
             with self.get_connection() as conn:
-                rows = conn.execute('''
-                    SELECT DISTINCT CAST(strftime(\'%Y\', created_at) AS INTEGER) AS yr
-                    FROM streamers ORDER BY yr DESC
-                ''').fetchall()
-                return [r['yr'] for r in rows]
-        except Exception as exc:
-            logging.error(f"get_available_years: {exc}")
+                conn.row_factory = None
+                sql = 'SELECT year, SUM(cnt) FROM streamer_period_counts'
+                params: tuple = ()
+                if mentor_name is not None:
+                    sql += ' WHERE mentor_name = ?'
+                    params = (mentor_name,)
+                sql += ' GROUP BY year HAVING SUM(cnt) > 0 ORDER BY year DESC'
+                return conn.execute(sql, params).fetchall()
+        except Exception as exc:
+            logging.error(f"get_streamer_year_counts: {exc}")
             return []
 
-    def get_available_months_for_year(self, year: int) -> list:
+    def get_streamer_month_counts(
+        self, year: int, mentor_name: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        """[(місяць, кількість)] за рік у порядку місяців"""
         try:
             with self.get_connection() as conn:
-                rows = conn.execute('''
-                    SELECT DISTINCT CAST(strftime(\'%m\', created_at) AS INTEGER) AS mo
-                    FROM streamers
-                    WHERE CAST(strftime(\'%Y\', created_at) AS INTEGER) = ?
-                    ORDER BY mo
-                ''', (year,)).fetchall()
-                return [r['mo'] for r in rows]
-        except Exception as exc:
-            logging.error(f"get_available_months_for_year: {exc}")
+                conn.row_factory = None
+                sql = 'SELECT month, SUM(cnt) FROM streamer_period_counts WHERE year = ?'
+                params: tuple = (year,)
+                if mentor_name is not None:
+                    sql += ' AND mentor_name = ?'
+                    params += (mentor_name,)
+                sql += ' GROUP BY month HAVING SUM(cnt) > 0 ORDER BY month'
+                return conn.execute(sql, params).fetchall()
+        except Exception as exc:
+            logging.error(f"get_streamer_month_counts: {exc}")
             return []
 
+    def get_available_years(self) -> list:
+        return [year for year, _ in self.get_streamer_year_counts()]
+
+    def get_available_months_for_year(self, year: int) -> list:
+        return [month for month, _ in self.get_streamer_month_counts(year)]
+
     def update_streamer_field(self, user_id: str, field: str, value) -> bool:
         allowed = {
             'name', 'profile_url', 'tg_name', 'tg_url',
@@ -710,11 +1530,18 @@ class DatabaseManager:
             return False
         try:
             with self.get_connection() as conn:
-                cur = conn.execute(
-                    f'UPDATE streamers SET {field} = ?, updated_at = CURRENT_TIMESTAMP '
-                    f'WHERE user_id = ?',
-                    (value, user_id)
-                )
+                if field == 'mentor_name':
+                    cur = conn.execute(
+                        'UPDATE streamers SET mentor_name = ?, mentor_id = ?, '
+                        'updated_at = CURRENT_TIMESTAMP WHERE user_id = ?',
+                        (value, self._resolve_mentor_id(conn, value), user_id)
+                    )
+                else:
+                    cur = conn.execute(
+                        f'UPDATE streamers SET {field} = ?, updated_at = CURRENT_TIMESTAMP '
+                        f'WHERE user_id = ?',
+                        (value, user_id)
+                    )
                 return cur.rowcount > 0
         except Exception as exc:
             logging.error(f"update_streamer_field: {exc}")
@@ -755,27 +1582,17 @@ class DatabaseManager:
         більшість інших хендлерів передають ім'я (str).
         """
         try:
-            # Якщо передано int — шукаємо ім'я ментора в таблиці mentors
-            if isinstance(mentor_name_or_id, int):
-                with self.get_connection() as conn:
-                    row = conn.execute(
-                        'SELECT mentor_name FROM mentors WHERE id = ?', (mentor_name_or_id,)
-                    ).fetchone()
-                    if not row:
-                        return []
-                    mentor_name = row['mentor_name']
-            else:
-                mentor_name = mentor_name_or_id
-
+            # int — одразу по індексу (mentor_id, created_at), без пошуку імені
+            column = 'mentor_id' if isinstance(mentor_name_or_id, int) else 'mentor_name'
             with self.get_connection() as conn:
                 conn.row_factory = None
                 cur = conn.cursor()
-                cur.execute('''
+                cur.execute(f'''
                     SELECT name, user_id, profile_url, tg_name, tg_url,
                            instagram_url, platform, mentor_name, created_at
-                    FROM streamers WHERE mentor_name = ?
+                    FROM streamers WHERE {column} = ?
                     ORDER BY created_at DESC
-                ''', (mentor_name,))
+                ''', (mentor_name_or_id,))
                 return cur.fetchall()
         except Exception as exc:
             logging.error(f"get_streamers_by_mentor: {exc}")
@@ -790,9 +1607,9 @@ class DatabaseManager:
                     SELECT name, user_id, profile_url, tg_name, tg_url,
                            instagram_url, platform, mentor_name, created_at
                     FROM streamers
-                    WHERE CAST(strftime('%Y', created_at) AS INTEGER) = ?
+                    WHERE created_at >= ? AND created_at < ?
                     ORDER BY created_at DESC
-                ''', (year,))
+                ''', self._period_range(year))
                 return cur.fetchall()
         except Exception as exc:
             logging.error(f"get_streamers_by_year: {exc}")
@@ -807,10 +1624,9 @@ class DatabaseManager:
                     SELECT name, user_id, profile_url, tg_name, tg_url,
                            instagram_url, platform, mentor_name, created_at
                     FROM streamers
-                    WHERE CAST(strftime('%Y', created_at) AS INTEGER) = ?
-                      AND CAST(strftime('%m', created_at) AS INTEGER) = ?
+                    WHERE created_at >= ? AND created_at < ?
                     ORDER BY created_at DESC
-                ''', (year, month))
+                ''', self._period_range(year, month))
                 return cur.fetchall()
         except Exception as exc:
             logging.error(f"get_streamers_by_month: {exc}")
@@ -826,9 +1642,9 @@ class DatabaseManager:
                            instagram_url, platform, mentor_name, created_at
                     FROM streamers
                     WHERE mentor_name = ?
-                      AND CAST(strftime('%Y', created_at) AS INTEGER) = ?
+                      AND created_at >= ? AND created_at < ?
                     ORDER BY created_at DESC
-                ''', (mentor_name, year))
+                ''', (mentor_name, *self._period_range(year)))
                 return cur.fetchall()
         except Exception as exc:
             logging.error(f"get_streamers_by_mentor_and_year: {exc}")
@@ -846,10 +1662,9 @@ class DatabaseManager:
                            instagram_url, platform, mentor_name, created_at
                     FROM streamers
                     WHERE mentor_name = ?
-                      AND CAST(strftime('%Y', created_at) AS INTEGER) = ?
-                      AND CAST(strftime('%m', created_at) AS INTEGER) = ?
+                      AND created_at >= ? AND created_at < ?
                     ORDER BY created_at DESC
-                ''', (mentor_name, year, month))
+                ''', (mentor_name, *self._period_range(year, month)))
                 return cur.fetchall()
         except Exception as exc:
             logging.error(f"get_streamers_by_mentor_and_month: {exc}")
@@ -861,10 +1676,10 @@ class DatabaseManager:
                 conn.row_factory = None
                 cur = conn.cursor()
                 cur.execute('''
-                    SELECT mentor_name, COUNT(*) AS count
-                    FROM streamers
-                    WHERE mentor_name IS NOT NULL AND mentor_name != ''
-                    GROUP BY mentor_name ORDER BY count DESC
+                    SELECT mentor_name, SUM(cnt) AS count
+                    FROM streamer_period_counts
+                    WHERE mentor_name != ''
+                    GROUP BY mentor_name HAVING count > 0 ORDER BY count DESC
                 ''')
                 return cur.fetchall()
         except Exception as exc:
@@ -922,6 +1737,165 @@ class DatabaseManager:
             logging.error(f"monthly_rotate_diamonds_deleted: {exc}")
             return False
 
+    # ── Пакетний запис (одна транзакція на пачку) ─────────────────
+
+    def bulk_update_diamonds_now(self, updates: List[Tuple[str, int]]) -> int:
+        """updates: [(user_id, diamonds), ...]"""
+        if not updates:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                cur = conn.executemany(
+                    'UPDATE streamers SET diamonds_now = ?, updated_at = CURRENT_TIMESTAMP '
+                    'WHERE user_id = ?',
+                    [(diamonds, user_id) for user_id, diamonds in updates]
+                )
+                return cur.rowcount
+        except Exception as exc:
+            logging.error(f"bulk_update_diamonds_now: {exc}")
+            return 0
+
+    def bulk_monthly_rotate(
+        self, rotations: List[Tuple[str, int, int, int]],
+        deleted: Optional[List[Tuple[str, int]]] = None,
+        run_id: Optional[int] = None
+    ) -> int:
+        """
+        rotations: [(user_id, old_current, new_current, diff), ...]
+        deleted:   [(user_id, old_current), ...] — стрімер недоступний
+        run_id:    якщо задано — у тій самій транзакції позначає стрімерів
+                   обробленими в diamonds_monthly_run_items (чекпоінт)
+        """
+        if not rotations and not deleted:
+            return 0
+        try:
+            with self.get_connection() as conn:
+                count = 0
+                if rotations:
+                    cur = conn.executemany('''
+                        UPDATE streamers
+                        SET diamonds_previous_month = ?,
+                            diamonds_current_month  = ?,
+                            diamonds_diff           = ?,
+                            diamonds_now            = ?,
+                            updated_at              = CURRENT_TIMESTAMP
+                        WHERE user_id = ?
+                    ''', [
+                        (old_current, new_current, diff, new_current, user_id)
+                        for user_id, old_current, new_current, diff in rotations
+                    ])
+                    count += cur.rowcount
+                if deleted:
+                    cur = conn.executemany('''
+                        UPDATE streamers
+                        SET diamonds_previous_month = ?,
+                            diamonds_current_month  = -1,
+                            diamonds_diff           = 0,
+                            updated_at              = CURRENT_TIMESTAMP
+                        WHERE user_id = ?
+                    ''', [(old_current, user_id) for user_id, old_current in deleted])
+                    count += cur.rowcount
+                if run_id is not None:
+                    conn.executemany('''
+                        UPDATE diamonds_monthly_run_items
+                        SET status = ?, updated_at = CURRENT_TIMESTAMP
+                        WHERE run_id = ? AND user_id = ?
+                    ''', [('done', run_id, r[0]) for r in rotations or []]
+                       + [('failed', run_id, d[0]) for d in deleted or []])
+                return count
+        except Exception as exc:
+            logging.error(f"bulk_monthly_rotate: {exc}")
+            return 0
+
+    # ── Чекпоінти місячної ротації ────────────────────────────────
+
+    def create_monthly_run(self, run_date: str, streamers: List[Dict]) -> Optional[int]:
+        """
+        Створює запуск ротації і знімок diamonds_current_month кожного стрімера.
+        Знімок гарантує, що після рестарту previous_month не перезапишеться
+        вже ротованим значенням.
+        """
+        try:
+            with self.get_connection() as conn:
+                cur = conn.execute(
+                    'INSERT INTO diamonds_monthly_runs (run_date, total) VALUES (?, ?)',
+                    (run_date, len(streamers))
+                )
+                run_id = cur.lastrowid
+                conn.executemany('''
+                    INSERT INTO diamonds_monthly_run_items
+                        (run_id, user_id, name, old_current)
+                    VALUES (?, ?, ?, ?)
+                ''', [
+                    (run_id, s['user_id'], s['name'], s.get('diamonds_current_month') or 0)
+                    for s in streamers
+                ])
+                return run_id
+        except Exception as exc:
+            logging.error(f"create_monthly_run: {exc}")
+            return None
+
+    def get_active_monthly_run(self) -> Optional[Dict]:
+        """Незавершений запуск (якщо процес впав посеред ротації)"""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute('''
+                    SELECT id, run_date, total, started_at
+                    FROM diamonds_monthly_runs
+                    WHERE status = 'running'
+                    ORDER BY id DESC LIMIT 1
+                ''').fetchone()
+                return dict(row) if row else None
+        except Exception as exc:
+            logging.error(f"get_active_monthly_run: {exc}")
+            return None
+
+    def get_pending_monthly_run_items(self, run_id: int) -> List[Dict]:
+        """Стрімери запуску, які ще не оброблені (формат як get_all_streamers_for_diamonds)"""
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute('''
+                    SELECT user_id, name, old_current AS diamonds_current_month
+                    FROM diamonds_monthly_run_items
+                    WHERE run_id = ? AND status = 'pending'
+                    ORDER BY name ASC
+                ''', (run_id,)).fetchall()
+                return [dict(r) for r in rows]
+        except Exception as exc:
+            logging.error(f"get_pending_monthly_run_items: {exc}")
+            return []
+
+    def get_monthly_run_counts(self, run_id: int) -> Dict[str, int]:
+        """{'pending': n, 'done': n, 'failed': n}"""
+        counts = {'pending': 0, 'done': 0, 'failed': 0}
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute('''
+                    SELECT status, COUNT(*) AS cnt
+                    FROM diamonds_monthly_run_items
+                    WHERE run_id = ?
+                    GROUP BY status
+                ''', (run_id,)).fetchall()
+                counts.update({r['status']: r['cnt'] for r in rows})
+        except Exception as exc:
+            logging.error(f"get_monthly_run_counts: {exc}")
+        return counts
+
+    def finish_monthly_run(self, run_id: int) -> None:
+        """Закриває запуск; поштучні чекпоінти більше не потрібні"""
+        try:
+            with self.get_connection() as conn:
+                conn.execute('''
+                    UPDATE diamonds_monthly_runs
+                    SET status = 'completed', finished_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (run_id,))
+                conn.execute(
+                    'DELETE FROM diamonds_monthly_run_items WHERE run_id = ?', (run_id,)
+                )
+        except Exception as exc:
+            logging.error(f"finish_monthly_run: {exc}")
+
     def get_diamonds_summary(self) -> Dict:
         try:
             with self.get_connection() as conn:
@@ -955,6 +1929,20 @@ class DatabaseManager:
         except Exception as exc:
             logging.error(f"log_diamonds_error: {exc}")
 
+    def bulk_log_diamonds_errors(self, errors: List[Tuple[str, str, str, int]]) -> None:
+        """errors: [(streamer_id, streamer_name, error_text, retries), ...]"""
+        if not errors:
+            return
+        try:
+            with self.get_connection() as conn:
+                conn.executemany('''
+                    INSERT INTO diamonds_errors
+                        (streamer_id, streamer_name, error_text, retries)
+                    VALUES (?, ?, ?, ?)
+                ''', errors)
+        except Exception as exc:
+            logging.error(f"bulk_log_diamonds_errors: {exc}")
+
     def get_diamonds_errors(self, limit: int = 200) -> List[Dict]:
         try:
             with self.get_connection() as conn:
@@ -992,11 +1980,12 @@ class DatabaseManager:
                         WHERE user_id = ?
                     ''', (mentor_name, profile_url, telegram_username, instagram_url, user_id))
                 else:
-                    conn.execute('''
+                    cur = conn.execute('''
                         INSERT INTO mentors
                             (mentor_name, user_id, profile_url, telegram_username, instagram_url)
                         VALUES (?, ?, ?, ?, ?)
                     ''', (mentor_name, user_id, profile_url, telegram_username, instagram_url))
+                    self._adopt_streamers(conn, cur.lastrowid, mentor_name)
                 return True
         except Exception as exc:
             logging.error(f"add_mentor: {exc}")
@@ -1083,23 +2072,37 @@ class DatabaseManager:
             logging.error(f"get_deleted_mentors: {exc}")
             return []
 
+    @staticmethod
+    def _adopt_streamers(conn, mentor_id: int, mentor_name: str) -> None:
+        """Прив'язує до ментора стрімерів з його ім'ям, що лишились без mentor_id"""
+        conn.execute(
+            'UPDATE streamers SET mentor_id = ? '
+            'WHERE mentor_id IS NULL AND mentor_name = ?',
+            (mentor_id, mentor_name)
+        )
+
     def get_mentor_statistics(self) -> Dict:
+        """
+        {mentor_name: {...}} з лічильників mentor_streamer_counts —
+        без агрегації по всій таблиці streamers
+        """
         try:
             with self.get_connection() as conn:
                 rows = conn.execute('''
-                    SELECT m.mentor_name,
-                           COUNT(s.id) AS count,
-                           MAX(s.created_at) AS last_assigned,
+                    SELECT m.id, m.mentor_name, m.telegram_chat_id,
+                           COALESCE(c.cnt, 0) AS count,
+                           c.last_created_at AS last_assigned,
                            CASE WHEN m.telegram_chat_id IS NOT NULL THEN 1 ELSE 0 END AS is_activated
                     FROM mentors m
-                    LEFT JOIN streamers s ON s.mentor_name = m.mentor_name
-                    GROUP BY m.id
+                    LEFT JOIN mentor_streamer_counts c ON c.mentor_id = m.id
                 ''').fetchall()
                 return {
                     r['mentor_name']: {
+                        'mentor_id':    r['id'],
                         'count':        r['count'],
                         'last_assigned': r['last_assigned'],
                         'is_activated': bool(r['is_activated']),
+                        'telegram_chat_id': r['telegram_chat_id'],
                     }
                     for r in rows
                 }
@@ -1151,6 +2154,7 @@ class DatabaseManager:
                     deleted['telegram_chat_id'], deleted['instagram_url'],
                     deleted['last_assigned_at'], deleted['created_at']
                 ))
+                self._adopt_streamers(conn, deleted['id'], deleted['mentor_name'])
                 conn.execute('DELETE FROM deleted_mentors WHERE id = ?', (mentor_id,))
                 return True
         except Exception as exc:
@@ -1233,10 +2237,11 @@ class DatabaseManager:
                 ''', (new_name, new_user_id, new_profile_url, mentor_id))
                 if cur.rowcount == 0:
                     return False
-                # Оновлюємо mentor_name у всіх стрімерів
+                # Оновлюємо mentor_name у всіх стрімерів ментора
                 conn.execute(
-                    'UPDATE streamers SET mentor_name = ? WHERE mentor_name = ?',
-                    (new_name, old_name)
+                    'UPDATE streamers SET mentor_name = ?, mentor_id = ? '
+                    'WHERE mentor_id = ? OR (mentor_id IS NULL AND mentor_name = ?)',
+                    (new_name, mentor_id, mentor_id, old_name)
                 )
                 return True
         except Exception as exc:
@@ -1285,6 +2290,29 @@ class DatabaseManager:
             logging.error(f"get_all_gifters: {exc}")
             return []
 
+    def get_all_gifters_with_owners(self) -> List[Dict]:
+        """
+        Всі дарувальники з ім'ям власника одним JOIN-запитом
+        (замість get_bot_user_by_telegram_id на кожен рядок).
+        owner_name: first_name → username → owner_id; '' якщо власника немає в bot_users.
+        """
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute('''
+                    SELECT DISTINCT g.name, g.user_id, g.profile_url, g.owner_id, g.created_at,
+                           CASE WHEN u.telegram_id IS NULL THEN ''
+                                ELSE COALESCE(NULLIF(u.first_name, ''), NULLIF(u.username, ''),
+                                              CAST(g.owner_id AS TEXT))
+                           END AS owner_name
+                    FROM gifters g
+                    LEFT JOIN bot_users u ON u.telegram_id = g.owner_id
+                    ORDER BY g.created_at DESC
+                ''').fetchall()
+                return [dict(r) for r in rows]
+        except Exception as exc:
+            logging.error(f"get_all_gifters_with_owners: {exc}")
+            return []
+
     def remove_gifter(self, user_id: str, owner_id: int) -> bool:
         try:
             with self.get_connection() as conn:
@@ -1297,6 +2325,65 @@ class DatabaseManager:
             logging.error(f"remove_gifter: {exc}")
             return False
 
+    # ================================================================
+    # ПОШУКОВІ ЗАДАЧІ (SearchJobRunner)
+    # ================================================================
+
+    def create_search_job(
+        self, user_telegram_id: int, chat_id: int, message_id: int,
+        gifter_ids: List[str], engine: str
+    ) -> Optional[int]:
+        try:
+            with self.get_connection() as conn:
+                cur = conn.execute('''
+                    INSERT INTO search_jobs
+                        (user_telegram_id, chat_id, message_id, gifter_ids, engine)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (user_telegram_id, chat_id, message_id, json.dumps(gifter_ids), engine))
+                return cur.lastrowid
+        except Exception as exc:
+            logging.error(f"create_search_job: {exc}")
+            return None
+
+    def update_search_job(self, job_id: int, **fields) -> bool:
+        """Оновлює поля задачі з SEARCH_JOB_FIELDS; значення 'now' → CURRENT_TIMESTAMP"""
+        fields = {k: v for k, v in fields.items() if k in SEARCH_JOB_FIELDS}
+        if not fields:
+            return False
+        assignments = ', '.join(
+            f'{k} = CURRENT_TIMESTAMP' if v == 'now' else f'{k} = ?'
+            for k, v in fields.items()
+        )
+        params = [v for v in fields.values() if v != 'now']
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    f'UPDATE search_jobs SET {assignments} WHERE id = ?', (*params, job_id)
+                )
+                return True
+        except Exception as exc:
+            logging.error(f"update_search_job: {exc}")
+            return False
+
+    def get_unfinished_search_jobs(self) -> List[Dict]:
+        """Задачі, що лишились у черзі або виконувались на момент зупинки (старші першими)"""
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute('''
+                    SELECT * FROM search_jobs
+                    WHERE status IN ('queued', 'running')
+                    ORDER BY id
+                ''').fetchall()
+                jobs = []
+                for r in rows:
+                    job = dict(r)
+                    job['gifter_ids'] = json.loads(job['gifter_ids'])
+                    jobs.append(job)
+                return jobs
+        except Exception as exc:
+            logging.error(f"get_unfinished_search_jobs: {exc}")
+            return []
+
     # ================================================================
     # USER DONORS (особисті даруваники менторів)
     # ================================================================
@@ -1333,15 +2420,15 @@ class DatabaseManager:
             return []
 
     def search_user_donor(self, user_telegram_id: int, query: str) -> List[Dict]:
+        """Пошук серед даруваників користувача за ім'ям, Tango ID і нотатками (за релевантністю)"""
         try:
             with self.get_connection() as conn:
-                q = f'%{query}%'
-                rows = conn.execute('''
-                    SELECT * FROM user_donors
-                    WHERE user_telegram_id = ?
-                      AND (donor_name LIKE ? OR donor_tango_id LIKE ?)
-                    ORDER BY created_at DESC
-                ''', (user_telegram_id, q, q)).fetchall()
+                ids = self._search_ids(
+                    conn, 'user_donors', query,
+                    scope='rowid IN (SELECT id FROM user_donors WHERE user_telegram_id = ?)',
+                    scope_params=(user_telegram_id,)
+                )
+                rows = self._fetch_by_ids(conn, 'SELECT * FROM user_donors', ids)
                 return [dict(r) for r in rows]
         except Exception as exc:
             logging.error(f"search_user_donor: {exc}")
@@ -1378,6 +2465,118 @@ class DatabaseManager:
             logging.error(f"get_all_user_donors_grouped: {exc}")
             return {}
 
+    # ================================================================
+    # ПОШУК (FTS5)
+    # ================================================================
+
+    def search_streamers(self, query: str, limit: int = SEARCH_RESULT_LIMIT) -> List[Tuple]:
+        """
+        Пошук стрімерів за ім'ям, Tango ID, Telegram, Instagram та ментором.
+        Повертає tuples як get_all_streamers, найрелевантніші першими.
+        """
+        try:
+            with self.get_connection() as conn:
+                ids = self._search_ids(conn, 'streamers', query, limit=limit)
+                conn.row_factory = None
+                return self._fetch_by_ids(conn, '''
+                    SELECT name, user_id, profile_url, tg_name, tg_url,
+                           instagram_url, platform, mentor_name, created_at, id
+                    FROM streamers
+                ''', ids)
+        except Exception as exc:
+            logging.error(f"search_streamers: {exc}")
+            return []
+
+    def rebuild_search_index(self) -> bool:
+        """Повна перебудова FTS-індексів з таблиць-джерел"""
+        if not self.fts_enabled:
+            return False
+        try:
+            with self.get_connection() as conn:
+                for table in SEARCH_INDEXES:
+                    fts = f'{table}_fts'
+                    conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+                return True
+        except Exception as exc:
+            logging.error(f"rebuild_search_index: {exc}")
+            return False
+
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        text = (text or '').casefold()
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    @staticmethod
+    def _fts_phrase(text: str) -> str:
+        return '"' + text.replace('"', '""') + '"'
+
+    def _search_ids(
+        self, conn, table: str, query: str, scope: str = '',
+        scope_params: tuple = (), limit: int = SEARCH_RESULT_LIMIT
+    ) -> List[int]:
+        """
+        id рядків table, що відповідають query, у порядку релевантності:
+        1) підрядок (фраза по триграмах), ранжування bm25 з вагами полів;
+        2) якщо нічого — нечіткий збіг: OR по триграмах запиту, відсіяний
+           за часткою спільних триграм (SEARCH_FUZZY_THRESHOLD);
+        запити коротші за 3 символи та БД без FTS5 — через LIKE по casefold()
+        (без урахування регістру, зокрема для кирилиці).
+        """
+        query = query.strip()
+        if not query:
+            return []
+        fields, weights = SEARCH_INDEXES[table]
+        scope_sql = f' AND {scope}' if scope else ''
+
+        if not self.fts_enabled or len(query) < 3:
+            like = ' OR '.join(f"casefold({f}) LIKE ? ESCAPE '\\'" for f in fields)
+            pattern = '%' + re.sub(r'([\\%_])', r'\\\1', query.casefold()) + '%'
+            rows = conn.execute(
+                f'SELECT id FROM {table} WHERE ({like}){scope_sql} '
+                f'ORDER BY created_at DESC LIMIT ?',
+                (*[pattern] * len(fields), *scope_params, limit)
+            ).fetchall()
+            return [r[0] for r in rows]
+
+        fts = f'{table}_fts'
+        rank = f"bm25({fts}, {', '.join(str(w) for w in weights)})"
+        rows = conn.execute(
+            f'SELECT rowid FROM {fts} WHERE {fts} MATCH ?{scope_sql} '
+            f'ORDER BY {rank} LIMIT ?',
+            (self._fts_phrase(query), *scope_params, limit)
+        ).fetchall()
+        if rows:
+            return [r[0] for r in rows]
+
+        grams = self._trigrams(query)
+        if len(grams) < 2:
+            return []
+        rows = conn.execute(
+            f"SELECT rowid, {', '.join(fields)} FROM {fts} WHERE {fts} MATCH ?{scope_sql} "
+            f'ORDER BY {rank} LIMIT ?',
+            (' OR '.join(self._fts_phrase(g) for g in grams), *scope_params, limit * 4)
+        ).fetchall()
+        scored = []
+        for position, row in enumerate(rows):
+            similarity = max(
+                len(grams & self._trigrams(value)) for value in tuple(row)[1:]
+            ) / len(grams)
+            if similarity >= SEARCH_FUZZY_THRESHOLD:
+                scored.append((-similarity, position, row[0]))
+        return [row_id for _, _, row_id in sorted(scored)[:limit]]
+
+    @staticmethod
+    def _fetch_by_ids(conn, select_sql: str, ids: List[int]) -> list:
+        """Рядки select_sql з id з ids у тому ж порядку (id — останнє поле або ключ 'id')"""
+        if not ids:
+            return []
+        placeholders = ', '.join('?' * len(ids))
+        rows = conn.execute(f'{select_sql} WHERE id IN ({placeholders})', ids).fetchall()
+        order = {row_id: i for i, row_id in enumerate(ids)}
+        if rows and isinstance(rows[0], sqlite3.Row):
+            return sorted(rows, key=lambda r: order[r['id']])
+        return [r[:-1] for r in sorted(rows, key=lambda r: order[r[-1]])]
+
     # ================================================================
     # AUDIT LOG
     # ================================================================
@@ -1403,18 +2602,167 @@ class DatabaseManager:
         except Exception as exc:
             logging.error(f"add_audit_log: {exc}")
 
-    def get_audit_logs(self, limit: int = 100) -> List[Dict]:
+    @staticmethod
+    def _audit_where(
+        date_from: Optional[str] = None, date_to: Optional[str] = None,
+        action_type: Optional[str] = None, user_telegram_id: Optional[int] = None,
+        target_type: Optional[str] = None, target_id: Optional[str] = None
+    ) -> Tuple[str, list]:
+        """WHERE для фільтрів аудиту; date_from включно, date_to — ні"""
+        conditions, params = [], []
+        for sql, value in (
+            ('created_at >= ?', date_from),
+            ('created_at < ?', date_to),
+            ('action_type = ?', action_type),
+            ('user_telegram_id = ?', user_telegram_id),
+            ('target_type = ?', target_type),
+            ('target_id = ?', target_id),
+        ):
+            if value is not None:
+                conditions.append(sql)
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+    def get_audit_logs(
+        self, limit: int = 100, before_id: Optional[int] = None, **filters
+    ) -> List[Dict]:
+        """
+        Записи аудиту від нових до старих.
+        filters: date_from, date_to, action_type, user_telegram_id, target_type, target_id.
+        before_id — курсор: наступна сторінка після запису з цим id
+        (keyset по (created_at, id), без OFFSET).
+        """
         try:
+            where, params = self._audit_where(**filters)
+            if before_id is not None:
+                where += (' AND ' if where else ' WHERE ') + (
+                    '(created_at, id) < (SELECT created_at, id FROM audit_log WHERE id = ?)'
+                )
+                params.append(before_id)
             with self.get_connection() as conn:
                 rows = conn.execute(
-                    'SELECT * FROM audit_log ORDER BY created_at DESC LIMIT ?',
-                    (limit,)
+                    f'SELECT * FROM audit_log{where} ORDER BY created_at DESC, id DESC LIMIT ?',
+                    (*params, limit)
                 ).fetchall()
                 return [dict(r) for r in rows]
         except Exception as exc:
             logging.error(f"get_audit_logs: {exc}")
             return []
 
+    def get_audit_log(self, log_id: int) -> Optional[Dict]:
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    'SELECT * FROM audit_log WHERE id = ?', (log_id,)
+                ).fetchone()
+                return dict(row) if row else None
+        except Exception as exc:
+            logging.error(f"get_audit_log: {exc}")
+            return None
+
+    def count_audit_logs(self, **filters) -> int:
+        try:
+            where, params = self._audit_where(**filters)
+            with self.get_connection() as conn:
+                return conn.execute(
+                    f'SELECT COUNT(*) FROM audit_log{where}', params
+                ).fetchone()[0]
+        except Exception as exc:
+            logging.error(f"count_audit_logs: {exc}")
+            return 0
+
+    def get_audit_stats(
+        self, group_by: Tuple[str, ...] = ('by_user', 'by_target'), top: int = 10, **filters
+    ) -> Dict:
+        """
+        Агрегати аудиту в SQL: {'total', 'by_action', 'by_user', 'by_target'}.
+        by_action рахується завжди (з індексу, без читання рядків);
+        group_by — які з by_user/by_target рахувати (лише top найчастіших).
+        """
+        stats = {'total': 0, 'by_action': {}, 'by_user': {}, 'by_target': {}}
+        try:
+            where, params = self._audit_where(**filters)
+            # GROUP BY +column: групування не повинно відбирати в WHERE
+            # індекс діапазону дат (інакше — повний прохід по action-індексу)
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    f'SELECT action_type, COUNT(*) FROM audit_log{where} '
+                    f'GROUP BY +action_type ORDER BY 2 DESC',
+                    params
+                ).fetchall()
+                stats['by_action'] = {r[0]: r[1] for r in rows}
+                stats['total'] = sum(stats['by_action'].values())
+                for key, column in (('by_user', 'user_name'), ('by_target', 'target_type')):
+                    if key not in group_by:
+                        continue
+                    rows = conn.execute(
+                        f'SELECT {column}, COUNT(*) FROM audit_log{where} '
+                        f'GROUP BY +{column} ORDER BY 2 DESC LIMIT ?',
+                        (*params, top)
+                    ).fetchall()
+                    stats[key] = {r[0]: r[1] for r in rows}
+        except Exception as exc:
+            logging.error(f"get_audit_stats: {exc}")
+        return stats
+
+    # ================================================================
+    # ЕКСПОРТ (потокове читання курсором)
+    # ================================================================
+
+    def _iter_query(self, name: str, sql: str, params: tuple = ()) -> Iterator[sqlite3.Row]:
+        """
+        Генератор рядків запиту пачками по EXPORT_BATCH_SIZE — результат
+        ніколи не матеріалізується повністю. Помилка логується і
+        прокидається далі, щоб експорт не віддав обрізаний файл.
+        """
+        try:
+            with self.get_connection() as conn:
+                cur = conn.execute(sql, params)
+                while True:
+                    batch = cur.fetchmany(EXPORT_BATCH_SIZE)
+                    if not batch:
+                        break
+                    yield from batch
+        except Exception as exc:
+            logging.error(f"{name}: {exc}")
+            raise
+
+    def iter_streamers_for_export(self) -> Iterator[sqlite3.Row]:
+        return self._iter_query('iter_streamers_for_export', '''
+            SELECT user_id, name, tg_name, instagram_url, platform,
+                   mentor_name, diamonds_now, created_at
+            FROM streamers ORDER BY created_at DESC, id DESC
+        ''')
+
+    def iter_users_for_export(self) -> Iterator[sqlite3.Row]:
+        return self._iter_query('iter_users_for_export', '''
+            SELECT telegram_id, username, first_name, last_name, full_name,
+                   role, created_at
+            FROM bot_users ORDER BY created_at DESC
+        ''')
+
+    def iter_audit_logs(self) -> Iterator[sqlite3.Row]:
+        return self._iter_query('iter_audit_logs', '''
+            SELECT created_at, user_name, action_type, target_type, target_name
+            FROM audit_log ORDER BY created_at DESC, id DESC
+        ''')
+
+    def iter_donors_for_export(self) -> Iterator[sqlite3.Row]:
+        """Даруваники з пошуку (gifters) і особисті даруваники (user_donors)"""
+        return self._iter_query('iter_donors_for_export', '''
+            SELECT 'gifter' AS kind,
+                   COALESCE(bu.username, bu.full_name, g.owner_id) AS owner,
+                   g.name AS donor_name, g.user_id AS tango_id, g.created_at
+            FROM gifters g
+            LEFT JOIN bot_users bu ON bu.telegram_id = g.owner_id
+            UNION ALL
+            SELECT 'personal',
+                   COALESCE(bu.username, bu.full_name, ud.user_telegram_id),
+                   ud.donor_name, ud.donor_tango_id, ud.created_at
+            FROM user_donors ud
+            LEFT JOIN bot_users bu ON bu.telegram_id = ud.user_telegram_id
+        ''')
+
     # ================================================================
     # УТИЛІТИ
     # ================================================================
@@ -1443,3 +2791,55 @@ class DatabaseManager:
                 conn.execute('VACUUM')
         except Exception as exc:
             logging.error(f"vacuum: {exc}")
+
+
+class AsyncDatabaseManager:
+    """
+    Асинхронний фасад над DatabaseManager.
+    Кожен публічний метод DatabaseManager доступний як awaitable і
+    виконується в окремому потоці БД, тому повільні запити (чи VACUUM)
+    не блокують event loop бота.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-worker')
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.db, name)
+        if name.startswith('_') or name == 'get_connection' or not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(attr, *args, **kwargs)
+            )
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        # Кешуємо обгортку, щоб наступні виклики не проходили через __getattr__
+        setattr(self, name, call)
+        return call
+
+    # ── Перевірка доступу: hit у UserCache не чекає черги потоку БД ──
+
+    async def get_bot_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict]:
+        cached = self.db.user_cache.get(telegram_id)
+        if cached is not UserCache.MISSING:
+            return cached
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.db._load_bot_user, telegram_id
+        )
+
+    async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[Dict]:
+        return await self.get_bot_user_by_telegram_id(telegram_id)
+
+    async def get_user_role(self, telegram_id: int) -> Optional[str]:
+        user = await self.get_bot_user_by_telegram_id(telegram_id)
+        return user['role'] if user else None
+
+    def close(self) -> None:
+        """Зупиняє потік БД, дочекавшись завершення поставлених запитів"""
+        self._executor.shutdown(wait=True)
@@ -17,12 +17,44 @@ class AuditHandlers:
     def __init__(self, bot):
         self.bot = bot
     
+    def register_callbacks(self, registry):
+        """Callback'и аудит-логу (декоратор ролі потребує update/context)"""
+        registry.exact('audit_menu', self.show_audit_menu, pass_update=True)
+        registry.exact('audit_filters', self.show_filters_menu, pass_update=True)
+        registry.exact('audit_filter_action', self.show_action_type_filter, pass_update=True)
+        for period in ('today', 'week', 'month'):
+            registry.exact(
+                f'audit_{period}',
+                lambda update, context, period=period: self.show_logs_by_period(update, context, period),
+                pass_update=True
+            )
+        
+        registry.prefix('audit_recent_', self._on_recent, pass_update=True)
+        registry.prefix('audit_show_action_', self._on_show_action, pass_update=True)
+        # Наступна сторінка: audit_action_page_{before_id}_{action_type}
+        registry.prefix('audit_action_page_', self._on_action_page, pass_update=True)
+    
+    # ── Розбір параметризованих callback'ів ───────────────────────
+    
+    async def _on_recent(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        limit = int(update.callback_query.data[len('audit_recent_'):])
+        await self.show_recent_logs(update, context, limit)
+    
+    async def _on_show_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        action_type = update.callback_query.data[len('audit_show_action_'):]
+        await self.show_logs_by_action(update, context, action_type)
+    
+    async def _on_action_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        # action_type сам містить '_', тому ділимо лише по першому
+        before_id, action_type = update.callback_query.data[len('audit_action_page_'):].split('_', 1)
+        await self.show_logs_by_action(update, context, action_type, before_id=int(before_id))
+    
     ACTION_TYPES = {
         'add_streamer': '➕ Додавання стрімера',
         'edit_streamer': '✏️ Редагування стрімера',
         'delete_streamer': '🗑 Видалення стрімера',
         'assign_mentor': '🎯 Призначення ментора',
-        'reassign_mentor': '🔄 Переприв'язування ментора',
+        'reassign_mentor': "🔄 Переприв'язування ментора",
         'add_donor': '➕ Додавання даруваника',
         'delete_donor': '🗑 Видалення даруваника',
         'add_user': '➕ Додавання користувача',
@@ -72,7 +104,7 @@ class AuditHandlers:
         query = update.callback_query
         await query.answer()
         
-        logs = self.bot.db.get_audit_logs(limit=limit)
+        logs = await self.bot.adb.get_audit_logs(limit=limit)
         
         if not logs:
             text = "📋 <b>Аудит-лог</b>\n\n📭 Записів немає"
@@ -124,22 +156,21 @@ class AuditHandlers:
             return
         
         date_from_str = date_from.strftime('%Y-%m-%d %H:%M:%S')
-        logs = self.bot.db.get_audit_logs(limit=1000, date_from=date_from_str)
+        stats = await self.bot.adb.get_audit_stats(group_by=(), date_from=date_from_str)
         
-        if not logs:
+        if not stats['total']:
             text = f"📋 <b>Аудит-лог {period_name}</b>\n\n📭 Записів немає"
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='audit_menu')]]
         else:
-            # Підрахунок статистики
-            stats = self._calculate_stats(logs)
+            logs = await self.bot.adb.get_audit_logs(limit=15, date_from=date_from_str)
             
             text = (
                 f"📋 <b>Аудит-лог {period_name}</b>\n\n"
-                f"📊 Всього дій: {len(logs)}\n\n"
+                f"📊 Всього дій: {stats['total']}\n\n"
                 f"<b>За типами:</b>\n"
             )
             
-            for action_type, count in sorted(stats['by_action'].items(), key=lambda x: x[1], reverse=True):
+            for action_type, count in stats['by_action'].items():
                 action_name = self.ACTION_TYPES.get(action_type, action_type)
                 text += f"{action_name}: {count}\n"
             
@@ -207,12 +238,17 @@ class AuditHandlers:
     
     @admin_or_higher
     async def show_logs_by_action(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
-                                 action_type: str, user_role=None, user_data=None):
-        """Показує логи по типу дії"""
+                                 action_type: str, before_id: int = None,
+                                 user_role=None, user_data=None):
+        """Показує логи по типу дії (сторінками по 15, курсор — id останнього запису)"""
         query = update.callback_query
         await query.answer()
         
-        logs = self.bot.db.get_audit_logs(limit=100, action_type=action_type)
+        page_size = 15
+        total = await self.bot.adb.count_audit_logs(action_type=action_type)
+        logs = await self.bot.adb.get_audit_logs(
+            limit=page_size, before_id=before_id, action_type=action_type
+        )
         
         action_name = self.ACTION_TYPES.get(action_type, action_type)
         
@@ -220,16 +256,18 @@ class AuditHandlers:
             text = f"📝 <b>{action_name}</b>\n\n📭 Записів немає"
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='audit_filter_action')]]
         else:
-            text = f"📝 <b>{action_name}</b>\n\n📊 Всього: {len(logs)}\n\n"
+            text = f"📝 <b>{action_name}</b>\n\n📊 Всього: {total}\n\n"
             
-            for log in logs[:15]:
+            for log in logs:
                 date_time = log['created_at'][5:16]
                 text += f"👤 {log['user_name']}\n🎯 {log['target_name']}\n🕐 {date_time}\n\n"
             
-            if len(logs) > 15:
-                text += f"... та ще {len(logs) - 15} записів"
-            
-            keyboard = [
+            keyboard = []
+            if len(logs) == page_size:
+                keyboard.append([InlineKeyboardButton(
+                    "➡️ Далі", callback_data=f"audit_action_page_{logs[-1]['id']}_{action_type}"
+                )])
+            keyboard += [
                 [InlineKeyboardButton("📊 Детальніше", callback_data=f'audit_action_details_{action_type}')],
                 [InlineKeyboardButton("◀️ Назад", callback_data='audit_filter_action')]
             ]
@@ -248,8 +286,7 @@ class AuditHandlers:
         query = update.callback_query
         await query.answer()
         
-        logs = self.bot.db.get_audit_logs(limit=1000)
-        log = next((l for l in logs if l['id'] == log_id), None)
+        log = await self.bot.adb.get_audit_log(log_id)
         
         if not log:
             await query.answer("❌ Запис не знайдено", show_alert=True)
@@ -283,30 +320,3 @@ class AuditHandlers:
         reply_markup = InlineKeyboardMarkup(keyboard)
         
         await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='HTML')
-    
-    # ================================
-    # ДОПОМІЖНІ МЕТОДИ
-    # ================================
-    
-    def _calculate_stats(self, logs):
-        """Розраховує статистику по логам"""
-        stats = {
-            'by_action': {},
-            'by_user': {},
-            'by_target': {}
-        }
-        
-        for log in logs:
-            # По діях
-            action = log['action_type']
-            stats['by_action'][action] = stats['by_action'].get(action, 0) + 1
-            
-            # По користувачах
-            user = log['user_name']
-            stats['by_user'][user] = stats['by_user'].get(user, 0) + 1
-            
-            # По цільових об'єктах
-            target = log['target_type']
-            stats['by_target'][target] = stats['by_target'].get(target, 0) + 1
-        
-        return stats
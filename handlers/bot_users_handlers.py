@@ -12,10 +12,144 @@ class BotUsersHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и керування користувачами бота"""
+        registry.exact('bot_users_menu', lambda query, user_id, arg: self.show_bot_users_menu(query, user_id))
+        registry.exact('add_bot_user', lambda query, user_id, arg: self.start_add_user(query, user_id))
+        registry.exact('list_bot_users', lambda query, user_id, arg: self.show_users_list(query))
+        registry.exact('change_user_role_select', lambda query, user_id, arg: self.show_users_for_role_change(query))
+        registry.exact('delete_bot_user_select', lambda query, user_id, arg: self.show_users_for_deletion(query))
+        registry.exact('decline_activation', lambda query, user_id, arg: self.decline_activation(query))
+
+        # Створення запрошень
+        registry.prefix('create_invite_', self._on_create_invite)
+        # Підтвердження активації
+        registry.prefix('confirm_activation_', lambda query, user_id, arg: self.confirm_activation(query, arg))
+        # Призначення ролі новому користувачу
+        registry.prefix('set_role_', self._on_set_role)
+        # Вибір ролі / запрошення для нового користувача (за username)
+        registry.prefix('select_role_', self._on_select_role)
+        registry.prefix('send_invite_', self._on_send_invite)
+        registry.prefix('skip_invite_', self._on_skip_invite)
+
+        # Зміна ролі існуючого користувача
+        registry.prefix('change_role_', self._on_change_role)
+        registry.prefix('change_role_inactive_', self._on_change_role_inactive)
+        registry.prefix('update_role_', self._on_update_role)
+
+        # Видалення користувача
+        registry.prefix('confirm_delete_user_', self._on_confirm_delete_user)
+        registry.prefix('confirm_delete_user_inactive_', self._on_confirm_delete_user_inactive)
+        registry.prefix('delete_user_confirmed_', self._on_delete_user_confirmed)
+        registry.prefix('delete_user_confirmed_inactive_', self._on_delete_user_confirmed_inactive)
+
+    def register_states(self, registry):
+        """Стани введення тексту для користувачів бота"""
+        registry.register('waiting_new_user_username', self.process_new_user_username)
+
+    # ── Розбір параметризованих callback'ів ───────────────────────
+
+    async def _on_create_invite(self, query, user_id, arg):
+        role = arg.split('_')[0]
+        await self.create_invitation_link(query, user_id, role)
+
+    async def _on_set_role(self, query, user_id, arg):
+        parts = arg.split('_')
+        role = parts[0]
+        target_user_id = int(parts[1])
+        await self.assign_role(query, user_id, role, target_user_id)
+
+    async def _on_select_role(self, query, user_id, arg):
+        parts = arg.split('|', 1)
+        role = parts[0]
+        username = parts[1] if len(parts) > 1 else None
+        if username:
+            await self.confirm_role_and_send_invite(query, user_id, role, username)
+
+    async def _on_send_invite(self, query, user_id, arg):
+        parts = arg.rsplit('|', 1)
+        username = parts[0]
+        role = parts[1] if len(parts) > 1 else None
+        if username and role:
+            await self.send_invite_to_user(query, user_id, username, role)
+
+    async def _on_skip_invite(self, query, user_id, arg):
+        parts = arg.rsplit('|', 1)
+        username = parts[0]
+        role = parts[1] if len(parts) > 1 else None
+        if username and role:
+            await self.add_user_without_invite(query, user_id, username, role)
+
+    async def _on_change_role(self, query, user_id, arg):
+        if arg.startswith('select'):
+            return
+        try:
+            target_user_id = int(arg.split('_')[0])
+            await self.change_user_role(query, user_id, target_user_id)
+        except (ValueError, IndexError):
+            await query.answer("❌ Помилка: невірний користувач!", show_alert=True)
+
+    async def _on_change_role_inactive(self, query, user_id, username):
+        # Інактивний користувач без telegram_id
+        target_user = await self.bot.adb.get_bot_user_by_username(username)
+        if target_user:
+            await self.change_user_role_by_username(query, user_id, username)
+        else:
+            await query.answer("❌ Користувача не знайдено!", show_alert=True)
+
+    async def _on_update_role(self, query, user_id, arg):
+        # Оновлення ролі для інактивного користувача: update_role_{role}_inactive_{username}
+        if '_inactive_' in arg:
+            role_part, _, username = arg.partition('_inactive_')
+            if username:
+                target_user = await self.bot.adb.get_bot_user_by_username(username)
+                if target_user:
+                    await self.update_user_role_by_username(query, role_part, username)
+                else:
+                    await query.answer("❌ Користувача не знайдено!", show_alert=True)
+            return
+
+        # Оновлення ролі для активного користувача
+        try:
+            parts = arg.split('_')
+            new_role = parts[0]
+            target_user_id = int(parts[1])
+            await self.update_user_role(query, new_role, target_user_id)
+        except (ValueError, IndexError):
+            await query.answer("❌ Помилка: невірний користувач!", show_alert=True)
+
+    async def _on_confirm_delete_user(self, query, user_id, arg):
+        try:
+            target_user_id = int(arg.split('_')[0])
+            await self.confirm_delete_user(query, target_user_id)
+        except (ValueError, IndexError):
+            await query.answer("❌ Помилка: невірний користувач!", show_alert=True)
+
+    async def _on_confirm_delete_user_inactive(self, query, user_id, username):
+        target_user = await self.bot.adb.get_bot_user_by_username(username)
+        if target_user:
+            await self.confirm_delete_user_by_username(query, username)
+        else:
+            await query.answer("❌ Користувача не знайдено!", show_alert=True)
+
+    async def _on_delete_user_confirmed(self, query, user_id, arg):
+        try:
+            target_user_id = int(arg.split('_')[0])
+            await self.delete_user(query, target_user_id)
+        except (ValueError, IndexError):
+            await query.answer("❌ Помилка: невірний користувач!", show_alert=True)
+
+    async def _on_delete_user_confirmed_inactive(self, query, user_id, username):
+        target_user = await self.bot.adb.get_bot_user_by_username(username)
+        if target_user:
+            await self.delete_user_by_username(query, username)
+        else:
+            await query.answer("❌ Користувача не знайдено!", show_alert=True)
     
     async def show_bot_users_menu(self, query, user_id):
         """Меню керування користувачами бота"""
-        users_count = len(self.bot.db.get_all_bot_users())
+        users_count = len(await self.bot.adb.get_all_bot_users())
         
         keyboard = [
             [InlineKeyboardButton("➕ Додати користувача", callback_data='add_bot_user')],
@@ -34,7 +168,7 @@ class BotUsersHandlers:
     
     async def show_users_list(self, query):
         """Показати список всіх користувачів"""
-        users = self.bot.db.get_all_bot_users()
+        users = await self.bot.adb.get_all_bot_users()
         
         if not users:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='bot_users_menu')]]
@@ -110,7 +244,7 @@ class BotUsersHandlers:
             return
 
         # ДОДАНО: перевірка чи username вже існує в bot_users
-        existing = self.bot.db.get_bot_user_by_username(username)
+        existing = await self.bot.adb.get_bot_user_by_username(username)
         if existing:
             from config import ROLES, ROLE_EMOJI
             role_name = ROLES.get(existing['role'], existing['role'])
@@ -139,7 +273,7 @@ class BotUsersHandlers:
     
     async def show_role_selection_for_new_user(self, update, user_id, username):
         """Показати вибір ролі для нового користувача"""
-        current_user_role = self.bot.db.get_user_role(user_id)
+        current_user_role = await self.bot.adb.get_user_role(user_id)
 
         # Логування для діагностики проблем з ролями
         logging.info(f"show_role_selection_for_new_user: user_id={user_id} current_user_role={current_user_role} username={username}")
@@ -154,7 +288,7 @@ class BotUsersHandlers:
                 logging.info(f"User {user_id} is OWNER_ID: treating as 'owner' for role selection")
                 try:
                     # Додамо у базу, якщо його ще немає
-                    self.bot.db.add_bot_user(user_id, None, 'owner', user_id)
+                    await self.bot.adb.add_bot_user(user_id, None, 'owner', user_id)
                 except Exception:
                     logging.exception("Failed to add OWNER to bot_users")
             else:
@@ -224,7 +358,7 @@ class BotUsersHandlers:
     
     async def show_role_selection(self, update, user_id, target_user_id, is_new=True):
         """Показати вибір ролі"""
-        current_user_role = self.bot.db.get_user_role(user_id)
+        current_user_role = await self.bot.adb.get_user_role(user_id)
         logging.info(f"show_role_selection: user_id={user_id} role={current_user_role} target_user_id={target_user_id}")
         
         keyboard = []
@@ -319,7 +453,7 @@ class BotUsersHandlers:
         activation_code = str(uuid.uuid4()).replace('-', '')[:16]
 
         # Перевіряємо, чи такий username вже існує
-        existing = self.bot.db.get_bot_user_by_username(username)
+        existing = await self.bot.adb.get_bot_user_by_username(username)
         if existing:
             await query.edit_message_text(
                 "❌ Користувач з таким username вже існує в системі!"
@@ -327,7 +461,7 @@ class BotUsersHandlers:
             return
 
         # Додаємо користувача в БД зі статусом pending
-        success = self.bot.db.add_bot_user_pending(username, role, user_id, activation_code)
+        success = await self.bot.adb.add_bot_user_pending(username, role, user_id, activation_code)
 
         if not success:
             await query.edit_message_text(
@@ -396,14 +530,14 @@ class BotUsersHandlers:
         """Додає користувача без запрошення (статус inactive)"""
         # Додаємо користувача в БД зі статусом inactive
         # Перевіряємо дублікати
-        existing = self.bot.db.get_bot_user_by_username(username)
+        existing = await self.bot.adb.get_bot_user_by_username(username)
         if existing:
             await query.edit_message_text(
                 "❌ Користувач з таким username вже існує в системі!"
             )
             return
 
-        success = self.bot.db.add_bot_user_by_username(username, role, user_id, status='inactive')
+        success = await self.bot.adb.add_bot_user_by_username(username, role, user_id, status='inactive')
         
         if success:
             role_name = ROLES.get(role, role)
@@ -444,10 +578,10 @@ class BotUsersHandlers:
         user_id = update.message.from_user.id
         
         # Активуємо користувача
-        success = self.bot.db.activate_bot_user(activation_code, user_id)
+        success = await self.bot.adb.activate_bot_user(activation_code, user_id)
         
         if success:
-            user = self.bot.db.get_bot_user_by_telegram_id(user_id)
+            user = await self.bot.adb.get_bot_user_by_telegram_id(user_id)
             role_name = ROLES.get(user['role'], user['role'])
             emoji = ROLE_EMOJI.get(user['role'], '👤')
             
@@ -474,7 +608,7 @@ class BotUsersHandlers:
         username = query.from_user.username
         
         # Додаємо користувача
-        success = self.bot.db.add_bot_user(target_user_id, None, role, user_id)
+        success = await self.bot.adb.add_bot_user(target_user_id, None, role, user_id)
         
         if success:
             role_name = ROLES.get(role, role)
@@ -497,7 +631,7 @@ class BotUsersHandlers:
     
     async def show_users_for_role_change(self, query):
         """Показати список користувачів для зміни ролі"""
-        users = self.bot.db.get_all_bot_users()
+        users = await self.bot.adb.get_all_bot_users()
         
         if not users:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='bot_users_menu')]]
@@ -546,7 +680,7 @@ class BotUsersHandlers:
     
     async def change_user_role(self, query, user_id, target_user_id):
         """Змінити роль користувача за telegram_id"""
-        target_user = self.bot.db.get_bot_user_by_telegram_id(target_user_id)
+        target_user = await self.bot.adb.get_bot_user_by_telegram_id(target_user_id)
         
         if not target_user:
             await query.edit_message_text("❌ Користувача не знайдено!")
@@ -558,7 +692,7 @@ class BotUsersHandlers:
         """Змінити роль користувача за username"""
         try:
             logging.info(f"change_user_role_by_username called for username: {username}")
-            target_user = self.bot.db.get_bot_user_by_username(username)
+            target_user = await self.bot.adb.get_bot_user_by_username(username)
             logging.info(f"Found target_user: {target_user}")
             
             if not target_user:
@@ -573,7 +707,7 @@ class BotUsersHandlers:
     async def _show_role_selection(self, query, user_id, target_user_id, target_user):
         """Показати вибір нової ролі"""
         # Получаємо роль поточного користувача
-        current_user_role = self.bot.db.get_user_role(user_id)
+        current_user_role = await self.bot.adb.get_user_role(user_id)
         
         keyboard = []
         
@@ -654,7 +788,7 @@ class BotUsersHandlers:
     async def update_user_role(self, query, new_role, target_user_id):
         """Оновити роль користувача"""
         logging.info(f"update_user_role called: target_user_id={target_user_id} new_role={new_role}")
-        success = self.bot.db.update_bot_user_role(target_user_id, new_role)
+        success = await self.bot.adb.update_bot_user_role(target_user_id, new_role)
         
         if success:
             role_name = ROLES.get(new_role, new_role)
@@ -677,16 +811,16 @@ class BotUsersHandlers:
     async def update_user_role_by_username(self, query, new_role, username):
         """Оновити роль користувача за username"""
         try:
-            target_user = self.bot.db.get_bot_user_by_username(username)
+            target_user = await self.bot.adb.get_bot_user_by_username(username)
             if not target_user:
                 await query.answer("❌ Користувача не знайдено!", show_alert=True)
                 return
             
             # Оновлюємо роль (для активних користувачів — по telegram_id, для інактивних — по username)
             if target_user.get('telegram_id'):
-                success = self.bot.db.update_bot_user_role(target_user['telegram_id'], new_role)
+                success = await self.bot.adb.update_bot_user_role(target_user['telegram_id'], new_role)
             else:
-                success = self.bot.db.update_bot_user_role_by_username(username, new_role)
+                success = await self.bot.adb.update_bot_user_role_by_username(username, new_role)
             
             if success:
                 role_name = ROLES.get(new_role, new_role)
@@ -709,7 +843,7 @@ class BotUsersHandlers:
     
     async def show_users_for_deletion(self, query):
         """Показати список користувачів для видалення"""
-        users = self.bot.db.get_all_bot_users()
+        users = await self.bot.adb.get_all_bot_users()
         
         if not users:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='bot_users_menu')]]
@@ -758,7 +892,7 @@ class BotUsersHandlers:
     
     async def confirm_delete_user(self, query, target_user_id):
         """Підтвердження видалення користувача за telegram_id"""
-        target_user = self.bot.db.get_bot_user_by_telegram_id(target_user_id)
+        target_user = await self.bot.adb.get_bot_user_by_telegram_id(target_user_id)
         
         if not target_user:
             await query.edit_message_text("❌ Користувача не знайдено!")
@@ -770,7 +904,7 @@ class BotUsersHandlers:
         """Підтвердження видалення користувача за username"""
         try:
             logging.info(f"confirm_delete_user_by_username called for username: {username}")
-            target_user = self.bot.db.get_bot_user_by_username(username)
+            target_user = await self.bot.adb.get_bot_user_by_username(username)
             logging.info(f"Found target_user: {target_user}")
             
             if not target_user:
@@ -826,7 +960,7 @@ class BotUsersHandlers:
     
     async def delete_user(self, query, target_user_id):
         """Видалити користувача"""
-        success = self.bot.db.delete_bot_user(target_user_id)
+        success = await self.bot.adb.delete_bot_user(target_user_id)
         
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='bot_users_menu')]]
@@ -843,7 +977,7 @@ class BotUsersHandlers:
     async def delete_user_by_username(self, query, username):
         """Видалити користувача за username"""
         try:
-            target_user = self.bot.db.get_bot_user_by_username(username)
+            target_user = await self.bot.adb.get_bot_user_by_username(username)
             logging.info(f"confirm_delete_user_by_username called for username: {username}")
             logging.info(f"Found target_user: {target_user}")
             if not target_user:
@@ -852,9 +986,9 @@ class BotUsersHandlers:
             
             # Видаляємо або по telegram_id (active) або по username (inactive)
             if target_user.get('telegram_id'):
-                success = self.bot.db.delete_bot_user(target_user['telegram_id'])
+                success = await self.bot.adb.delete_bot_user(target_user['telegram_id'])
             else:
-                success = self.bot.db.delete_bot_user_by_username(username)
+                success = await self.bot.adb.delete_bot_user_by_username(username)
 
             logging.info(f"delete_user_by_username result for {username}: {success}")
             if success:
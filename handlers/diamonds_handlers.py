@@ -14,6 +14,11 @@ class DiamondsHandlers:
 
     def __init__(self, bot):
         self.bot = bot
+        self._update_running = False
+
+    def register_callbacks(self, registry):
+        """Callback'и діамантів (декоратор ролі потребує update/context)"""
+        registry.exact('update_diamonds_now', self.start_update_diamonds, pass_update=True)
 
     @mentor_or_higher
     async def start_update_diamonds(
@@ -26,13 +31,13 @@ class DiamondsHandlers:
         user_id = update.effective_user.id
 
         # Перевірка: вже виконується?
-        if self.bot.temp_data.get('diamonds_update_running'):
+        if self._update_running:
             await query.answer(
                 "⏳ Оновлення вже виконується, зачекайте...", show_alert=True
             )
             return
 
-        self.bot.temp_data['diamonds_update_running'] = True
+        self._update_running = True
 
         await query.edit_message_text(
             "💎 <b>Оновлення діамантів</b>\n\n"
@@ -55,10 +60,10 @@ class DiamondsHandlers:
                 progress_callback=progress_callback
             )
         finally:
-            self.bot.temp_data.pop('diamonds_update_running', None)
+            self._update_running = False
 
         # Загальна статистика
-        summary = self.bot.db.get_diamonds_summary()
+        summary = await self.bot.adb.get_diamonds_summary()
         total_now = summary['total_now']
         total_diff = summary['total_diff']
 
@@ -93,9 +98,3 @@ class DiamondsHandlers:
             )
         except Exception as exc:
             logging.error(f"Помилка відображення результату diamonds: {exc}")
-
-        # Ставимо в чергу синхронізацію Sheets
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
-            if errors:
-                self.bot.sheets_service.schedule_sync('errors')
@@ -29,7 +29,7 @@ class PersonalDonorHandlers:
             await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         
         text = f"💝 <b>Мої даруваники</b>\n\n📊 Всього: {len(donors)}\n\n"
         
@@ -64,7 +64,7 @@ class PersonalDonorHandlers:
         await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         
         if not donors:
             text = "💝 <b>Мої даруваники</b>\n\n📭 Список порожній"
@@ -125,7 +125,7 @@ class PersonalDonorHandlers:
         await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         donor = next((d for d in donors if d['id'] == donor_id), None)
         
         if not donor:
@@ -257,7 +257,7 @@ class PersonalDonorHandlers:
             notes = update.message.text.strip()
         
         # Зберігаємо даруваника
-        donor_id = self.bot.db.add_user_donor(
+        donor_id = await self.bot.adb.add_user_donor(
             user_telegram_id=user_id,
             donor_name=temp_data['donor_name'],
             donor_tango_id=temp_data['donor_tango_id'],
@@ -267,7 +267,7 @@ class PersonalDonorHandlers:
         
         if donor_id:
             # Логування
-            self.bot.db.add_audit_log(
+            await self.bot.adb.add_audit_log(
                 user_telegram_id=user_id,
                 user_name=user_data.get('full_name', ''),
                 action_type='add_donor',
@@ -312,7 +312,7 @@ class PersonalDonorHandlers:
         await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         donor = next((d for d in donors if d['id'] == donor_id), None)
         
         if not donor:
@@ -343,7 +343,7 @@ class PersonalDonorHandlers:
         await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         donor = next((d for d in donors if d['id'] == donor_id), None)
         
         if not donor:
@@ -373,18 +373,18 @@ class PersonalDonorHandlers:
         await query.answer()
         
         user_id = update.effective_user.id
-        donors = self.bot.db.get_user_donors(user_id)
+        donors = await self.bot.adb.get_user_donors(user_id)
         donor = next((d for d in donors if d['id'] == donor_id), None)
         
         if not donor:
             await query.answer("❌ Даруваника не знайдено", show_alert=True)
             return
         
-        success = self.bot.db.delete_user_donor(donor_id)
+        success = await self.bot.adb.delete_user_donor(donor_id)
         
         if success:
             # Логування
-            self.bot.db.add_audit_log(
+            await self.bot.adb.add_audit_log(
                 user_telegram_id=user_id,
                 user_name=user_data.get('full_name', ''),
                 action_type='delete_donor',
@@ -440,7 +440,7 @@ class PersonalDonorHandlers:
         
         search_query = update.message.text.strip()
         
-        results = self.bot.db.search_user_donor(user_id, search_query)
+        results = await self.bot.adb.search_user_donor(user_id, search_query)
         
         if not results:
             keyboard = [
@@ -491,7 +491,7 @@ class PersonalDonorHandlers:
         query = update.callback_query
         await query.answer()
         
-        all_donors = self.bot.db.get_all_user_donors_grouped()
+        all_donors = await self.bot.adb.get_all_user_donors_grouped()
         
         if not all_donors:
             text = "👥 <b>Всі даруваники користувачів</b>\n\n📭 Список порожній"
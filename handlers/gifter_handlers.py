@@ -10,6 +10,18 @@ class GifterHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и дарувальників"""
+        registry.exact('add_to_base_gifter', lambda query, user_id, arg: self.add_to_base_as_gifter(query, user_id))
+        registry.exact('remove_gifter', lambda query, user_id, arg: self.start_remove_gifter(query, user_id))
+        registry.exact('add_gifter', lambda query, user_id, arg: self.start_add_gifter(query, user_id))
+        registry.exact('show_gifters', lambda query, user_id, arg: self.show_all_gifters(query))
+        registry.prefix('del_gifter_', lambda query, user_id, arg: self.delete_gifter(query, arg))
+
+    def register_states(self, registry):
+        """Стани введення тексту для дарувальників"""
+        registry.register('waiting_gifter_url', self.process_gifter_url)
     
     async def start_add_gifter(self, query, user_id):
         """Початок додавання дарувальника"""
@@ -50,13 +62,13 @@ class GifterHandlers:
         )
 
         try:
-            user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(url)
+            user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(url)
 
             if user_id_scraped and user_name:
                 profile_url = f"https://tango.me/profile/{user_id_scraped}"
 
                 # owner_id = user_id (той хто додає)
-                existing_gifters = self.bot.db.get_all_gifters(owner_id=user_id)
+                existing_gifters = await self.bot.adb.get_all_gifters(owner_id=user_id)
                 existing_gifter = None
                 for name, existing_id, existing_profile, owner, *_ in existing_gifters:
                     if existing_id == user_id_scraped:
@@ -75,11 +87,8 @@ class GifterHandlers:
                         reply_markup=reply_markup
                     )
                 else:
-                    success = self.bot.db.add_gifter(user_name, user_id_scraped, profile_url, owner_id=user_id)
+                    success = await self.bot.adb.add_gifter(user_name, user_id_scraped, profile_url, owner_id=user_id)
 
-                    if hasattr(self.bot, 'sheets_service'):
-                        self.bot.sheets_service.schedule_sync('gifters')
-                    
                     if success:
                         await processing_msg.edit_text(
                             f"✅ Дарувальника додано успішно!\n\n"
@@ -116,7 +125,7 @@ class GifterHandlers:
         reply_markup = InlineKeyboardMarkup(keyboard)
 
         # Перевірка дубліката
-        existing = self.bot.db.get_all_gifters(owner_id=user_id)
+        existing = await self.bot.adb.get_all_gifters(owner_id=user_id)
         for name, uid, profile_url, owner, *_ in existing:
             if uid == result['tango_id']:
                 await query.edit_message_text(
@@ -128,13 +137,10 @@ class GifterHandlers:
                 )
                 return
 
-        success = self.bot.db.add_gifter(
+        success = await self.bot.adb.add_gifter(
             result['name'], result['tango_id'], result['profile_url'], owner_id=user_id
         )
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('gifters')
-    
         if success:
             await query.edit_message_text(
                 f"✅ Дарувальника додано!\n\n"
@@ -149,7 +155,7 @@ class GifterHandlers:
     async def show_all_gifters(self, query):
         """Показати всіх дарувальників"""
         user_id = query.from_user.id
-        gifters = self.bot.db.get_all_gifters(owner_id=user_id)
+        gifters = await self.bot.adb.get_all_gifters(owner_id=user_id)
 
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='gifters_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -182,7 +188,7 @@ class GifterHandlers:
 
     async def start_remove_gifter(self, query, user_id):
         """Початок видалення дарувальника"""
-        gifters = self.bot.db.get_all_gifters(owner_id=user_id)
+        gifters = await self.bot.adb.get_all_gifters(owner_id=user_id)
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='gifters_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -206,7 +212,7 @@ class GifterHandlers:
     async def delete_gifter(self, query, gifter_id):
         """Видалення дарувальника"""
         user_id = query.from_user.id
-        success = self.bot.db.remove_gifter(gifter_id, owner_id=user_id)
+        success = await self.bot.adb.remove_gifter(gifter_id, owner_id=user_id)
 
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='gifters_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
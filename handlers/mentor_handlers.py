@@ -11,11 +11,56 @@ class MentorHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и менторів"""
+        registry.exact('mentors_menu', lambda query, user_id, arg: self.show_mentors_menu(query))
+        registry.exact('add_to_base_mentor', lambda query, user_id, arg: self.add_to_base_as_mentor(query, user_id))
+        registry.exact('add_mentor', lambda query, user_id, arg: self.start_add_mentor(query, user_id))
+        registry.exact('add_mentor_telegram', lambda query, user_id, arg: self.start_add_mentor_telegram(query, user_id))
+        registry.exact('confirm_mentor_telegram', lambda query, user_id, arg: self.confirm_mentor_telegram_add(query, user_id))
+        registry.exact('add_mentor_instagram', lambda query, user_id, arg: self.start_add_mentor_instagram(query, user_id))
+        registry.exact('add_mentor_additional_data', lambda query, user_id, arg: self.show_mentor_additional_data_menu(query, user_id))
+        registry.exact('finish_mentor_adding', lambda query, user_id, arg: self.finish_mentor_adding(query, user_id))
+        registry.exact('show_mentors', lambda query, user_id, arg: self.show_all_mentors(query))
+        registry.exact('show_mentor_statistics', lambda query, user_id, arg: self.show_mentor_statistics(query))
+        registry.exact('remove_mentor', lambda query, user_id, arg: self.start_remove_mentor(query, user_id))
+        registry.exact('edit_mentor_select', lambda query, user_id, arg: self.show_edit_mentor_list(query))
+        registry.exact('restore_mentor_select', lambda query, user_id, arg: self.show_restore_mentor_list(query))
+
+        # Редагування (найдовший префікс перемагає загальний edit_mentor_)
+        registry.prefix('edit_mentor_', lambda query, user_id, arg: self.show_edit_mentor_menu(query, user_id, int(arg)))
+        registry.prefix('edit_mentor_name_', lambda query, user_id, arg: self.start_edit_mentor_name(query, user_id, int(arg)))
+        registry.prefix('edit_mentor_telegram_', lambda query, user_id, arg: self.start_edit_mentor_telegram(query, user_id, int(arg)))
+        registry.prefix('edit_mentor_instagram_', lambda query, user_id, arg: self.start_edit_mentor_instagram(query, user_id, int(arg)))
+        registry.prefix('remove_mentor_telegram_', lambda query, user_id, arg: self.remove_mentor_field(query, user_id, int(arg), 'telegram'))
+        registry.prefix('remove_mentor_instagram_', lambda query, user_id, arg: self.remove_mentor_field(query, user_id, int(arg), 'instagram'))
+        registry.prefix('send_activation_', lambda query, user_id, arg: self.send_activation_link(query, int(arg)))
+
+        # Видалення / відновлення
+        registry.prefix('del_mentor_', lambda query, user_id, arg: self.confirm_delete_mentor(query, arg))
+        registry.prefix('confirm_del_mentor_', lambda query, user_id, arg: self.delete_mentor(query, arg))
+        registry.prefix('restore_mentor_', lambda query, user_id, arg: self.restore_mentor(query, arg))
+
+        # Окремі меню та видалення Telegram/Instagram ментора
+        registry.prefix('show_mentor_telegram_', lambda query, user_id, arg: self.show_mentor_telegram_menu(query, user_id, int(arg)))
+        registry.prefix('show_mentor_instagram_', lambda query, user_id, arg: self.show_mentor_instagram_menu(query, user_id, int(arg)))
+        registry.prefix('delete_mentor_telegram_', lambda query, user_id, arg: self.delete_mentor_telegram(query, int(arg)))
+        registry.prefix('delete_mentor_instagram_', lambda query, user_id, arg: self.delete_mentor_instagram(query, int(arg)))
+
+    def register_states(self, registry):
+        """Стани введення тексту для менторів"""
+        registry.register('waiting_mentor_url', self.process_mentor_url)
+        registry.register('waiting_mentor_telegram', self.process_mentor_telegram)
+        registry.register('waiting_mentor_instagram', self.process_mentor_instagram)
+        registry.register('waiting_edit_mentor_url', self.process_edit_mentor_url)
+        registry.register('waiting_edit_mentor_telegram', self.process_edit_mentor_telegram)
+        registry.register('waiting_edit_mentor_instagram', self.process_edit_mentor_instagram)
     
     async def show_mentors_menu(self, query):
         """Головне меню менторів"""
-        mentors_count = len(self.bot.db.get_all_mentors())
-        stats = self.bot.db.get_mentor_statistics()
+        mentors_count = len(await self.bot.adb.get_all_mentors())
+        stats = await self.bot.adb.get_mentor_statistics()
         
         keyboard = [
             [InlineKeyboardButton("➕ Додати ментора", callback_data='add_mentor')],
@@ -74,11 +119,11 @@ class MentorHandlers:
         )
         
         try:
-            user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(url)
+            user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(url)
             
             if user_id_scraped and user_name:
                 profile_url = f"https://tango.me/profile/{user_id_scraped}"
-                existing_mentor = self.bot.db.get_mentor_by_user_id(user_id_scraped)
+                existing_mentor = await self.bot.adb.get_mentor_by_user_id(user_id_scraped)
                 
                 if existing_mentor:
                     keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -199,7 +244,7 @@ class MentorHandlers:
         username = telegram_input.strip().lstrip('@')
 
         # Перевірка: чи username вже є в bot_users
-        existing_bot_user = self.bot.db.get_bot_user_by_username(username)
+        existing_bot_user = await self.bot.adb.get_bot_user_by_username(username)
         if existing_bot_user:
             from config import ROLES, ROLE_EMOJI
             role_name = ROLES.get(existing_bot_user['role'], existing_bot_user['role'])
@@ -342,7 +387,7 @@ class MentorHandlers:
             return
 
         mentor_data = self.bot.temp_data[user_id]
-        success = self.bot.db.add_mentor(
+        success = await self.bot.adb.add_mentor(
             mentor_name=mentor_data.get('mentor_name'),
             user_id=mentor_data.get('mentor_user_id'),
             profile_url=mentor_data.get('profile_url'),
@@ -350,9 +395,6 @@ class MentorHandlers:
             instagram_url=mentor_data.get('instagram_url')
         )
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
-
         keyboard = [[InlineKeyboardButton("◀️ Меню менторів", callback_data='mentors_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -391,7 +433,7 @@ class MentorHandlers:
             return
 
         # Перевірка дубліката
-        existing = self.bot.db.get_mentor_by_user_id(result['tango_id'])
+        existing = await self.bot.adb.get_mentor_by_user_id(result['tango_id'])
         if existing:
             keyboard = [[InlineKeyboardButton("◀️ Меню менторів", callback_data='mentors_menu')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -415,7 +457,7 @@ class MentorHandlers:
 
     async def show_all_mentors(self, query):
         """Показати всіх менторів"""
-        mentors = self.bot.db.get_all_mentors()
+        mentors = await self.bot.adb.get_all_mentors()
 
         if not mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -423,7 +465,7 @@ class MentorHandlers:
             await query.edit_message_text("❌ База менторів порожня!", reply_markup=reply_markup)
             return
 
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
         text = f"📋 Всі ментори ({len(mentors)}):\n\n"
 
         for mentor_data in mentors:
@@ -453,7 +495,7 @@ class MentorHandlers:
 
     async def show_mentor_statistics(self, query):
         """Показати статистику менторів"""
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
 
         if not stats:
             text = "❌ Немає даних для статистики!"
@@ -490,7 +532,7 @@ class MentorHandlers:
     
     async def start_remove_mentor(self, query, user_id):
         """Початок видалення ментора"""
-        mentors = self.bot.db.get_all_mentors()
+        mentors = await self.bot.adb.get_all_mentors()
         
         if not mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -498,7 +540,7 @@ class MentorHandlers:
             await query.edit_message_text("❌ База менторів порожня!", reply_markup=reply_markup)
             return
         
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
         keyboard = []
         
         for mentor_data in mentors:
@@ -521,7 +563,7 @@ class MentorHandlers:
     
     async def confirm_delete_mentor(self, query, mentor_id):
         """Підтвердження та видалення ментора"""
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         
         if not mentor:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -529,7 +571,7 @@ class MentorHandlers:
             await query.edit_message_text("❌ Ментора не знайдено!", reply_markup=reply_markup)
             return
         
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
         streamer_count = stats.get(mentor['mentor_name'], {}).get('count', 0)
         
         text = f"⚠️ **Підтвердження видалення**\n\n"
@@ -552,10 +594,7 @@ class MentorHandlers:
     
     async def delete_mentor(self, query, mentor_id):
         """Видалення ментора"""
-        success = self.bot.db.delete_mentor(int(mentor_id))
-
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
+        success = await self.bot.adb.delete_mentor(int(mentor_id))
 
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -574,7 +613,7 @@ class MentorHandlers:
     
     async def show_restore_mentor_list(self, query):
         """Показати список видалених менторів"""
-        deleted_mentors = self.bot.db.get_deleted_mentors()
+        deleted_mentors = await self.bot.adb.get_deleted_mentors()
 
         if not deleted_mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -606,10 +645,7 @@ class MentorHandlers:
 
     async def restore_mentor(self, query, mentor_id):
         """Відновлення ментора"""
-        success = self.bot.db.restore_mentor(int(mentor_id))
-
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
+        success = await self.bot.adb.restore_mentor(int(mentor_id))
 
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -627,7 +663,7 @@ class MentorHandlers:
 
     async def show_edit_mentor_list(self, query):
         """Показати список менторів для редагування"""
-        mentors = self.bot.db.get_all_mentors()
+        mentors = await self.bot.adb.get_all_mentors()
 
         if not mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='mentors_menu')]]
@@ -635,7 +671,7 @@ class MentorHandlers:
             await query.edit_message_text("❌ База менторів порожня!", reply_markup=reply_markup)
             return
 
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
 
         keyboard = []
         for mentor_data in mentors:
@@ -657,7 +693,7 @@ class MentorHandlers:
 
     async def show_edit_mentor_menu(self, query, user_id, mentor_id):
         """Показати меню редагування ментора"""
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         
         if not mentor:
             await query.edit_message_text("❌ Ментора не знайдено!")
@@ -668,7 +704,7 @@ class MentorHandlers:
             self.bot.temp_data[user_id] = {}
         self.bot.temp_data[user_id]['editing_mentor_id'] = mentor_id
         
-        stats = self.bot.db.get_mentor_statistics()
+        stats = await self.bot.adb.get_mentor_statistics()
         streamer_count = stats.get(mentor['mentor_name'], {}).get('count', 0)
         
         # Формуємо текст з поточними даними
@@ -713,7 +749,7 @@ class MentorHandlers:
             self.bot.temp_data[user_id] = {}
         self.bot.temp_data[user_id]['editing_mentor_id'] = mentor_id
         
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         if not mentor:
             await query.edit_message_text("❌ Ментора не знайдено!")
             return
@@ -746,7 +782,7 @@ class MentorHandlers:
             self.bot.temp_data[user_id] = {}
         self.bot.temp_data[user_id]['editing_mentor_id'] = mentor_id
         
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         if not mentor:
             await query.edit_message_text("❌ Ментора не знайдено!")
             return
@@ -779,9 +815,7 @@ class MentorHandlers:
 
     async def delete_mentor_telegram(self, query, mentor_id):
         """Видалити Telegram ментора"""
-        success = self.bot.db.update_mentor_field(mentor_id, 'telegram_username', None)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
+        success = await self.bot.adb.update_mentor_field(mentor_id, 'telegram_username', None)
         
         if success:
             await query.answer("✅ Telegram видалено", show_alert=True)
@@ -793,9 +827,7 @@ class MentorHandlers:
 
     async def delete_mentor_instagram(self, query, mentor_id):
         """Видалити Instagram ментора"""
-        success = self.bot.db.update_mentor_field(mentor_id, 'instagram_url', None)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
+        success = await self.bot.adb.update_mentor_field(mentor_id, 'instagram_url', None)
         
         if success:
             await query.answer("✅ Instagram видалено", show_alert=True)
@@ -848,11 +880,11 @@ class MentorHandlers:
         processing_msg = await update.effective_chat.send_message("⏳ Обробляю посилання...")
         
         try:
-            user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(url)
+            user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(url)
             
             if user_id_scraped and user_name:
                 profile_url = f"https://tango.me/profile/{user_id_scraped}"
-                mentor = self.bot.db.get_mentor_by_id(mentor_id)
+                mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
                 
                 if not mentor:
                     await processing_msg.edit_text("❌ Ментора не знайдено!")
@@ -861,7 +893,7 @@ class MentorHandlers:
                 old_mentor_name = mentor['mentor_name']
                 
                 # Оновлюємо ментора (не створюємо нового!)
-                success = self.bot.db.update_mentor_profile(
+                success = await self.bot.adb.update_mentor_profile(
                     mentor_id=mentor_id,
                     new_name=user_name,
                     new_user_id=user_id_scraped,
@@ -929,13 +961,13 @@ class MentorHandlers:
             return
         
         username = telegram_input.strip().replace('@', '')
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         
         if not mentor:
             await update.effective_chat.send_message("❌ Ментора не знайдено!")
             return
         
-        success = self.bot.db.add_mentor(
+        success = await self.bot.adb.add_mentor(
             mentor_name=mentor['mentor_name'],
             user_id=mentor['user_id'],
             profile_url=mentor['profile_url'],
@@ -943,9 +975,6 @@ class MentorHandlers:
             instagram_url=mentor.get('instagram_url')
         )
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
-    
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data=f'edit_mentor_{mentor_id}')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1002,13 +1031,13 @@ class MentorHandlers:
             await update.effective_chat.send_message("❌ Некоректне посилання на Instagram!")
             return
         
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         
         if not mentor:
             await update.effective_chat.send_message("❌ Ментора не знайдено!")
             return
         
-        success = self.bot.db.add_mentor(
+        success = await self.bot.adb.add_mentor(
             mentor_name=mentor['mentor_name'],
             user_id=mentor['user_id'],
             profile_url=mentor['profile_url'],
@@ -1016,9 +1045,6 @@ class MentorHandlers:
             instagram_url=url
         )
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
-    
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data=f'edit_mentor_{mentor_id}')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1035,7 +1061,7 @@ class MentorHandlers:
     
     async def remove_mentor_field(self, query, user_id, mentor_id, field_name):
         """Видалення поля ментора (Telegram або Instagram)"""
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         if not mentor:
             await query.edit_message_text("❌ Ментора не знайдено!")
             return
@@ -1060,11 +1086,8 @@ class MentorHandlers:
         elif field_name == 'instagram':
             update_data['instagram_url'] = None
         
-        success = self.bot.db.add_mentor(**update_data)
+        success = await self.bot.adb.add_mentor(**update_data)
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('mentors')
-    
         if success:
             await query.edit_message_text(
                 f"✅ {field_labels.get(field_name, 'Поле')} видалено!\n\n"
@@ -1082,7 +1105,7 @@ class MentorHandlers:
         logging.info(f"send_activation_link called for mentor_id: {mentor_id}")
         
         try:
-            mentor = self.bot.db.get_mentor_by_id(mentor_id)
+            mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
             
             if not mentor:
                 logging.error(f"Mentor not found: {mentor_id}")
@@ -1092,7 +1115,7 @@ class MentorHandlers:
             logging.info(f"Found mentor: {mentor['mentor_name']}")
             
             # Генеруємо код активації
-            activation_code = self.bot.db.generate_activation_code(mentor_id)
+            activation_code = await self.bot.adb.generate_activation_code(mentor_id)
             
             if not activation_code:
                 logging.error(f"Failed to generate activation code for mentor_id: {mentor_id}")
@@ -1133,7 +1156,7 @@ class MentorHandlers:
     
     async def handle_mentor_activation(self, update: Update, activation_code: str):
         """Обробка активації ментора через посилання"""
-        mentor = self.bot.db.get_mentor_by_activation_code(activation_code)
+        mentor = await self.bot.adb.get_mentor_by_activation_code(activation_code)
         
         if not mentor:
             await update.message.reply_text(
@@ -1143,7 +1166,7 @@ class MentorHandlers:
             return
         
         chat_id = update.effective_user.id
-        success = self.bot.db.activate_mentor(activation_code, chat_id)
+        success = await self.bot.adb.activate_mentor(activation_code, chat_id)
         
         if success:
             await update.message.reply_text(
@@ -12,6 +12,14 @@ class MenuHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и головного меню"""
+        registry.exact('main_menu', lambda query, user_id, arg: self.show_main_menu(query))
+        registry.exact('users_base', lambda query, user_id, arg: self.show_users_base_menu(query))
+        registry.exact('streamers_menu', lambda query, user_id, arg: self.show_streamers_menu(query))
+        registry.exact('gifters_menu', lambda query, user_id, arg: self.show_gifters_menu(query))
+        registry.exact('help', lambda query, user_id, arg: self.show_help(query))
     
     async def show_start_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Показати головне меню"""
@@ -45,11 +53,11 @@ class MenuHandlers:
         from config import OWNER_ID
         
         user_id = query.from_user.id
-        role = self.bot.db.get_user_role(user_id)
+        role = await self.bot.adb.get_user_role(user_id)
         
         # Якщо користувач - власник, але немає в БД
         if user_id == OWNER_ID and role is None:
-            self.bot.db.add_bot_user(user_id, query.from_user.username, 'owner', user_id)
+            await self.bot.adb.add_bot_user(user_id, query.from_user.username, 'owner', user_id)
             role = 'owner'
         
         # Якщо користувача немає в системі
@@ -66,6 +74,7 @@ class MenuHandlers:
                 [InlineKeyboardButton("👥 База користувачів", callback_data='users_base')],
                 [InlineKeyboardButton("🆔 Отримати ID", callback_data='get_streamer_id')],
                 [InlineKeyboardButton("👤 Користувачі бота", callback_data='bot_users_menu')],
+                [InlineKeyboardButton("📋 Аудит-лог", callback_data='audit_menu')],
                 [InlineKeyboardButton("❓ Допомога", callback_data='help')]
             ]
         # Меню для ментора
@@ -134,6 +143,7 @@ class MenuHandlers:
                 [InlineKeyboardButton("👥 База користувачів", callback_data='users_base')],
                 [InlineKeyboardButton("🆔 Отримати ID", callback_data='get_streamer_id')],
                 [InlineKeyboardButton("👤 Користувачі бота", callback_data='bot_users_menu')],
+                [InlineKeyboardButton("📋 Аудит-лог", callback_data='audit_menu')],
                 [InlineKeyboardButton("❓ Допомога", callback_data='help')]
             ]
         # Меню для ментора
@@ -161,7 +171,7 @@ class MenuHandlers:
 
     async def show_streamers_menu(self, query):
         """Меню стрімерів"""
-        streamers_count = len(self.bot.db.get_all_streamers())
+        streamers_count = await self.bot.adb.count_streamers()
         keyboard = [
             [InlineKeyboardButton("➕ Додати стрімера", callback_data='add_streamer')],
             [InlineKeyboardButton("📋 Показати всіх", callback_data='show_streamers')],
@@ -180,7 +190,7 @@ class MenuHandlers:
     
     async def show_gifters_menu(self, query):
         """Меню дарувальників"""
-        gifters_count = len(self.bot.db.get_all_gifters())
+        gifters_count = len(await self.bot.adb.get_all_gifters())
         keyboard = [
             [InlineKeyboardButton("➕ Додати дарувальника", callback_data='add_gifter')],
             [InlineKeyboardButton("➖ Видалити дарувальника", callback_data='remove_gifter')],
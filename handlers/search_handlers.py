@@ -6,6 +6,7 @@ import os
 from datetime import datetime
 from typing import Dict
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.helpers import escape_markdown
 
 
 class SearchHandlers:
@@ -13,10 +14,17 @@ class SearchHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и пошуку дарувальників"""
+        registry.exact('search_gifters', lambda query, user_id, arg: self.start_search_gifters(query, user_id))
+        registry.exact('start_search', lambda query, user_id, arg: self.execute_search(query, user_id))
+        registry.prefix('select_gifter_', self.toggle_gifter_selection)
+        registry.prefix('search_cancel_', self.cancel_search)
     
     async def start_search_gifters(self, query, user_id):
         """Початок пошуку дарувальників"""
-        gifters = self.bot.db.get_all_gifters()
+        gifters = await self.bot.adb.get_all_gifters()
         if not gifters:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='main_menu')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -47,62 +55,121 @@ class SearchHandlers:
         await self.show_gifter_selection(query, user_id)
 
     async def execute_search(self, query, user_id):
-        """Виконання пошуку дарувальників"""
+        """Ставить пошук у фонову чергу (SearchJobRunner) і одразу звільняє бота"""
         selected_ids = self.bot.temp_data.get(user_id, {}).get('selected_gifters', [])
         
         if not selected_ids:
             await query.edit_message_text("❌ Не обрано жодного дарувальника!")
             return
         
-        await query.edit_message_text(
-            f"🔍 Розпочинаю пошук...\n\n"
-            f"Дарувальників для пошуку: {len(selected_ids)}\n"
-            f"Це може зайняти кілька хвилин...\n\n"
-            f"**УВАГА:** Може відкритися браузер для авторизації на Tango.me"
+        if not self.bot.search_jobs.can_submit(user_id):
+            keyboard = [[InlineKeyboardButton("◀️ Головне меню", callback_data='main_menu')]]
+            await query.edit_message_text(
+                "⏳ У вас уже є активний пошук.\n\n"
+                "Дочекайтесь його завершення або скасуйте його.",
+                reply_markup=InlineKeyboardMarkup(keyboard)
+            )
+            return
+        
+        job = await self.bot.search_jobs.submit(
+            user_id, query.message.chat_id, query.message.message_id, list(selected_ids)
         )
+        if job is None:
+            await query.edit_message_text("❌ Не вдалося запустити пошук. Спробуйте пізніше.")
+            return
         
+        if user_id in self.bot.temp_data:
+            del self.bot.temp_data[user_id]
+        
+        await self.show_job_progress(job)
+    
+    async def cancel_search(self, query, user_id, job_id):
+        """Кнопка «Скасувати» під повідомленням пошуку"""
+        if not await self.bot.search_jobs.cancel(int(job_id), user_id):
+            return
         try:
-            with GifterSearcher() as searcher:
-                results = searcher.search_gifters(
-                    gifter_ids=selected_ids,
-                    num_streamers=100,
-                    categories=["Popular", "Recommended"]
-                )
-                
-                if results.get("found_gifters"):
-                    save_path = searcher.save_results(results)
-                    report = self.format_search_report(results, save_path)
-                    await self.send_search_results(query, report, results)
-                else:
-                    keyboard = [[InlineKeyboardButton("🔍 Новий пошук", callback_data='search_gifters')],
-                                [InlineKeyboardButton("◀️ Головне меню", callback_data='main_menu')]]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    
-                    await query.edit_message_text(
-                        f"😔 Пошук завершено\n\n"
-                        f"📊 Перевірено стрімерів: {results.get('searched_streamers', 0)}\n"
-                        f"🎯 Знайдено збігів: 0\n\n"
-                        f"Спробуйте пізніше або оберіть інших дарувальників.",
-                        reply_markup=reply_markup
-                    )
+            await query.edit_message_text("🛑 Скасовую пошук...")
+        except Exception:
+            pass
+    
+    # ================================
+    # ПОВІДОМЛЕННЯ ФОНОВОГО ПОШУКУ
+    # ================================
+    
+    async def _edit_job_message(self, job, text: str, reply_markup=None, **kwargs):
+        """Редагує повідомлення задачі (за chat_id/message_id — callback'а вже немає)"""
+        await self.bot.application.bot.edit_message_text(
+            text, chat_id=job.chat_id, message_id=job.message_id,
+            reply_markup=reply_markup, **kwargs
+        )
+    
+    async def show_job_progress(self, job):
+        """Стан задачі в черзі / прогрес пошуку з кнопкою скасування"""
+        if job.cancel_event.is_set():
+            return   # вже показано «Скасовую пошук...»
         
-        except Exception as ex:
-            logging.error(f"Помилка пошуку: {ex}")
-            keyboard = [[InlineKeyboardButton("🔍 Спробувати знову", callback_data='search_gifters')],
-                        [InlineKeyboardButton("◀️ Головне меню", callback_data='main_menu')]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(
-                f"❌ Помилка під час пошуку:\n{str(ex)}\n\nСпробуйте пізніше.\n\n"
+        if job.status == 'queued':
+            text = (
+                f"⏳ Пошук у черзі\n\n"
+                f"Дарувальників для пошуку: {len(job.gifter_ids)}\n"
+                f"Попереду в черзі: {self.bot.search_jobs.jobs_ahead(job)}"
+            )
+        else:
+            text = (
+                f"🔍 Пошук триває...\n\n"
+                f"Дарувальників для пошуку: {len(job.gifter_ids)}\n"
+                f"Перевірено стрімів: {job.done}" + (f" з {job.total}" if job.total else "")
+            )
+            if job.engine == 'selenium':
+                text += "\n\n**УВАГА:** Може відкритися браузер для авторизації на Tango.me"
+        
+        keyboard = [[InlineKeyboardButton("❌ Скасувати", callback_data=f'search_cancel_{job.id}')]]
+        try:
+            await self._edit_job_message(
+                job, text, InlineKeyboardMarkup(keyboard), parse_mode='Markdown'
+            )
+        except Exception:
+            pass
+    
+    async def show_job_result(self, job, results: Dict = None):
+        """Фінальне повідомлення задачі: звіт, «нічого не знайдено», помилка чи скасування"""
+        results = results or {}
+        retry = "🔍 Спробувати знову" if job.status == 'failed' else "🔍 Новий пошук"
+        keyboard = [[InlineKeyboardButton(retry, callback_data='search_gifters')],
+                    [InlineKeyboardButton("◀️ Головне меню", callback_data='main_menu')]]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        if job.status == 'cancelled':
+            text = (
+                f"🛑 Пошук скасовано\n\n"
+                f"📊 Перевірено стрімерів: {results.get('searched_streamers', job.done)}\n"
+                f"🎯 Знайдено збігів: {results.get('total_found', 0)}"
+            )
+        elif job.status == 'failed':
+            text = (
+                f"❌ Помилка під час пошуку:\n{escape_markdown(str(results.get('error')), version=1)}\n\n"
+                f"Спробуйте пізніше.\n\n"
                 f"**Можливі причини:**\n"
                 f"• Проблеми з інтернет-з'єднанням\n"
                 f"• Потрібна повторна авторизація на Tango.me\n"
-                f"• Сайт Tango.me тимчасово недоступний",
-                reply_markup=reply_markup
+                f"• Сайт Tango.me тимчасово недоступний"
+            )
+        elif results.get("found_gifters"):
+            report = self.format_search_report(results, job.result_path)
+            await self.send_search_results(job, report)
+            return
+        else:
+            text = (
+                f"😔 Пошук завершено\n\n"
+                f"📊 Перевірено стрімерів: {results.get('searched_streamers', 0)}\n"
+                f"🎯 Знайдено збігів: 0\n\n"
+                f"Спробуйте пізніше або оберіть інших дарувальників."
             )
         
-        if user_id in self.bot.temp_data:
-            del self.bot.temp_data[user_id]
+        try:
+            await self._edit_job_message(job, text, reply_markup, parse_mode='Markdown')
+        except Exception as ex:
+            logging.error(f"Помилка показу результату пошуку {job.id}: {ex}")
 
     def format_search_report(self, results: Dict, save_path: str = None) -> str:
         """Форматування звіту про пошук"""
@@ -151,36 +218,30 @@ class SearchHandlers:
         
         return report
 
-    async def send_search_results(self, query, report: str, results: Dict):
-        """Надсилання результатів пошуку"""
+    async def send_search_results(self, job, report: str):
+        """Надсилання результатів пошуку (у повідомлення задачі + продовження)"""
         keyboard = [
             [InlineKeyboardButton("🔍 Новий пошук", callback_data='search_gifters')],
             [InlineKeyboardButton("◀️ Головне меню", callback_data='main_menu')]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
+        parts = [report[i:i+4000] for i in range(0, len(report), 4000)]
         
-        if len(report) > 4000:
-            parts = [report[i:i+4000] for i in range(0, len(report), 4000)]
-            
-            await query.edit_message_text(
-                parts[0],
+        try:
+            await self._edit_job_message(
+                job, parts[0],
+                reply_markup if len(parts) == 1 else None,
                 parse_mode='Markdown',
-                reply_markup=reply_markup if len(parts) == 1 else None,
                 disable_web_page_preview=True
             )
             
             for i, part in enumerate(parts[1:], 1):
-                await query.message.reply_text(
+                await self.bot.application.bot.send_message(
+                    job.chat_id,
                     part,
                     parse_mode='Markdown',
                     reply_markup=reply_markup if i == len(parts) - 1 else None,
                     disable_web_page_preview=True
                 )
-        else:
-            await query.edit_message_text(
-                report,
-                parse_mode='Markdown',
-                reply_markup=reply_markup,
-                disable_web_page_preview=True
-            )
-
+        except Exception as ex:
+            logging.error(f"Помилка надсилання результатів пошуку {job.id}: {ex}")
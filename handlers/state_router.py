@@ -0,0 +1,137 @@
+"""
+Роутер текстових повідомлень за станом розмови (user_states)
+"""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from config import SESSION_BACKEND, STATE_DEFAULT_TIMEOUT, STATE_SWEEP_INTERVAL
+
+# Обробник стану: (update, text, user_id) → coroutine
+StateHandler = Callable[..., Awaitable]
+
+
+class StateRegistry:
+    """Стан → (обробник, таймаут у секундах); пошук — один dict-lookup"""
+
+    def __init__(self, default_timeout: float = STATE_DEFAULT_TIMEOUT):
+        self.default_timeout = default_timeout
+        self._states: Dict[str, Tuple[StateHandler, float]] = {}
+
+    def register(self, state: str, handler: StateHandler, timeout: Optional[float] = None) -> None:
+        if state in self._states:
+            raise ValueError(f"Стан '{state}' вже зареєстровано")
+        self._states[state] = (handler, timeout or self.default_timeout)
+
+    def resolve(self, state: str) -> Optional[Tuple[StateHandler, float]]:
+        return self._states.get(state)
+
+    def timeout(self, state: str) -> float:
+        entry = self._states.get(state)
+        return entry[1] if entry else self.default_timeout
+
+    def __contains__(self, state: str) -> bool:
+        return state in self._states
+
+
+class StateRouter:
+    """Диспетчер handle_message і періодичне прибирання прострочених станів"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.registry = StateRegistry()
+        self._sweep_task: Optional[asyncio.Task] = None
+
+        # Кожен модуль handler'ів реєструє свої стани
+        for handlers in (
+            bot.streamer_handlers,
+            bot.gifter_handlers,
+            bot.bot_users_handlers,
+            bot.mentor_handlers,
+        ):
+            handlers.register_states(self.registry)
+
+    async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Обробка текстових повідомлень"""
+        user_id = update.effective_user.id
+        text = update.message.text
+
+        state = self.bot.user_states.get(user_id)
+        if state is None:
+            await update.message.reply_text(
+                "👋 Використовуйте /start для відображення меню"
+            )
+            return
+
+        entry = self.registry.resolve(state)
+        if entry is None:
+            await update.message.reply_text("❌ Невідомий стан. Використовуйте /start")
+            return
+
+        handler, timeout = entry
+        if self.bot.user_states.age(user_id) > timeout:
+            self.expire(user_id)
+            await update.message.reply_text(
+                "⌛ Сесію завершено через неактивність. Використовуйте /start"
+            )
+            return
+
+        await handler(update, text, user_id)
+
+    def expire(self, user_id: int) -> None:
+        """Скидає стан користувача разом з його temp_data"""
+        self.bot.user_states.pop(user_id, None)
+        self.bot.temp_data.pop(user_id, None)
+
+    def sweep_expired(self) -> int:
+        """
+        Прибирає стани, старші за свій таймаут, і сесії temp_data зі сплилим TTL;
+        повертає кількість прибраних станів
+        """
+        expired = [
+            user_id for user_id, state in list(self.bot.user_states.items())
+            if self.bot.user_states.age(user_id) > self.registry.timeout(state)
+        ]
+        for user_id in expired:
+            self.expire(user_id)
+        self.bot.user_states.evict_expired()
+        self.bot.temp_data.evict_expired()
+        if expired:
+            logging.info(f"StateRouter: прибрано прострочених станів: {len(expired)}")
+        return len(expired)
+
+    async def save_sessions(self) -> None:
+        """Знімок user_states і temp_data у БД (SESSION_BACKEND='sqlite')"""
+        if SESSION_BACKEND != 'sqlite':
+            return
+        for store in (self.bot.user_states, self.bot.temp_data):
+            await self.bot.adb.save_sessions(store.namespace, store.dump())
+
+    def load_sessions(self) -> None:
+        """Відновлює сесії після рестарту (SESSION_BACKEND='sqlite')"""
+        if SESSION_BACKEND != 'sqlite':
+            return
+        for store in (self.bot.user_states, self.bot.temp_data):
+            loaded = store.load(self.bot.db.load_sessions(store.namespace))
+            logging.info(f"Сесії {store.namespace}: відновлено {loaded}")
+
+    def session_stats(self) -> Dict:
+        return {
+            store.namespace: store.stats()
+            for store in (self.bot.user_states, self.bot.temp_data)
+        }
+
+    async def start_sweeper(self) -> None:
+        self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(STATE_SWEEP_INTERVAL)
+            try:
+                self.sweep_expired()
+                await self.save_sessions()
+                logging.info(f"Сесії: {self.session_stats()}")
+            except Exception as exc:
+                logging.error(f"StateRouter sweep: {exc}")
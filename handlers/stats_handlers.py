@@ -6,6 +6,7 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from role_decorators import *
 import config
+from services.export_service import ExportService
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,7 @@ class StatsHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+        self.export_service = ExportService(bot.db)
     
     # ================================
     # ГОЛОВНЕ МЕНЮ СТАТИСТИКИ
@@ -72,25 +74,25 @@ class StatsHandlers:
         user_id = update.effective_user.id
         
         # Отримуємо ID ментора з таблиці mentors
-        mentor = self.bot.db.get_mentor_by_telegram_id(user_id)
+        mentor = await self.bot.adb.get_mentor_by_telegram_id(user_id)
         
         if not mentor:
             text = "📊 <b>Моя статистика</b>\n\n❌ Ви не зареєстровані як ментор"
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='stats_menu')]]
         else:
             # Отримуємо стрімерів ментора
-            streamers = self.bot.db.get_streamers_by_mentor(mentor['id'])
+            streamers = await self.bot.adb.get_streamers_by_mentor(mentor['id'])
             active_streamers = [s for s in streamers if s.get('is_active')]
             inactive_streamers = [s for s in streamers if not s.get('is_active')]
             
             # Отримуємо даруваників стрімерів
             total_donors = 0
             for streamer in streamers:
-                donors = self.bot.db.get_donors_by_streamer(streamer['id'])
+                donors = await self.bot.adb.get_donors_by_streamer(streamer['id'])
                 total_donors += len(donors)
             
             # Особисті даруваники
-            personal_donors = self.bot.db.get_user_donors(user_id)
+            personal_donors = await self.bot.adb.get_user_donors(user_id)
             
             text = (
                 f"📊 <b>Моя статистика</b>\n\n"
@@ -125,7 +127,7 @@ class StatsHandlers:
         query = update.callback_query
         await query.answer()
         
-        stats = self.bot.db.get_statistics()
+        stats = await self.bot.adb.get_statistics()
         
         text = (
             f"📊 <b>Загальна статистика системи</b>\n\n"
@@ -169,7 +171,7 @@ class StatsHandlers:
         query = update.callback_query
         await query.answer()
         
-        stats = self.bot.db.get_statistics()
+        stats = await self.bot.adb.get_statistics()
         streamers_by_mentor = stats.get('streamers_by_mentor', {})
         
         if not streamers_by_mentor:
@@ -183,13 +185,13 @@ class StatsHandlers:
             
             text = f"🎯 <b>Статистика менторів</b>\n\n📊 Всього менторів: {len(sorted_mentors)}\n\n"
             
+            # Деталі по всіх менторах одним запитом замість двох на кожного
+            mentor_stats = await self.bot.adb.get_mentor_statistics()
             for mentor_name, count in sorted_mentors:
-                # Отримуємо детальну інформацію про ментора
-                mentor = self.bot.db.get_mentor_by_name(mentor_name)
-                if mentor:
-                    streamers = self.bot.db.get_streamers_by_mentor(mentor['id'])
-                    active = len([s for s in streamers if s.get('is_active')])
-                    text += f"👤 {mentor_name}\n   📊 Всього: {count} | Активних: {active}\n\n"
+                details = mentor_stats.get(mentor_name)
+                if details:
+                    status = "✅" if details['is_activated'] else "⏳"
+                    text += f"👤 {mentor_name} {status}\n   📊 Всього: {count}\n\n"
             
             keyboard = [
                 [InlineKeyboardButton("◀️ Назад", callback_data='stats_menu')]
@@ -209,7 +211,7 @@ class StatsHandlers:
         query = update.callback_query
         await query.answer()
         
-        all_users = self.bot.db.get_all_users()
+        all_users = await self.bot.adb.get_all_users()
         
         # Групуємо по ролях
         by_role = {}
@@ -232,11 +234,18 @@ class StatsHandlers:
         # Додаткова інформація про менторів
         if 'mentor' in by_role:
             text += f"\n<b>Деталі по менторах:</b>\n"
+            # {telegram_chat_id: к-ть стрімерів} — один запит на всіх менторів
+            mentor_stats = await self.bot.adb.get_mentor_statistics()
+            counts_by_chat = {
+                m['telegram_chat_id']: m['count']
+                for m in mentor_stats.values() if m['telegram_chat_id']
+            }
             for user in by_role['mentor'][:10]:  # Показуємо топ-10
-                mentor = self.bot.db.get_mentor_by_telegram_id(user['telegram_id'])
-                if mentor:
-                    streamers = self.bot.db.get_streamers_by_mentor(mentor['id'])
-                    text += f"• {user.get('full_name', 'N/A')}: {len(streamers)} стрімерів\n"
+                if user['telegram_id'] in counts_by_chat:
+                    text += (
+                        f"• {user.get('full_name', 'N/A')}: "
+                        f"{counts_by_chat[user['telegram_id']]} стрімерів\n"
+                    )
         
         keyboard = [
             [InlineKeyboardButton("👥 Управління користувачами", callback_data='users_menu')],
@@ -261,8 +270,11 @@ class StatsHandlers:
             [InlineKeyboardButton("📊 Експорт стрімерів (CSV)", callback_data='export_streamers_csv')],
             [InlineKeyboardButton("📊 Експорт стрімерів (Excel)", callback_data='export_streamers_excel')],
             [InlineKeyboardButton("👥 Експорт користувачів (CSV)", callback_data='export_users_csv')],
+            [InlineKeyboardButton("👥 Експорт користувачів (Excel)", callback_data='export_users_excel')],
             [InlineKeyboardButton("📋 Експорт аудит-логу (CSV)", callback_data='export_audit_csv')],
+            [InlineKeyboardButton("📋 Експорт аудит-логу (Excel)", callback_data='export_audit_excel')],
             [InlineKeyboardButton("💝 Експорт даруваників (CSV)", callback_data='export_donors_csv')],
+            [InlineKeyboardButton("💝 Експорт даруваників (Excel)", callback_data='export_donors_excel')],
             [InlineKeyboardButton("◀️ Назад", callback_data='stats_menu')]
         ]
         
@@ -276,136 +288,33 @@ class StatsHandlers:
     
     @owner_only
     async def export_data(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
-                         data_type: str, format_type: str, 
+                         data_type: str, format_type: str,
                          user_role=None, user_data=None):
         """Експортує дані в CSV або Excel"""
         query = update.callback_query
+
+        if not self.export_service.supports(data_type, format_type):
+            await query.answer("❌ Невідомий тип даних", show_alert=True)
+            return
+
         await query.answer("⏳ Готую експорт...", show_alert=False)
-        
+
         try:
-            if data_type == 'streamers':
-                filename = await self._export_streamers(format_type)
-            elif data_type == 'users':
-                filename = await self._export_users(format_type)
-            elif data_type == 'audit':
-                filename = await self._export_audit(format_type)
-            elif data_type == 'donors':
-                filename = await self._export_donors(format_type)
-            else:
-                await query.answer("❌ Невідомий тип даних", show_alert=True)
-                return
-            
-            # Надсилаємо файл
-            with open(filename, 'rb') as file:
-                await query.message.reply_document(
-                    document=file,
-                    caption=f"✅ Експорт готовий: {data_type}"
-                )
-            
-            await query.answer("✅ Файл надіслано!", show_alert=False)
-            
+            spool, filename, rows = await self.export_service.export(data_type, format_type)
         except Exception as e:
             logger.error(f"Export error: {e}")
             await query.answer("❌ Помилка при експорті", show_alert=True)
-    
-    # ================================
-    # ДОПОМІЖНІ МЕТОДИ ЕКСПОРТУ
-    # ================================
-    
-    async def _export_streamers(self, format_type: str) -> str:
-        """Експортує стрімерів"""
-        import csv
-        from datetime import datetime
-        
-        filename = f"streamers_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        # Отримуємо всіх стрімерів (тут має бути метод в database.py)
-        streamers = []  # self.bot.db.get_all_streamers()
-        
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['ID', 'Ім\'я', 'Telegram', 'Instagram', 'Платформа', 'Ментор', 'Активний', 'Дата створення']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for s in streamers:
-                writer.writerow({
-                    'ID': s['user_id'],
-                    'Ім\'я': s['name'],
-                    'Telegram': s.get('telegram', ''),
-                    'Instagram': s.get('instagram', ''),
-                    'Платформа': s.get('platform', ''),
-                    'Ментор': s.get('mentor_name', ''),
-                    'Активний': 'Так' if s.get('is_active') else 'Ні',
-                    'Дата створення': s['created_at'][:10]
-                })
-        
-        return filename
-    
-    async def _export_users(self, format_type: str) -> str:
-        """Експортує користувачів"""
-        import csv
-        from datetime import datetime
-        
-        filename = f"users_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        users = self.bot.db.get_all_users()
-        
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['Telegram ID', 'Username', 'ПІБ', 'Роль', 'Дата створення']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for u in users:
-                writer.writerow({
-                    'Telegram ID': u['telegram_id'],
-                    'Username': u.get('username', ''),
-                    'ПІБ': u.get('full_name', ''),
-                    'Роль': config.ROLES.get(u['role'], u['role']),
-                    'Дата створення': u['created_at'][:10]
-                })
-        
-        return filename
-    
-    async def _export_audit(self, format_type: str) -> str:
-        """Експортує аудит-лог"""
-        import csv
-        from datetime import datetime
-        
-        filename = f"audit_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        logs = self.bot.db.get_audit_logs(limit=10000)
-        
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['Дата', 'Користувач', 'Дія', 'Об\'єкт', 'Ціль']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            
-            writer.writeheader()
-            for log in logs:
-                writer.writerow({
-                    'Дата': log['created_at'],
-                    'Користувач': log['user_name'],
-                    'Дія': log['action_type'],
-                    'Об\'єкт': log['target_type'],
-                    'Ціль': log['target_name']
-                })
-        
-        return filename
-    
-    async def _export_donors(self, format_type: str) -> str:
-        """Експортує даруваників"""
-        import csv
-        from datetime import datetime
-        
-        filename = f"donors_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        
-        # Експортуємо і стрімерських і особистих даруваників
-        # Тут потрібні методи в database.py
-        
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-            fieldnames = ['Тип', 'Власник', 'Ім\'я даруваника', 'Tango ID', 'Дата']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            # TODO: Додати експорт даруваників
-        
-        return filename
+            return
+
+        # Надсилаємо файл прямо зі spool — на диску нічого не лишається
+        try:
+            await query.message.reply_document(
+                document=spool,
+                filename=filename,
+                caption=f"✅ Експорт готовий: {data_type} ({rows} записів)"
+            )
+        except Exception as e:
+            logger.error(f"Export upload error: {e}")
+            await query.answer("❌ Помилка при надсиланні файлу", show_alert=True)
+        finally:
+            spool.close()
@@ -4,6 +4,7 @@ Handler'и для роботи зі стрімерами
 import logging
 import asyncio
 from datetime import datetime
+from typing import List, Optional, Tuple
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 
 from config import MONTHS_UA, STREAMERS_PER_PAGE, DELETE_ITEMS_PER_PAGE
@@ -14,6 +15,214 @@ class StreamerHandlers:
     
     def __init__(self, bot):
         self.bot = bot
+
+    def register_callbacks(self, registry):
+        """Callback'и стрімерів, фільтрів і пагінації"""
+        registry.exact('get_streamer_id', lambda query, user_id, arg: self.start_get_id(query, user_id))
+        registry.exact('add_to_base_select', lambda query, user_id, arg: self.show_add_to_base_select(query, user_id))
+        registry.exact('add_to_base_streamer', lambda query, user_id, arg: self.add_to_base_as_streamer(query, user_id))
+        registry.exact('add_streamer', lambda query, user_id, arg: self.start_add_streamer(query, user_id))
+        registry.exact('remove_streamer', lambda query, user_id, arg: self.start_remove_streamer(query, user_id))
+        registry.exact('show_streamers', lambda query, user_id, arg: self.show_all_streamers(query))
+        registry.exact('search_streamer', lambda query, user_id, arg: self.start_search_streamer(query, user_id))
+        registry.exact('my_streamers', lambda query, user_id, arg: self.show_my_streamers(query, user_id))
+        registry.exact('filter_my_streamers', lambda query, user_id, arg: self.show_my_streamers(query, user_id))
+
+        # Фільтрація
+        registry.exact('filter_streamers', lambda query, user_id, arg: self.show_filter_menu(query, user_id))
+        registry.exact('filter_by_year', lambda query, user_id, arg: self.show_year_selection(query, user_id))
+        registry.exact('filter_by_month', lambda query, user_id, arg: self.show_year_selection_for_month(query, user_id))
+        registry.exact('filter_by_mentor', lambda query, user_id, arg: self.show_mentor_filter_selection(query, user_id))
+        registry.exact('filter_no_mentor', lambda query, user_id, arg: self.show_streamers_without_mentor(query))
+        registry.exact('show_statistics', lambda query, user_id, arg: self.show_statistics(query))
+        registry.exact('add_mentor_filter', lambda query, user_id, arg: self.show_mentor_selection_for_date_filter(query, user_id))
+        registry.exact('add_year_filter', lambda query, user_id, arg: self.show_year_selection_for_mentor_filter(query, user_id))
+        registry.exact('add_month_filter', lambda query, user_id, arg: self.show_month_selection_for_mentor_filter(query, user_id))
+        registry.exact('reset_filters', self._on_reset_filters)
+        registry.prefix('filter_mentor_', self._on_filter_mentor)
+        registry.prefix('add_mentor_', self._on_add_mentor_filter)
+        registry.prefix('add_year_', self._on_add_year)
+        registry.prefix('add_month_', self._on_add_month)
+        registry.prefix('year_', self._on_year)
+        registry.prefix('year_for_month_', self._on_year_for_month)
+        registry.prefix('back_to_months_', self._on_back_to_months)
+        registry.prefix('month_', self._on_month)
+
+        # Видалення та підтвердження
+        registry.prefix('del_streamer_', lambda query, user_id, arg: self.delete_streamer(query, arg))
+        registry.prefix('confirm_delete_', lambda query, user_id, arg: self.confirm_delete_streamer(query, arg))
+
+        # Додаткові дані нового стрімера
+        registry.exact('add_more_data', lambda query, user_id, arg: self.show_additional_data_menu(query, user_id))
+        registry.exact('skip_additional_data', lambda query, user_id, arg: self.finish_streamer_adding(query, user_id))
+        registry.exact('finish_adding', lambda query, user_id, arg: self.finish_streamer_adding(query, user_id))
+        registry.exact('add_telegram', lambda query, user_id, arg: self.start_add_telegram(query, user_id))
+        registry.exact('add_instagram', lambda query, user_id, arg: self.start_add_instagram(query, user_id))
+        registry.exact('add_platform', lambda query, user_id, arg: self.show_platform_selection(query, user_id))
+        registry.exact('platform_ios', lambda query, user_id, arg: self.set_platform_new_streamer(query, user_id, 'iOS'))
+        registry.exact('platform_android', lambda query, user_id, arg: self.set_platform_new_streamer(query, user_id, 'Android'))
+
+        # Редагування стрімера
+        registry.prefix('edit_streamer_', lambda query, user_id, arg: self.show_streamer_details(query, arg))
+        registry.prefix('prompt_edit_name_', lambda query, user_id, arg: self.show_edit_name_prompt(query, user_id, arg))
+        registry.prefix('prompt_edit_telegram_', lambda query, user_id, arg: self.show_edit_telegram_prompt(query, user_id, arg))
+        registry.prefix('prompt_edit_instagram_', lambda query, user_id, arg: self.show_edit_instagram_prompt(query, user_id, arg))
+        registry.prefix('prompt_edit_platform_', lambda query, user_id, arg: self.show_edit_platform_prompt(query, user_id, arg))
+        registry.prefix('delete_telegram_', lambda query, user_id, arg: self.delete_telegram(query, arg))
+        registry.prefix('delete_instagram_', lambda query, user_id, arg: self.delete_instagram(query, arg))
+        registry.prefix('delete_platform_', lambda query, user_id, arg: self.delete_platform(query, arg))
+        registry.prefix('set_platform_', self._on_set_platform)
+        registry.prefix('confirm_rewrite_', self._on_confirm_rewrite)
+
+        # Пагінація
+        registry.prefix('page_streamers_', self._on_page_streamers)
+        registry.prefix('page_delete_', self._on_page_delete)
+
+        # Призначення ментора
+        registry.prefix('assign_mentor_', lambda query, user_id, arg: self.show_mentor_selection(query, user_id, arg))
+        registry.prefix('select_mentor_', self._on_select_mentor)
+
+    def register_states(self, registry):
+        """Стани введення тексту для стрімерів"""
+        registry.register('waiting_streamer_url', self.process_streamer_url)
+        registry.register('waiting_telegram_url', self.process_telegram_url)
+        registry.register('waiting_instagram_url', self.process_instagram_url)
+        registry.register('waiting_edit_name', self.process_edit_name)
+        registry.register('waiting_edit_telegram', self.process_edit_telegram)
+        registry.register('waiting_edit_instagram', self.process_edit_instagram)
+        # Одноразові запити — коротший таймаут
+        registry.register('waiting_search_query', self.process_search_query, timeout=10 * 60)
+        registry.register('waiting_get_id_url', self.process_get_id_url, timeout=10 * 60)
+
+    # ── Розбір параметризованих callback'ів ───────────────────────
+
+    async def _on_reset_filters(self, query, user_id, arg):
+        if user_id in self.bot.temp_data:
+            self.bot.temp_data[user_id].pop('filter_year', None)
+            self.bot.temp_data[user_id].pop('filter_month', None)
+            self.bot.temp_data[user_id].pop('filter_mentor', None)
+        await self.show_filter_menu(query, user_id)
+
+    async def _on_filter_mentor(self, query, user_id, mentor_name):
+        self.bot.temp_data.setdefault(user_id, {})['filter_mentor'] = mentor_name
+        await self.show_streamers_by_mentor(query, user_id, mentor_name)
+
+    async def _on_add_mentor_filter(self, query, user_id, mentor_name):
+        # Додавання ментора до існуючого фільтру
+        filters = self.bot.temp_data.setdefault(user_id, {})
+        filters['filter_mentor'] = mentor_name
+
+        # Повертаємось до відображення з оновленим фільтром
+        year = filters.get('filter_year')
+        month = filters.get('filter_month')
+
+        if year and month:
+            await self.show_streamers_by_month(query, year, month)
+        elif year:
+            await self.show_streamers_by_year(query, year)
+        else:
+            await self.show_streamers_by_mentor(query, user_id, mentor_name)
+
+    async def _on_add_year(self, query, user_id, arg):
+        # Додавання року до існуючого фільтру
+        year = int(arg)
+        filters = self.bot.temp_data.setdefault(user_id, {})
+        filters['filter_year'] = year
+        filters['filter_month'] = None
+
+        mentor_filter = filters.get('filter_mentor')
+        if mentor_filter:
+            await self.show_streamers_by_mentor(query, user_id, mentor_filter)
+        else:
+            await self.show_streamers_by_year(query, year)
+
+    async def _on_add_month(self, query, user_id, arg):
+        # Додавання місяця до існуючого фільтру
+        month = int(arg)
+        filters = self.bot.temp_data.get(user_id, {})
+        year = filters.get('filter_year')
+
+        if year:
+            filters['filter_month'] = month
+            mentor_filter = filters.get('filter_mentor')
+            if mentor_filter:
+                await self.show_streamers_by_mentor(query, user_id, mentor_filter)
+            else:
+                await self.show_streamers_by_month(query, year, month)
+
+    async def _on_year(self, query, user_id, arg):
+        year = int(arg)
+        filters = self.bot.temp_data.setdefault(user_id, {})
+        filters['filter_year'] = year
+        filters['filter_month'] = None
+        await self.show_streamers_by_year(query, year)
+
+    async def _on_year_for_month(self, query, user_id, arg):
+        year = int(arg)
+        self.bot.temp_data.setdefault(user_id, {})['selected_year'] = year
+        await self.show_month_selection(query, user_id, year)
+
+    async def _on_back_to_months(self, query, user_id, arg):
+        year = int(arg)
+        filters = self.bot.temp_data.setdefault(user_id, {})
+        filters['selected_year'] = year
+        # Очищаємо фільтр місяця при поверненні
+        filters.pop('filter_month', None)
+        await self.show_month_selection(query, user_id, year)
+
+    async def _on_month(self, query, user_id, arg):
+        """Вибір місяця: month_{M} (рік з selected_year) або month_{YYYY}_{M}"""
+        if '_' in arg:
+            parts = arg.split('_')
+            year = int(parts[0])
+            month = int(parts[1])
+        else:
+            month = int(arg)
+            year = self.bot.temp_data.get(user_id, {}).get('selected_year')
+
+        if year:
+            filters = self.bot.temp_data.setdefault(user_id, {})
+            filters['filter_year'] = year
+            filters['filter_month'] = month
+            await self.show_streamers_by_month(query, year, month)
+        else:
+            keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_by_month')]]
+            reply_markup = InlineKeyboardMarkup(keyboard)
+            await query.edit_message_text(
+                "❌ Помилка: рік не знайдено. Спробуйте ще раз.",
+                reply_markup=reply_markup
+            )
+
+    async def _on_set_platform(self, query, user_id, arg):
+        streamer_id, platform = arg.rsplit('_', 1)
+        await self.set_platform(query, streamer_id, platform)
+
+    async def _on_confirm_rewrite(self, query, user_id, arg):
+        # Формат: confirm_rewrite_{old_id}_{new_id}
+        parts = arg.split('_', 1)
+        if len(parts) == 2:
+            old_streamer_id, new_streamer_id = parts
+            await self.confirm_profile_rewrite(query, user_id, old_streamer_id, new_streamer_id)
+
+    async def _on_page_streamers(self, query, user_id, arg):
+        page, after_id, before_id = self.parse_page_callback(arg)
+        await self.show_all_streamers_paginated(query, page, after_id=after_id, before_id=before_id)
+
+    async def _on_page_delete(self, query, user_id, arg):
+        page, after_id, before_id = self.parse_page_callback(arg)
+        await self.show_delete_page(query, user_id, page, after_id=after_id, before_id=before_id)
+
+    async def _on_select_mentor(self, query, user_id, arg):
+        # Формат: select_mentor_{streamer_id}_{mentor_id}
+        # ВАЖЛИВО: streamer_id може містити символ "_" — rsplit розділяє з КІНЦЯ
+        parts = arg.rsplit('_', 1)
+        if len(parts) == 2:
+            streamer_id, mentor_id = parts
+            logging.info(f"Assigning mentor - streamer_id: {streamer_id}, mentor_id: {mentor_id}")
+            await self.assign_mentor_to_streamer(query, user_id, streamer_id, mentor_id)
+        else:
+            logging.error(f"Invalid select_mentor_ format: select_mentor_{arg}")
+            await query.answer("❌ Помилка формату даних!", show_alert=True)
     
     async def start_add_streamer(self, query, user_id):
         """Початок додавання стрімера"""
@@ -60,11 +269,11 @@ class StreamerHandlers:
         
         try:
             # Використовуємо API замість Selenium
-            user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(url)
+            user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(url)
                 
             if user_id_scraped and user_name:
                 profile_url = f"https://tango.me/profile/{user_id_scraped}"
-                existing_streamer = self.bot.db.get_streamer_by_id(user_id_scraped)
+                existing_streamer = await self.bot.adb.get_streamer_by_id(user_id_scraped)
                 
                 if existing_streamer:
                     self.bot.temp_data[user_id] = {
@@ -164,7 +373,7 @@ class StreamerHandlers:
         import html as _h
         from datetime import datetime
 
-        mentor = self.bot.db.get_mentor_by_telegram_id(user_id)
+        mentor = await self.bot.adb.get_mentor_by_telegram_id(user_id)
         if not mentor:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='main_menu')]]
             await query.edit_message_text(
@@ -174,7 +383,7 @@ class StreamerHandlers:
             return
 
         mentor_name = mentor['mentor_name']
-        streamers = self.bot.db.get_streamers_by_mentor(mentor_name)
+        streamers = await self.bot.adb.get_streamers_by_mentor(mentor_name)
 
         if not streamers:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='main_menu')]]
@@ -224,31 +433,67 @@ class StreamerHandlers:
         """Показати всіх стрімерів з пагінацією (перша сторінка)"""
         await self.show_all_streamers_paginated(query, page=0)
 
-    async def show_all_streamers_paginated(self, query, page: int = 0):
+    @staticmethod
+    def parse_page_callback(payload: str) -> Tuple[int, Optional[int], Optional[int]]:
+        """
+        Розбирає хвіст callback'а пагінації:
+        '3' → (3, None, None), '3_a17' → (3, 17, None), '3_b42' → (3, None, 42)
+        """
+        page_str, _, anchor = payload.partition('_')
+        page = int(page_str)
+        if anchor[:1] == 'a':
+            return page, int(anchor[1:]), None
+        if anchor[:1] == 'b':
+            return page, None, int(anchor[1:])
+        return page, None, None
+
+    async def _load_streamers_page(
+        self, page: int, per_page: int,
+        after_id: Optional[int] = None, before_id: Optional[int] = None
+    ) -> Tuple[int, int, int, List[Tuple]]:
+        """
+        Сторінка стрімерів через COUNT + keyset-запит (без вибірки всієї таблиці).
+        Повертає (page, total_pages, total, rows); у rows id — останнє поле.
+        """
+        total = await self.bot.adb.count_streamers()
+        if not total:
+            return 0, 0, 0, []
+
+        total_pages = (total + per_page - 1) // per_page
+        if not 0 <= page < total_pages:
+            # Сторінки вже немає (стрімерів видалили) — якір недійсний
+            page = max(0, min(page, total_pages - 1))
+            after_id = before_id = None
+
+        rows = await self.bot.adb.get_streamers_page(
+            per_page, after_id=after_id, before_id=before_id, offset=page * per_page
+        )
+        if not rows and page > 0:
+            rows = await self.bot.adb.get_streamers_page(per_page, offset=page * per_page)
+        return page, total_pages, total, rows
+
+    async def show_all_streamers_paginated(
+        self, query, page: int = 0, after_id: Optional[int] = None, before_id: Optional[int] = None
+    ):
         """Показати стрімерів з пагінацією"""
-        streamers = self.bot.db.get_all_streamers()
-        total = len(streamers)
+        page, total_pages, total, page_streamers = await self._load_streamers_page(
+            page, STREAMERS_PER_PAGE, after_id, before_id
+        )
         
-        if not streamers:
+        if not page_streamers:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='streamers_menu')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
             await query.edit_message_text("❌ База стрімерів порожня!", reply_markup=reply_markup)
             return
         
-        # Розрахунок пагінації
-        total_pages = (total + STREAMERS_PER_PAGE - 1) // STREAMERS_PER_PAGE
-        page = max(0, min(page, total_pages - 1))  # Обмежуємо page
-        
         start_idx = page * STREAMERS_PER_PAGE
-        end_idx = min(start_idx + STREAMERS_PER_PAGE, total)
-        page_streamers = streamers[start_idx:end_idx]
         
         # Формуємо текст
         text = f"📋 Всі стрімери (сторінка {page + 1}/{total_pages})\n"
         text += f"📊 Всього: {total} стрімерів\n\n"
         
         for i, streamer_data in enumerate(page_streamers, start_idx + 1):
-            name, user_id, profile_url, tg_name, tg_url, instagram_url, platform, mentor_name, created_at = streamer_data
+            name, user_id, profile_url, tg_name, tg_url, instagram_url, platform, mentor_name, created_at, _ = streamer_data
 
             # Екрануємо HTML
             import html as _html
@@ -290,11 +535,16 @@ class StreamerHandlers:
         # Кнопки навігації
         nav_buttons = []
 
+        # Якір — id першого/останнього рядка сторінки (keyset)
         if page > 0:
-            nav_buttons.append(InlineKeyboardButton("⬅️ Попередня", callback_data=f'page_streamers_{page-1}'))
+            nav_buttons.append(InlineKeyboardButton(
+                "⬅️ Попередня", callback_data=f'page_streamers_{page-1}_b{page_streamers[0][-1]}'
+            ))
 
         if page < total_pages - 1:
-            nav_buttons.append(InlineKeyboardButton("➡️ Наступна", callback_data=f'page_streamers_{page+1}'))
+            nav_buttons.append(InlineKeyboardButton(
+                "➡️ Наступна", callback_data=f'page_streamers_{page+1}_a{page_streamers[-1][-1]}'
+            ))
 
         if nav_buttons:
             keyboard.append(nav_buttons)
@@ -327,7 +577,7 @@ class StreamerHandlers:
 
     async def show_mentor_filter_selection(self, query, user_id):
         """Вибір ментора для фільтрації"""
-        mentors = self.bot.db.get_mentors_with_streamers()
+        mentors = await self.bot.adb.get_mentors_with_streamers()
         
         if not mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_streamers')]]
@@ -364,13 +614,13 @@ class StreamerHandlers:
         
         # Отримуємо стрімерів з урахуванням фільтрів
         if year and month:
-            streamers = self.bot.db.get_streamers_by_mentor_and_month(mentor_name, year, month)
+            streamers = await self.bot.adb.get_streamers_by_mentor_and_month(mentor_name, year, month)
             period_text = f"{MONTHS_UA.get(month, str(month))} {year}"
         elif year:
-            streamers = self.bot.db.get_streamers_by_mentor_and_year(mentor_name, year)
+            streamers = await self.bot.adb.get_streamers_by_mentor_and_year(mentor_name, year)
             period_text = f"{year} рік"
         else:
-            streamers = self.bot.db.get_streamers_by_mentor(mentor_name)
+            streamers = await self.bot.adb.get_streamers_by_mentor(mentor_name)
             period_text = "весь час"
         
         if not streamers:
@@ -448,7 +698,7 @@ class StreamerHandlers:
 
     async def show_streamers_without_mentor(self, query):
         """Показати стрімерів без ментора"""
-        streamers = self.bot.db.get_streamers_without_mentor()
+        streamers = await self.bot.adb.get_streamers_without_mentor()
         
         if not streamers:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_streamers')]]
@@ -515,9 +765,9 @@ class StreamerHandlers:
 
     async def show_year_selection(self, query, user_id):
         """Вибір року для фільтрації"""
-        years = self.bot.db.get_available_years()
+        year_counts = await self.bot.adb.get_streamer_year_counts()
         
-        if not years:
+        if not year_counts:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_streamers')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
             await query.edit_message_text(
@@ -527,8 +777,7 @@ class StreamerHandlers:
             return
         
         keyboard = []
-        for year in years:
-            count = len(self.bot.db.get_streamers_by_year(year))
+        for year, count in year_counts:
             keyboard.append([InlineKeyboardButton(f"📅 {year} ({count} стрімерів)", callback_data=f'year_{year}')])
         
         keyboard.append([InlineKeyboardButton("◀️ Назад", callback_data='filter_streamers')])
@@ -541,7 +790,7 @@ class StreamerHandlers:
 
     async def show_year_selection_for_month(self, query, user_id):
         """Вибір року для фільтрації по місяцях"""
-        years = self.bot.db.get_available_years()
+        years = await self.bot.adb.get_available_years()
         
         if not years:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_streamers')]]
@@ -566,11 +815,11 @@ class StreamerHandlers:
 
     async def show_month_selection(self, query, user_id, year: int):
         """Вибір місяця"""
-        months = self.bot.db.get_available_months_for_year(year)
+        month_counts = await self.bot.adb.get_streamer_month_counts(year)
         
-        logging.info(f"Showing months for year {year}: {months}")
+        logging.info(f"Showing months for year {year}: {[m for m, _ in month_counts]}")
         
-        if not months:
+        if not month_counts:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='filter_by_month')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
             await query.edit_message_text(
@@ -580,8 +829,7 @@ class StreamerHandlers:
             return
         
         keyboard = []
-        for month in months:
-            count = len(self.bot.db.get_streamers_by_month(year, month))
+        for month, count in month_counts:
             month_name = MONTHS_UA.get(month, str(month))
             # ВИПРАВЛЕНО: додаємо рік в callback_data
             keyboard.append([InlineKeyboardButton(
@@ -611,10 +859,10 @@ class StreamerHandlers:
         mentor_filter = self.bot.temp_data[user_id].get('filter_mentor')
         
         if mentor_filter:
-            streamers = self.bot.db.get_streamers_by_mentor_and_year(mentor_filter, year)
+            streamers = await self.bot.adb.get_streamers_by_mentor_and_year(mentor_filter, year)
             title_prefix = f"🎓 Стрімери ментора **{mentor_filter}** за"
         else:
-            streamers = self.bot.db.get_streamers_by_year(year)
+            streamers = await self.bot.adb.get_streamers_by_year(year)
             title_prefix = "📅 Стрімери за"
         
         if not streamers:
@@ -700,10 +948,10 @@ class StreamerHandlers:
         logging.info(f"Showing streamers for {year}-{month}, mentor filter: {mentor_filter}")
         
         if mentor_filter:
-            streamers = self.bot.db.get_streamers_by_mentor_and_month(mentor_filter, year, month)
+            streamers = await self.bot.adb.get_streamers_by_mentor_and_month(mentor_filter, year, month)
             title_prefix = f"🎓 Стрімери ментора **{mentor_filter}** за"
         else:
-            streamers = self.bot.db.get_streamers_by_month(year, month)
+            streamers = await self.bot.adb.get_streamers_by_month(year, month)
             title_prefix = "📆 Стрімери за"
         
         if not streamers:
@@ -774,7 +1022,7 @@ class StreamerHandlers:
 
     async def show_year_selection_for_mentor_filter(self, query, user_id):
         """Вибір року для додавання до фільтру ментора"""
-        years = self.bot.db.get_available_years()
+        years = await self.bot.adb.get_available_years()
         
         if not years:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='reset_filters')]]
@@ -811,7 +1059,7 @@ class StreamerHandlers:
             )
             return
         
-        months = self.bot.db.get_available_months_for_year(year)
+        months = await self.bot.adb.get_available_months_for_year(year)
         
         if not months:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='reset_filters')]]
@@ -840,7 +1088,7 @@ class StreamerHandlers:
 
     async def show_mentor_selection_for_date_filter(self, query, user_id):
         """Вибір ментора для додавання до фільтру дати"""
-        mentors = self.bot.db.get_mentors_with_streamers()
+        mentors = await self.bot.adb.get_mentors_with_streamers()
         
         if not mentors:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='reset_filters')]]
@@ -869,8 +1117,8 @@ class StreamerHandlers:
 
     async def show_statistics(self, query):
         """Показати статистику"""
-        stats = self.bot.db.get_streamers_count_by_period()
-        total = len(self.bot.db.get_all_streamers())
+        stats = await self.bot.adb.get_streamers_count_by_period()
+        total = await self.bot.adb.count_streamers()
         
         if not stats:
             text = "❌ Немає даних для статистики!"
@@ -1177,7 +1425,7 @@ class StreamerHandlers:
         streamer_data = self.bot.temp_data[user_id]
         
         # Зберігаємо стрімера
-        success = self.bot.db.add_streamer(
+        success = await self.bot.adb.add_streamer(
             name=streamer_data['name'],
             user_id=streamer_data['id'],
             profile_url=streamer_data['profile_url'],
@@ -1185,24 +1433,22 @@ class StreamerHandlers:
             tg_url=streamer_data.get('tg_url'),
             instagram_url=streamer_data.get('instagram_url'),
             platform=streamer_data.get('platform'),
-            mentor_name=streamer_data.get('mentor_name')
+            mentor_name=streamer_data.get('mentor_name'),
+            mentor_id=streamer_data.get('mentor_id')
         )
         if success:
             # Отримуємо діаманти одразу після збереження
             try:
                 diamonds = await self.bot.diamonds_service.fetch_diamonds(streamer_data['id'])
                 if diamonds is not None:
-                    self.bot.db.update_streamer_diamonds_now(streamer_data['id'], diamonds)
+                    await self.bot.adb.update_streamer_diamonds_now(streamer_data['id'], diamonds)
             except Exception as _e:
                 logging.warning(f"Не вдалось отримати діаманти при додаванні: {_e}")
 
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
-
         if success:
             # Якщо був призначений ментор, оновлюємо дату призначення
             if streamer_data.get('mentor_name'):
-                self.bot.db.update_mentor_last_assigned(streamer_data['mentor_name'])
+                await self.bot.adb.update_mentor_last_assigned(streamer_data['mentor_name'])
             
             await query.edit_message_text(
                 f"✅ Стрімера успішно додано!\n\n"
@@ -1224,25 +1470,21 @@ class StreamerHandlers:
         """Початок видалення стрімера"""
         await self.show_delete_page(query, user_id, page=0)
 
-    async def show_delete_page(self, query, user_id, page: int = 0):
+    async def show_delete_page(
+        self, query, user_id, page: int = 0,
+        after_id: Optional[int] = None, before_id: Optional[int] = None
+    ):
         """Показати сторінку для видалення стрімерів"""
-        streamers = self.bot.db.get_all_streamers()
-        total = len(streamers)
+        page, total_pages, total, page_streamers = await self._load_streamers_page(
+            page, DELETE_ITEMS_PER_PAGE, after_id, before_id
+        )
         
-        if not streamers:
+        if not page_streamers:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='streamers_menu')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
             await query.edit_message_text("❌ База стрімерів порожня!", reply_markup=reply_markup)
             return
         
-        # Розрахунок пагінації
-        total_pages = (total + DELETE_ITEMS_PER_PAGE - 1) // DELETE_ITEMS_PER_PAGE
-        page = max(0, min(page, total_pages - 1))
-        
-        start_idx = page * DELETE_ITEMS_PER_PAGE
-        end_idx = min(start_idx + DELETE_ITEMS_PER_PAGE, total)
-        page_streamers = streamers[start_idx:end_idx]
-        
         # Формуємо кнопки
         keyboard = []
         for streamer_data in page_streamers:
@@ -1258,7 +1500,9 @@ class StreamerHandlers:
         # Кнопки навігації
         nav_buttons = []
         if page > 0:
-            nav_buttons.append(InlineKeyboardButton("⬅️", callback_data=f'page_delete_{page-1}'))
+            nav_buttons.append(InlineKeyboardButton(
+                "⬅️", callback_data=f'page_delete_{page-1}_b{page_streamers[0][-1]}'
+            ))
         
         nav_buttons.append(InlineKeyboardButton(
             f"📄 {page + 1}/{total_pages}", 
@@ -1266,7 +1510,9 @@ class StreamerHandlers:
         ))
         
         if page < total_pages - 1:
-            nav_buttons.append(InlineKeyboardButton("➡️", callback_data=f'page_delete_{page+1}'))
+            nav_buttons.append(InlineKeyboardButton(
+                "➡️", callback_data=f'page_delete_{page+1}_a{page_streamers[-1][-1]}'
+            ))
         
         keyboard.append(nav_buttons)
         keyboard.append([InlineKeyboardButton("◀️ Назад", callback_data='streamers_menu')])
@@ -1282,7 +1528,7 @@ class StreamerHandlers:
 
     async def delete_streamer(self, query, streamer_id):
         """Показ інформації про стрімера перед видаленням з можливістю редагування"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='streamers_menu')]]
@@ -1333,10 +1579,7 @@ class StreamerHandlers:
 
     async def confirm_delete_streamer(self, query, streamer_id):
         """Підтвердження та видалення стрімера"""
-        success = self.bot.db.remove_streamer(streamer_id)
-
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
+        success = await self.bot.adb.remove_streamer(streamer_id)
 
         keyboard = [[InlineKeyboardButton("◀️ Назад", callback_data='streamers_menu')]]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1354,7 +1597,7 @@ class StreamerHandlers:
 
     async def show_streamer_details(self, query, streamer_id):
         """Показати детальну інформацію про стрімера з можливістю редагування"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             await query.edit_message_text("❌ Стрімер не знайдений!")
@@ -1415,7 +1658,7 @@ class StreamerHandlers:
 
     async def show_edit_name_prompt(self, query, user_id, streamer_id):
         """Показати запит на зміну імені"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             await query.edit_message_text("❌ Стрімер не знайдений!")
@@ -1443,7 +1686,7 @@ class StreamerHandlers:
 
     async def show_edit_telegram_prompt(self, query, user_id, streamer_id):
         """Показати запит на зміну Telegram"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             await query.edit_message_text("❌ Стрімер не знайдений!")
@@ -1477,7 +1720,7 @@ class StreamerHandlers:
 
     async def show_edit_instagram_prompt(self, query, user_id, streamer_id):
         """Показати запит на зміну Instagram"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             await query.edit_message_text("❌ Стрімер не знайдений!")
@@ -1511,7 +1754,7 @@ class StreamerHandlers:
 
     async def show_edit_platform_prompt(self, query, user_id, streamer_id):
         """Показати запит на зміну платформи"""
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         if not streamer:
             await query.edit_message_text("❌ Стрімер не знайдений!")
@@ -1541,9 +1784,7 @@ class StreamerHandlers:
 
     async def set_platform(self, query, streamer_id, platform):
         """Встановити платформу"""
-        success = self.bot.db.update_streamer_field(streamer_id, 'platform', platform)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
+        success = await self.bot.adb.update_streamer_field(streamer_id, 'platform', platform)
         
         if success:
             await query.answer(f"✅ Платформу змінено на {platform}", show_alert=True)
@@ -1553,10 +1794,8 @@ class StreamerHandlers:
 
     async def delete_telegram(self, query, streamer_id):
         """Видалити Telegram"""
-        success = self.bot.db.update_streamer_field(streamer_id, 'tg_name', None)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
-        success = success and self.bot.db.update_streamer_field(streamer_id, 'tg_url', None)
+        success = await self.bot.adb.update_streamer_field(streamer_id, 'tg_name', None)
+        success = success and await self.bot.adb.update_streamer_field(streamer_id, 'tg_url', None)
         
         if success:
             await query.answer("✅ Telegram видалено", show_alert=True)
@@ -1566,9 +1805,7 @@ class StreamerHandlers:
 
     async def delete_instagram(self, query, streamer_id):
         """Видалити Instagram"""
-        success = self.bot.db.update_streamer_field(streamer_id, 'instagram_url', None)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
+        success = await self.bot.adb.update_streamer_field(streamer_id, 'instagram_url', None)
         
         if success:
             await query.answer("✅ Instagram видалено", show_alert=True)
@@ -1578,9 +1815,7 @@ class StreamerHandlers:
 
     async def delete_platform(self, query, streamer_id):
         """Видалити платформу"""
-        success = self.bot.db.update_streamer_field(streamer_id, 'platform', None)
-        if success and hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
+        success = await self.bot.adb.update_streamer_field(streamer_id, 'platform', None)
         
         if success:
             await query.answer("✅ Платформу видалено", show_alert=True)
@@ -1629,7 +1864,7 @@ class StreamerHandlers:
             await update.effective_chat.send_message("❌ Помилка: ID стрімера не знайдено!")
             return
         
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         if not streamer:
             await update.effective_chat.send_message("❌ Стрімера не знайдено!")
             return
@@ -1644,7 +1879,7 @@ class StreamerHandlers:
             )
             
             try:
-                user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(input_text)
+                user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(input_text)
                 
                 if not user_id_scraped or not user_name:
                     await processing_msg.edit_text("❌ Не вдалося отримати дані!")
@@ -1686,7 +1921,7 @@ class StreamerHandlers:
                     )
                 else:
                     # ID той самий - просто оновлюємо ім'я
-                    success = self.bot.db.add_streamer(
+                    success = await self.bot.adb.add_streamer(
                         name=user_name,
                         user_id=streamer_id,
                         profile_url=streamer['profile_url'],
@@ -1697,9 +1932,6 @@ class StreamerHandlers:
                         mentor_name=streamer.get('mentor_name')
                     )
 
-                    if hasattr(self.bot, 'sheets_service'):
-                        self.bot.sheets_service.schedule_sync('streamers')
-
                     if success:
                         keyboard = [[InlineKeyboardButton("◀️ Назад до редагування", 
                                                         callback_data=f'edit_streamer_{streamer_id}')]]
@@ -1723,7 +1955,7 @@ class StreamerHandlers:
             # Це ручний ввід імені
             new_name = input_text
             
-            success = self.bot.db.add_streamer(
+            success = await self.bot.adb.add_streamer(
                 name=new_name,
                 user_id=streamer_id,
                 profile_url=streamer['profile_url'],
@@ -1734,9 +1966,6 @@ class StreamerHandlers:
                 mentor_name=streamer.get('mentor_name')
             )
 
-            if hasattr(self.bot, 'sheets_service'):
-                self.bot.sheets_service.schedule_sync('streamers')
-
             if success:
                 keyboard = [[InlineKeyboardButton("◀️ Назад до редагування", 
                                                 callback_data=f'edit_streamer_{streamer_id}')]]
@@ -1767,17 +1996,17 @@ class StreamerHandlers:
             return
         
         # Отримуємо старого стрімера
-        old_streamer = self.bot.db.get_streamer_by_id(old_streamer_id)
+        old_streamer = await self.bot.adb.get_streamer_by_id(old_streamer_id)
         
         if not old_streamer:
             await query.edit_message_text("❌ Старого стрімера не знайдено!")
             return
         
         # Видаляємо старий профіль
-        self.bot.db.remove_streamer(old_streamer_id)
+        await self.bot.adb.remove_streamer(old_streamer_id)
         
         # Додаємо новий профіль зі старими додатковими даними
-        success = self.bot.db.add_streamer(
+        success = await self.bot.adb.add_streamer(
             name=pending['new_name'],
             user_id=new_streamer_id,
             profile_url=pending['new_profile_url'],
@@ -1788,9 +2017,6 @@ class StreamerHandlers:
             mentor_name=old_streamer.get('mentor_name')
         )
         
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
-
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад до редагування", 
                                             callback_data=f'edit_streamer_{new_streamer_id}')]]
@@ -1866,12 +2092,12 @@ class StreamerHandlers:
             await update.effective_chat.send_message("❌ Некоректне посилання на Telegram!")
             return
         
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         if not streamer:
             await update.effective_chat.send_message("❌ Стрімера не знайдено!")
             return
         
-        success = self.bot.db.add_streamer(
+        success = await self.bot.adb.add_streamer(
             name=streamer['name'],
             user_id=streamer_id,
             profile_url=streamer['profile_url'],
@@ -1880,8 +2106,6 @@ class StreamerHandlers:
             instagram_url=streamer.get('instagram_url'),
             platform=streamer.get('platform')
         )
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
 
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад до редагування", callback_data=f'edit_streamer_{streamer_id}')]]
@@ -1939,12 +2163,12 @@ class StreamerHandlers:
             await update.effective_chat.send_message("❌ Некоректне посилання на Instagram!")
             return
         
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         if not streamer:
             await update.effective_chat.send_message("❌ Стрімера не знайдено!")
             return
         
-        success = self.bot.db.add_streamer(
+        success = await self.bot.adb.add_streamer(
             name=streamer['name'],
             user_id=streamer_id,
             profile_url=streamer['profile_url'],
@@ -1954,9 +2178,6 @@ class StreamerHandlers:
             platform=streamer.get('platform')
         )
         
-        if hasattr(self.bot, 'sheets_service'):
-            self.bot.sheets_service.schedule_sync('streamers')
-
         if success:
             keyboard = [[InlineKeyboardButton("◀️ Назад до редагування", callback_data=f'edit_streamer_{streamer_id}')]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1998,7 +2219,8 @@ class StreamerHandlers:
             "🔎 Пошук стрімера\n\n"
             "Введіть ім'я стрімера (або частину імені) для пошуку:\n\n"
             "Приклад: `Олена` або `олена123`\n\n"
-            "💡 Пошук не чутливий до регістру",
+            "💡 Пошук не чутливий до регістру, шукає також за ID, "
+            "Telegram, Instagram та ментором і прощає дрібні помилки",
             parse_mode='Markdown'
         )
         
@@ -2033,7 +2255,7 @@ class StreamerHandlers:
             )
             
             try:
-                user_id_from_url, user_name = self.bot.api_client.get_user_id_from_url(query_text)
+                user_id_from_url, user_name = await self.bot.async_api_client.get_user_id_from_url(query_text)
                 
                 if not user_id_from_url:
                     keyboard = [[InlineKeyboardButton("🔎 Новий пошук", callback_data='search_streamer')],
@@ -2051,7 +2273,7 @@ class StreamerHandlers:
                     return
                 
                 # Шукаємо в базі по ID
-                streamer = self.bot.db.get_streamer_by_id(user_id_from_url)
+                streamer = await self.bot.adb.get_streamer_by_id(user_id_from_url)
                 
                 if not streamer:
                     keyboard = [[InlineKeyboardButton("🔎 Новий пошук", callback_data='search_streamer')],
@@ -2122,14 +2344,8 @@ class StreamerHandlers:
                 del self.bot.temp_data[user_id]['search_instruction_message_id']
             return
         
-        # Пошук по імені (оригінальна логіка)
-        all_streamers = self.bot.db.get_all_streamers()
-        query_lower = query_text.lower()
-        
-        found_streamers = [
-            s for s in all_streamers 
-            if query_lower in s[0].lower()  # s[0] - це name
-        ]
+        # Пошук по FTS-індексу (ім'я, ID, Telegram, Instagram, ментор)
+        found_streamers = await self.bot.adb.search_streamers(query_text)
         
         if not found_streamers:
             keyboard = [[InlineKeyboardButton("🔎 Новий пошук", callback_data='search_streamer')],
@@ -2138,7 +2354,7 @@ class StreamerHandlers:
             
             await update.effective_chat.send_message(
                 f"😔 Нічого не знайдено за запитом: `{query_text}`\n\n"
-                f"💡 Пошук здійснюється по імені стрімера\n"
+                f"💡 Пошук здійснюється по імені, ID, Telegram, Instagram та ментору\n"
                 f"Для пошуку по посиланню надішліть URL профілю\n\n"
                 f"Спробуйте інший запит.",
                 reply_markup=reply_markup,
@@ -2216,7 +2432,7 @@ class StreamerHandlers:
         streamer_id = str(streamer_id).strip()
         logging.info(f"Cleaned streamer_id: {streamer_id}")
         
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         # Перевіряємо чи стрімер існує в БД або в temp_data (новий стрімер)
         is_new_streamer = False
@@ -2243,8 +2459,8 @@ class StreamerHandlers:
                 return
         
         # Отримуємо менторів відсортованих за датою останнього призначення
-        mentors = self.bot.db.get_all_mentors(sort_by_assignment=True)
-        stats = self.bot.db.get_mentor_statistics()
+        mentors = await self.bot.adb.get_all_mentors(sort_by_assignment=True)
+        stats = await self.bot.adb.get_mentor_statistics()
         
         if not mentors:
             back_callback = 'add_more_data' if is_new_streamer else f'edit_streamer_{streamer_id}'
@@ -2315,7 +2531,7 @@ class StreamerHandlers:
         """Призначення ментора стрімеру (за ID ментора)"""
         import logging
         
-        streamer = self.bot.db.get_streamer_by_id(streamer_id)
+        streamer = await self.bot.adb.get_streamer_by_id(streamer_id)
         
         # Перевіряємо чи це новий стрімер
         is_new_streamer = False
@@ -2330,7 +2546,7 @@ class StreamerHandlers:
         
         # Отримуємо ім'я ментора за ID
         mentor_id = int(mentor_id_str)
-        mentor = self.bot.db.get_mentor_by_id(mentor_id)
+        mentor = await self.bot.adb.get_mentor_by_id(mentor_id)
         
         if not mentor:
             await query.answer("❌ Ментор не знайдений!", show_alert=True)
@@ -2341,15 +2557,16 @@ class StreamerHandlers:
         if is_new_streamer:
             # Для нового стрімера зберігаємо в temp_data
             self.bot.temp_data[user_id]['mentor_name'] = mentor_name
+            self.bot.temp_data[user_id]['mentor_id'] = mentor_id
             
             # Оновлюємо дату останнього призначення ментора
-            self.bot.db.update_mentor_last_assigned(mentor_name)
+            await self.bot.adb.update_mentor_last_assigned(mentor_name)
             
             await query.answer(f"✅ Ментора призначено: {mentor_name}", show_alert=True)
             await self.show_additional_data_menu(query, user_id)
         else:
             # Для існуючого стрімера оновлюємо в БД
-            success = self.bot.db.add_streamer(
+            success = await self.bot.adb.add_streamer(
                 name=streamer['name'],
                 user_id=streamer_id,
                 profile_url=streamer['profile_url'],
@@ -2357,15 +2574,13 @@ class StreamerHandlers:
                 tg_url=streamer.get('tg_url'),
                 instagram_url=streamer.get('instagram_url'),
                 platform=streamer.get('platform'),
-                mentor_name=mentor_name
+                mentor_name=mentor_name,
+                mentor_id=mentor_id
             )
 
-            if hasattr(self.bot, 'sheets_service'):
-                self.bot.sheets_service.schedule_sync('streamers')
-
             if success:
                 # Оновлюємо дату останнього призначення ментора
-                self.bot.db.update_mentor_last_assigned(mentor_name)
+                await self.bot.adb.update_mentor_last_assigned(mentor_name)
                 
                 await query.answer(f"✅ Ментора призначено: {mentor_name}", show_alert=True)
                 await self.show_streamer_details(query, streamer_id)
@@ -2448,7 +2663,7 @@ class StreamerHandlers:
         )
 
         try:
-            user_id_scraped, user_name = self.bot.api_client.get_user_id_from_url(url)
+            user_id_scraped, user_name = await self.bot.async_api_client.get_user_id_from_url(url)
 
             if user_id_scraped and user_name:
                 profile_url = f"https://tango.me/profile/{user_id_scraped}"
@@ -2520,7 +2735,7 @@ class StreamerHandlers:
             return
 
         # Перевірка чи вже є в базі
-        existing = self.bot.db.get_streamer_by_id(result['tango_id'])
+        existing = await self.bot.adb.get_streamer_by_id(result['tango_id'])
         if existing:
             keyboard = [
                 [InlineKeyboardButton("✏️ Редагувати", callback_data=f"edit_streamer_{result['tango_id']}")],
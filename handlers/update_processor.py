@@ -0,0 +1,52 @@
+"""
+Паралельна обробка апдейтів Telegram з чергою на кожного користувача
+"""
+import asyncio
+from typing import Any, Awaitable, Dict
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+from config import MAX_CONCURRENT_UPDATES
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Апдейти різних користувачів — паралельно (не більше max_concurrent_updates),
+    апдейти одного користувача — по одному, в порядку надходження.
+
+    Обробники читають і змінюють temp_data/user_states користувача між
+    await'ами; подвійне натискання кнопки не має переплітати два обробники
+    над тим самим станом. Апдейти без користувача (напр. зміни в каналі)
+    обробляються одразу.
+    """
+
+    def __init__(self, max_concurrent_updates: int = MAX_CONCURRENT_UPDATES):
+        super().__init__(max_concurrent_updates)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._pending: Dict[int, int] = {}   # user_id → апдейтів у роботі/черзі
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        user = update.effective_user if isinstance(update, Update) else None
+        if user is None:
+            await coroutine
+            return
+
+        user_id = user.id
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        try:
+            async with lock:
+                await coroutine
+        finally:
+            # Замок живе, лише поки в користувача є апдейти
+            self._pending[user_id] -= 1
+            if not self._pending[user_id]:
+                del self._pending[user_id]
+                del self._locks[user_id]
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
@@ -83,7 +83,7 @@ class UserHandlers:
             await query.answer("❌ Немає доступу", show_alert=True)
             return
         
-        users = self.bot.db.get_all_users(role=role_filter)
+        users = await self.bot.adb.get_all_users(role=role_filter)
         
         role_emoji = config.ROLE_EMOJI.get(role_filter, '👤')
         role_name = config.ROLES.get(role_filter, role_filter)
@@ -120,7 +120,7 @@ class UserHandlers:
         query = update.callback_query
         await query.answer()
         
-        user = self.bot.db.get_user_by_telegram_id(target_telegram_id)
+        user = await self.bot.adb.get_user_by_telegram_id(target_telegram_id)
         
         if not user:
             await query.answer("❌ Користувача не знайдено", show_alert=True)
@@ -145,9 +145,9 @@ class UserHandlers:
         # Додаткова статистика для менторів
         if user['role'] == 'mentor':
             # Отримуємо ID ментора з таблиці mentors
-            mentor = self.bot.db.get_mentor_by_telegram_id(target_telegram_id)
+            mentor = await self.bot.adb.get_mentor_by_telegram_id(target_telegram_id)
             if mentor:
-                streamers = self.bot.db.get_streamers_by_mentor(mentor['id'])
+                streamers = await self.bot.adb.get_streamers_by_mentor(mentor['id'])
                 active_streamers = [s for s in streamers if s.get('is_active')]
                 text += f"\n📊 Стрімерів: {len(streamers)} (активних: {len(active_streamers)})"
         
@@ -266,7 +266,7 @@ class UserHandlers:
             return
         
         # Перевіряємо чи користувач вже існує
-        existing_user = self.bot.db.get_user_by_telegram_id(new_telegram_id)
+        existing_user = await self.bot.adb.get_user_by_telegram_id(new_telegram_id)
         if existing_user:
             await update.message.reply_text(
                 f"❌ Користувач з ID {new_telegram_id} вже існує в системі!\n"
@@ -308,7 +308,7 @@ class UserHandlers:
         new_telegram_id = temp_data['new_telegram_id']
         role = temp_data['role']
         
-        user_db_id = self.bot.db.add_user(
+        user_db_id = await self.bot.adb.add_user(
             telegram_id=new_telegram_id,
             username='',  # Буде оновлено при першому /start
             full_name=full_name,
@@ -318,7 +318,7 @@ class UserHandlers:
         
         if user_db_id:
             # Логування в аудит
-            self.bot.db.add_audit_log(
+            await self.bot.adb.add_audit_log(
                 user_telegram_id=user_id,
                 user_name=user_data.get('full_name', ''),
                 action_type='add_user',
@@ -367,7 +367,7 @@ class UserHandlers:
         query = update.callback_query
         await query.answer()
         
-        target_user = self.bot.db.get_user_by_telegram_id(target_telegram_id)
+        target_user = await self.bot.adb.get_user_by_telegram_id(target_telegram_id)
         
         if not target_user or not can_manage_role(user_role, target_user['role']):
             await query.answer("❌ Немає доступу", show_alert=True)
@@ -421,7 +421,7 @@ class UserHandlers:
         query = update.callback_query
         await query.answer()
         
-        target_user = self.bot.db.get_user_by_telegram_id(target_telegram_id)
+        target_user = await self.bot.adb.get_user_by_telegram_id(target_telegram_id)
         
         if not target_user or not can_manage_role(user_role, target_user['role']):
             await query.answer("❌ Немає доступу", show_alert=True)
@@ -430,11 +430,11 @@ class UserHandlers:
         old_role = target_user['role']
         
         # Оновлюємо роль
-        success = self.bot.db.update_user_role(target_telegram_id, new_role)
+        success = await self.bot.adb.update_user_role(target_telegram_id, new_role)
         
         if success:
             # Логування
-            self.bot.db.add_audit_log(
+            await self.bot.adb.add_audit_log(
                 user_telegram_id=user_data['telegram_id'],
                 user_name=user_data.get('full_name', ''),
                 action_type='role_change',
@@ -470,7 +470,7 @@ class UserHandlers:
         query = update.callback_query
         await query.answer()
         
-        target_user = self.bot.db.get_user_by_telegram_id(target_telegram_id)
+        target_user = await self.bot.adb.get_user_by_telegram_id(target_telegram_id)
         
         if not target_user or not can_manage_role(user_role, target_user['role']):
             await query.answer("❌ Немає доступу", show_alert=True)
@@ -499,17 +499,17 @@ class UserHandlers:
         query = update.callback_query
         await query.answer()
         
-        target_user = self.bot.db.get_user_by_telegram_id(target_telegram_id)
+        target_user = await self.bot.adb.get_user_by_telegram_id(target_telegram_id)
         
         if not target_user or not can_manage_role(user_role, target_user['role']):
             await query.answer("❌ Немає доступу", show_alert=True)
             return
         
-        success = self.bot.db.delete_user(target_telegram_id)
+        success = await self.bot.adb.delete_user(target_telegram_id)
         
         if success:
             # Логування
-            self.bot.db.add_audit_log(
+            await self.bot.adb.add_audit_log(
                 user_telegram_id=user_data['telegram_id'],
                 user_name=user_data.get('full_name', ''),
                 action_type='delete_user',
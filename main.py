@@ -4,8 +4,9 @@
 import logging
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters
 
-from config import BOT_TOKEN
+from config import BOT_TOKEN, MAX_CONCURRENT_UPDATES
 from bot import TangoBot
+from handlers.update_processor import PerUserUpdateProcessor
 
 # Налаштування логування
 logging.basicConfig(
@@ -61,7 +62,15 @@ def main():
     bot = TangoBot(BOT_TOKEN)
     
     # Створюємо application
-    application = Application.builder().token(BOT_TOKEN).post_init(TangoBot.on_startup).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        # Повільний обробник одного користувача не тримає кнопки інших
+        .concurrent_updates(PerUserUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .post_init(TangoBot.on_startup)
+        .post_shutdown(TangoBot.on_shutdown)
+        .build()
+    )
     
     # Зберігаємо application в bot для доступу до bot.get_me()
     bot.application = application
@@ -91,6 +100,9 @@ def main():
         application.run_polling()
     except KeyboardInterrupt:
         print("\n👋 Бот зупинено")
+    finally:
+        bot.adb.close()
+        bot.db.close()
 
 
 if __name__ == '__main__':
@@ -1,14 +1,20 @@
 # notification_service.py
 # Сервіс для відправки сповіщень користувачам та в канал
 
+import asyncio
 import logging
 from telegram import Bot
 from telegram.error import TelegramError
 from typing import List, Dict, Optional
-from config import NOTIFICATION_CHANNEL_ID, ROLES, ROLE_EMOJI
+from config import (
+    NOTIFICATION_CHANNEL_ID, NOTIFICATION_POLL_INTERVAL, NOTIFICATIONS, ROLES, ROLE_EMOJI
+)
 
 logger = logging.getLogger(__name__)
 
+# Ім'я consumer'а в change_journal
+CHANGES_CONSUMER = 'notifications'
+
 
 class NotificationService:
     """Сервіс для відправки сповіщень"""
@@ -16,25 +22,77 @@ class NotificationService:
     def __init__(self, bot: Bot, db):
         self.bot = bot
         self.db = db
+        self._changes_task: Optional[asyncio.Task] = None
+    
+    # ================================
+    # ЖУРНАЛ ЗМІН (change_journal)
+    # ================================
+    
+    async def start_change_listener(self):
+        """Запускає фонове читання журналу змін (лише якщо налаштовано канал)"""
+        if not NOTIFICATION_CHANNEL_ID:
+            return
+        self._changes_task = asyncio.create_task(self._changes_loop())
+        logger.info("NotificationService: читання журналу змін запущено")
+    
+    async def _changes_loop(self):
+        while True:
+            await asyncio.sleep(NOTIFICATION_POLL_INTERVAL)
+            try:
+                await self.process_changes()
+            except Exception as e:
+                logger.error(f"NotificationService process_changes: {e}")
+    
+    async def process_changes(self):
+        """
+        Надсилає сповіщення лише про рядки streamers, що змінились
+        після курсора 'notifications'
+        """
+        loop = asyncio.get_event_loop()
+        changes, cursor = await loop.run_in_executor(
+            None, self.db.get_changes, CHANGES_CONSUMER, ['streamers']
+        )
+        
+        for change in changes:
+            row = change['row']
+            if change['op'] == 'insert':
+                await self.notify_new_streamer(row, mentor_name=row.get('mentor_name'))
+            elif change['op'] == 'delete':
+                await self.notify_streamer_deleted(row, mentor_name=row.get('mentor_name'))
+            elif NOTIFICATIONS.get('streamer_reassigned'):
+                old_mentor = row.get('old', {}).get('mentor_name')
+                if old_mentor != row.get('mentor_name'):
+                    await self.notify_mentor_reassignment(
+                        row, old_mentor or 'не призначено',
+                        row.get('mentor_name') or 'не призначено'
+                    )
+        
+        if cursor:
+            await loop.run_in_executor(None, self.db.ack_changes, CHANGES_CONSUMER, cursor)
+    
+    # ================================
+    # СПОВІЩЕННЯ
+    # ================================
     
-    async def notify_new_streamer(self, streamer_data: Dict, added_by_name: str, 
+    async def notify_new_streamer(self, streamer_data: Dict, added_by_name: Optional[str] = None,
                                  mentor_name: Optional[str] = None):
         """
         Сповіщення про новий стрімер в канал
         streamer_data: {name, user_id, profile_url, platform, mentor_name}
-        added_by_name: ім'я того хто додав (може бути ментор або адмін)
+        added_by_name: ім'я того хто додав (може бути ментор або адмін);
+                       None — невідомо (сповіщення з журналу змін)
         mentor_name: ім'я призначеного ментора (якщо адмін призначив іншого)
         """
         if not NOTIFICATION_CHANNEL_ID:
             return
         
         # Хто додав
-        added_by_text = f"👤 Додав: {added_by_name}"
+        added_by_text = f"👤 Додав: {added_by_name}" if added_by_name else ""
         
         # Ментор
         if mentor_name:
             mentor_text = f"🎓 Ментор: {mentor_name}"
-            if mentor_name != added_by_name:
+            if added_by_name and mentor_name != added_by_name:
                 # Адмін додав і призначив ментора
                 mentor_text += f" (призначено {added_by_name})"
         else:
@@ -50,11 +108,13 @@ class NotificationService:
         if streamer_data.get('platform'):
             message += f"📱 Платформа: {streamer_data['platform']}\n"
         
-        message += f"\n{mentor_text}\n{added_by_text}"
+        message += f"\n{mentor_text}"
+        if added_by_text:
+            message += f"\n{added_by_text}"
         
         await self._send_to_channel(message)
     
-    async def notify_streamer_deleted(self, streamer_data: Dict, deleted_by_name: str,
+    async def notify_streamer_deleted(self, streamer_data: Dict, deleted_by_name: Optional[str] = None,
                                      mentor_name: Optional[str] = None):
         """
         Сповіщення про видалення стрімера
@@ -72,12 +132,13 @@ class NotificationService:
         if mentor_name:
             message += f"🎓 Ментор: {mentor_name}\n"
         
-        message += f"👤 Видалив: {deleted_by_name}"
+        if deleted_by_name:
+            message += f"👤 Видалив: {deleted_by_name}"
         
         await self._send_to_channel(message)
     
     async def notify_mentor_reassignment(self, streamer_data: Dict, old_mentor_name: str,
-                                        new_mentor_name: str, changed_by_name: str):
+                                        new_mentor_name: str, changed_by_name: Optional[str] = None):
         """
         Сповіщення про перепризначення ментора
         """
@@ -90,9 +151,10 @@ class NotificationService:
             f"🆔 ID: <code>{streamer_data['user_id']}</code>\n"
             f"🔗 Профіль: <a href=\"{streamer_data['profile_url']}\">переглянути</a>\n\n"
             f"Було: {old_mentor_name}\n"
-            f"Стало: {new_mentor_name}\n\n"
-            f"👤 Змінив: {changed_by_name}"
+            f"Стало: {new_mentor_name}"
         )
+        if changed_by_name:
+            message += f"\n\n👤 Змінив: {changed_by_name}"
         
         await self._send_to_channel(message)
     
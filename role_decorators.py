@@ -27,7 +27,7 @@ def check_role(allowed_roles):
             user_id = update.effective_user.id
             
             # Перевіряємо чи користувач є в базі
-            user = self.bot.db.get_user_by_telegram_id(user_id)
+            user = await self.bot.adb.get_user_by_telegram_id(user_id)
             
             if not user:
                 logger.warning(f"Unauthorized access attempt from user_id: {user_id}")
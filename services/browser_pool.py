@@ -0,0 +1,189 @@
+"""
+Пул прогрітих браузерів для selenium-пошуку дарувальників.
+
+Холодний старт Chrome і перехід на tango.me за visitor-cookie коштують
+секунди на кожен пошук. Пул тримає до BROWSER_POOL_SIZE headless-браузерів,
+що вже пройшли authenticate(), і видає їх пошукам по одному:
+
+- перед видачею — health check (браузер міг впасти, поки лежав у пулі);
+- після пошуку браузер перезапускається, якщо він старший за
+  BROWSER_MAX_AGE, відпрацював BROWSER_MAX_USES пошуків або його JS heap
+  більший за BROWSER_MAX_HEAP_MB;
+- кожен слот має власний профіль Chrome: один профіль не можна відкрити
+  двома браузерами одночасно.
+
+Методи блокуючі — викликаються з потоків (SearchJobRunner._executor).
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
+
+from config import (
+    BROWSER_HEADLESS,
+    BROWSER_MAX_AGE,
+    BROWSER_MAX_HEAP_MB,
+    BROWSER_MAX_USES,
+    BROWSER_POOL_SIZE,
+    BROWSER_PROFILE_DIR,
+)
+from services.gifter_search import GifterSearcher
+
+
+class PooledBrowser:
+    """GifterSearcher пулу + облік віку і кількості пошуків"""
+
+    def __init__(self, searcher: GifterSearcher, slot: int):
+        self.searcher = searcher
+        self.slot = slot
+        self.created_at = time.monotonic()
+        self.uses = 0
+
+
+class BrowserPool:
+    """Пул прогрітих, уже авторизованих браузерів з перезапуском за віком і пам'яттю"""
+
+    def __init__(
+        self, size: int = BROWSER_POOL_SIZE, max_age: float = BROWSER_MAX_AGE,
+        max_uses: int = BROWSER_MAX_USES, max_heap_mb: float = BROWSER_MAX_HEAP_MB,
+        factory: Optional[Callable[[int], GifterSearcher]] = None
+    ):
+        self.size = size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self._factory = factory or self._new_searcher
+        self._idle: List[PooledBrowser] = []        # LIFO: найсвіжіший — першим
+        self._free_slots = list(range(size))
+        self._lock = threading.Lock()
+        # Сигнал «з'явився вільний браузер або слот» для потоків у _checkout
+        self._released = threading.Condition(self._lock)
+        self._available = threading.BoundedSemaphore(size)
+        self._closed = False
+        self.started = 0
+        self.recycled = 0
+
+    @staticmethod
+    def _new_searcher(slot: int) -> GifterSearcher:
+        profile_dir = BROWSER_PROFILE_DIR if slot == 0 else f"{BROWSER_PROFILE_DIR}_{slot}"
+        return GifterSearcher(headless=BROWSER_HEADLESS, profile_dir=profile_dir)
+
+    # ── публічний інтерфейс ───────────────────────────────────────
+
+    def warm(self) -> None:
+        """Заздалегідь запускає й авторизує браузери до size, щоб перший пошук не чекав"""
+        # Вільні місця тримаються на весь прогрів: пошук не запустить зайвий браузер
+        permits = 0
+        while permits < self.size and self._available.acquire(blocking=False):
+            permits += 1
+        try:
+            for _ in range(permits):
+                slot = self._take_slot()
+                if slot is None:
+                    break   # усі слоти вже зайняті
+                self._checkin(self._spawn(slot), used=False)
+        except Exception as exc:
+            logging.error(f"BrowserPool: помилка прогріву: {exc}")
+        finally:
+            for _ in range(permits):
+                self._available.release()
+        logging.info(f"BrowserPool: прогріто браузерів — {len(self._idle)}")
+
+    @contextmanager
+    def searcher(self) -> Iterator[GifterSearcher]:
+        """Видає прогрітий GifterSearcher на час одного пошуку"""
+        self._available.acquire()
+        browser = None
+        try:
+            browser = self._checkout()
+            yield browser.searcher
+        finally:
+            if browser is not None:
+                self._checkin(browser)
+            self._available.release()
+
+    def close(self) -> None:
+        """Закриває браузери в пулі; ті, що зараз у пошуку, закриються при поверненні"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            self._discard(browser)
+        logging.info(
+            f"BrowserPool закрито: запущено браузерів {self.started}, закрито {self.recycled}"
+        )
+
+    # ── внутрішнє ─────────────────────────────────────────────────
+
+    def _checkout(self) -> PooledBrowser:
+        while True:
+            with self._released:
+                # Блокуємося, доки _checkin/_discard не повернуть браузер чи слот
+                while not self._idle and not self._free_slots:
+                    self._released.wait()
+                browser = self._idle.pop() if self._idle else None
+                slot = None if browser is not None else self._free_slots.pop(0)
+            if browser is None:
+                return self._spawn(slot)
+            if self._expired(browser) or not browser.searcher.is_healthy():
+                self._discard(browser)
+                continue
+            return browser
+
+    def _checkin(self, browser: PooledBrowser, used: bool = True) -> None:
+        if used:
+            browser.uses += 1
+        searcher = browser.searcher
+        keep = (
+            not self._expired(browser)
+            and searcher.is_healthy()
+            and searcher.js_heap_mb() <= self.max_heap_mb
+        )
+        with self._released:
+            if keep and not self._closed:
+                self._idle.append(browser)
+                self._released.notify()
+                return
+        self._discard(browser)
+
+    def _expired(self, browser: PooledBrowser) -> bool:
+        return (
+            time.monotonic() - browser.created_at > self.max_age
+            or browser.uses >= self.max_uses
+        )
+
+    def _take_slot(self) -> Optional[int]:
+        """Займає вільний слот (None — усі зайняті)"""
+        with self._lock:
+            return self._free_slots.pop(0) if self._free_slots else None
+
+    def _release_slot(self, slot: int) -> None:
+        with self._released:
+            self._free_slots.append(slot)
+            self._free_slots.sort()
+            self._released.notify()
+
+    def _spawn(self, slot: int) -> PooledBrowser:
+        """Новий браузер у зайнятому слоті; авторизація — одразу"""
+        try:
+            searcher = self._factory(slot)
+        except Exception:
+            self._release_slot(slot)
+            raise
+        browser = PooledBrowser(searcher, slot)
+        self.started += 1
+        if searcher.driver:
+            try:
+                searcher.authenticate()
+            except Exception as exc:
+                logging.error(f"BrowserPool: помилка авторизації браузера {slot}: {exc}")
+        return browser
+
+    def _discard(self, browser: PooledBrowser) -> None:
+        try:
+            browser.searcher.close()
+        except Exception as exc:
+            logging.error(f"BrowserPool: помилка закриття браузера {browser.slot}: {exc}")
+        self.recycled += 1
+        self._release_slot(browser.slot)
@@ -4,8 +4,9 @@
 import asyncio
 import calendar
 import logging
+import time
 from datetime import date
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
 import sys
 import os
@@ -13,17 +14,107 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
     DIAMONDS_MAX_RETRIES,
+    DIAMONDS_RATE_LIMIT,
     DIAMONDS_REQUEST_DELAY,
+    DIAMONDS_WORKERS,
+    DIAMONDS_WRITE_BATCH,
     OWNER_ID,
 )
 
 
+class TokenBucket:
+    """
+    Token-bucket обмежувач частоти: не більше `rate` запитів на секунду
+    з короткими сплесками до `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class DiamondsBatchWriter:
+    """
+    Накопичує результати оновлення діамантів і пише їх у БД пачками
+    по batch_size — одна транзакція на пачку замість коміту на стрімера.
+    Якщо задано run_id — ротація і чекпоінт пишуться в одній транзакції.
+    """
+
+    def __init__(self, db, batch_size: int = DIAMONDS_WRITE_BATCH, run_id: Optional[int] = None):
+        self.db = db
+        self.batch_size = batch_size
+        self.run_id = run_id
+        self._now: List[Tuple[str, int]] = []
+        self._rotations: List[Tuple[str, int, int, int]] = []
+        self._deleted: List[Tuple[str, int]] = []
+        self._errors: List[Tuple[str, str, str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._now) + len(self._rotations) + len(self._deleted) + len(self._errors)
+
+    async def add_now(self, user_id: str, diamonds: int) -> None:
+        self._now.append((user_id, diamonds))
+        await self._maybe_flush()
+
+    async def add_rotation(self, user_id: str, old_current: int, new_current: int, diff: int) -> None:
+        self._rotations.append((user_id, old_current, new_current, diff))
+        await self._maybe_flush()
+
+    async def add_deleted(self, user_id: str, old_current: int) -> None:
+        self._deleted.append((user_id, old_current))
+        await self._maybe_flush()
+
+    async def add_error(self, streamer_id: str, name: str, error_text: str, retries: int) -> None:
+        self._errors.append((streamer_id, name, error_text, retries))
+        await self._maybe_flush()
+
+    async def _maybe_flush(self) -> None:
+        if len(self) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Записує накопичене (у потоці executor, щоб не блокувати event loop)"""
+        if not len(self):
+            return
+        # Забираємо буфери до await — паралельні воркери пишуть вже в нові
+        now, self._now = self._now, []
+        rotations, self._rotations = self._rotations, []
+        deleted, self._deleted = self._deleted, []
+        errors, self._errors = self._errors, []
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._write, now, rotations, deleted, errors
+        )
+
+    def _write(self, now, rotations, deleted, errors) -> None:
+        self.db.bulk_update_diamonds_now(now)
+        self.db.bulk_monthly_rotate(rotations, deleted, run_id=self.run_id)
+        self.db.bulk_log_diamonds_errors(errors)
+
+
 class DiamondsService:
     """Отримання та оновлення кількості діамантів стрімерів"""
 
     def __init__(self, db, bot=None):
         self.db = db
         self.bot = bot
+        # Спільний для ручного і місячного оновлення — ліміт Tango один
+        self.rate_limiter = TokenBucket(DIAMONDS_RATE_LIMIT)
 
     # ================================================================
     # ОТРИМАННЯ ДІАМАНТІВ З API
@@ -32,17 +123,12 @@ class DiamondsService:
     async def fetch_diamonds(self, tango_user_id: str) -> Optional[int]:
         """
         Повертає кількість діамантів або None при помилці.
-        Використовує TangoAPIClient (той самий токен що й get_profile).
+        Використовує AsyncTangoAPIClient (той самий токен що й get_profile).
         """
-        loop = asyncio.get_event_loop()
-
         for attempt in range(1, DIAMONDS_MAX_RETRIES + 1):
+            await self.rate_limiter.acquire()
             try:
-                diamonds = await loop.run_in_executor(
-                    None,
-                    self.bot.api_client.get_diamonds,
-                    tango_user_id,
-                )
+                diamonds = await self.bot.async_api_client.get_diamonds(tango_user_id)
                 if diamonds is not None:
                     return diamonds
                 logging.warning(
@@ -57,6 +143,41 @@ class DiamondsService:
 
         return None
 
+    # ================================================================
+    # ПАРАЛЕЛЬНА ОБРОБКА
+    # ================================================================
+
+    async def _process_concurrently(
+        self,
+        streamers: List[Dict],
+        handle: Callable[[Dict], Awaitable[None]],
+        progress_callback=None,
+    ) -> None:
+        """
+        Обробляє стрімерів DIAMONDS_WORKERS воркерами паралельно.
+        Частоту запитів обмежує self.rate_limiter у fetch_diamonds.
+        progress_callback(done, total) — після кожного стрімера, done зростає монотонно.
+        """
+        total = len(streamers)
+        pending = iter(streamers)
+        done = 0
+        progress_lock = asyncio.Lock()
+
+        async def worker() -> None:
+            nonlocal done
+            for streamer in pending:
+                try:
+                    await handle(streamer)
+                except Exception as exc:
+                    logging.error(f"diamonds worker {streamer.get('user_id')}: {exc}")
+                async with progress_lock:
+                    done += 1
+                    if progress_callback:
+                        await progress_callback(done, total)
+
+        workers = min(DIAMONDS_WORKERS, total)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
     # ================================================================
     # МАСОВЕ ОНОВЛЕННЯ "ЗАРАЗ" (ручний запуск)
     # ================================================================
@@ -71,28 +192,30 @@ class DiamondsService:
         total = len(streamers)
         updated = 0
         errors = []
+        writer = DiamondsBatchWriter(self.db)
 
-        for idx, streamer in enumerate(streamers, 1):
+        async def handle(streamer: Dict) -> None:
+            nonlocal updated
             tango_id = streamer['user_id']
             name = streamer['name']
 
             diamonds = await self.fetch_diamonds(tango_id)
 
             if diamonds is not None:
-                self.db.update_streamer_diamonds_now(tango_id, diamonds)
+                await writer.add_now(tango_id, diamonds)
                 updated += 1
             else:
                 error_text = (
                     f"Не вдалося отримати дані після {DIAMONDS_MAX_RETRIES} спроб"
                 )
                 errors.append({'streamer_id': tango_id, 'name': name, 'error': error_text})
-                self.db.log_diamonds_error(tango_id, name, error_text, DIAMONDS_MAX_RETRIES)
+                await writer.add_error(tango_id, name, error_text, DIAMONDS_MAX_RETRIES)
                 logging.error(f"diamonds_now error: {name} ({tango_id}): {error_text}")
 
-            if progress_callback:
-                await progress_callback(idx, total)
-
-            await asyncio.sleep(DIAMONDS_REQUEST_DELAY)
+        try:
+            await self._process_concurrently(streamers, handle, progress_callback)
+        finally:
+            await writer.flush()
 
         if self.bot and hasattr(self.bot, 'sheets_service'):
             try:
@@ -112,21 +235,37 @@ class DiamondsService:
         - current_month → previous_month
         - отримує нові diamonds → current_month
         - diamonds_diff = current_month - previous_month
+
+        Прогрес зберігається в diamonds_monthly_run_items: якщо процес впав,
+        наступний запуск продовжує незавершений run і пропускає оброблених.
         """
         today_str = date.today().isoformat()
 
-        last_run = self.db.get_setting('last_monthly_diamonds_update')
-        if last_run == today_str:
-            logging.info("Місячне оновлення вже виконувалось сьогодні — пропускаємо")
-            return {'skipped': True}
+        run = self.db.get_active_monthly_run()
+        if run:
+            run_id = run['id']
+            streamers = self.db.get_pending_monthly_run_items(run_id)
+            logging.info(
+                f"Продовжуємо місячне оновлення #{run_id} від {run['run_date']}: "
+                f"залишилось {len(streamers)} з {run['total']}"
+            )
+        else:
+            last_run = self.db.get_setting('last_monthly_diamonds_update')
+            if last_run == today_str:
+                logging.info("Місячне оновлення вже виконувалось сьогодні — пропускаємо")
+                return {'skipped': True}
+
+            logging.info("Починаємо місячне оновлення діамантів...")
+            streamers = self.db.get_all_streamers_for_diamonds()
+            run_id = self.db.create_monthly_run(today_str, streamers)
+            if run_id is None:
+                logging.error("Не вдалося створити запуск місячного оновлення")
+                return {'skipped': True}
 
-        logging.info("Починаємо місячне оновлення діамантів...")
-        streamers = self.db.get_all_streamers_for_diamonds()
-        total = len(streamers)
-        updated = 0
         errors = []
+        writer = DiamondsBatchWriter(self.db, run_id=run_id)
 
-        for streamer in streamers:
+        async def handle(streamer: Dict) -> None:
             tango_id = streamer['user_id']
             name = streamer['name']
             current = streamer.get('diamonds_current_month') or 0
@@ -135,17 +274,31 @@ class DiamondsService:
 
             if diamonds is not None:
                 diff = diamonds - current
-                self.db.monthly_rotate_diamonds(tango_id, current, diamonds, diff)
-                updated += 1
+                await writer.add_rotation(tango_id, current, diamonds, diff)
             else:
                 error_text = f"Недоступний після {DIAMONDS_MAX_RETRIES} спроб"
                 errors.append({'streamer_id': tango_id, 'name': name, 'error': error_text})
-                self.db.monthly_rotate_diamonds_deleted(tango_id, current)
-                self.db.log_diamonds_error(tango_id, name, error_text, DIAMONDS_MAX_RETRIES)
+                await writer.add_deleted(tango_id, current)
+                await writer.add_error(tango_id, name, error_text, DIAMONDS_MAX_RETRIES)
                 logging.error(f"monthly_update error: {name} ({tango_id})")
 
-            await asyncio.sleep(DIAMONDS_REQUEST_DELAY)
+        try:
+            await self._process_concurrently(streamers, handle)
+        finally:
+            await writer.flush()
+
+        # Підсумок за весь run, включно з обробленими до рестарту
+        counts = self.db.get_monthly_run_counts(run_id)
+        total = sum(counts.values())
+        updated = counts['done']
+        if counts['pending']:
+            logging.error(
+                f"Місячне оновлення #{run_id}: {counts['pending']} стрімерів не оброблено — "
+                f"буде продовжено при наступному запуску"
+            )
+            return {'total': total, 'updated': updated, 'errors': errors, 'incomplete': True}
 
+        self.db.finish_monthly_run(run_id)
         self.db.set_setting('last_monthly_diamonds_update', today_str)
 
         if self.bot and hasattr(self.bot, 'sheets_service'):
@@ -198,8 +351,13 @@ class DiamondsService:
     async def check_missed_monthly_update(self) -> None:
         """
         Якщо бот не працював в останній день попереднього місяця —
-        виконує місячне оновлення зараз.
+        виконує місячне оновлення зараз. Незавершений run продовжується.
         """
+        if self.db.get_active_monthly_run():
+            logging.warning("Знайдено незавершене місячне оновлення — продовжуємо")
+            await self.run_monthly_update()
+            return
+
         today = date.today()
         last_run_str = self.db.get_setting('last_monthly_diamonds_update')
 
@@ -0,0 +1,220 @@
+"""
+Потоковий експорт даних у CSV / XLSX.
+
+Рядки читаються курсором пачками (DatabaseManager.iter_*), проходять через
+генератори і пишуться у SpooledTemporaryFile: до EXPORT_SPOOL_MAX_MEMORY —
+у пам'яті, далі — в анонімний тимчасовий файл, що зникає після close().
+"""
+import asyncio
+import csv
+import io
+import logging
+import zipfile
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import EXPORT_SPOOL_MAX_MEMORY, ROLES
+
+
+def _date(value) -> str:
+    return (value or '')[:10]
+
+
+def _full_name(row) -> str:
+    if row['full_name']:
+        return row['full_name']
+    return ' '.join(p for p in (row['first_name'], row['last_name']) if p)
+
+
+DONOR_KINDS = {'gifter': 'Пошук', 'personal': 'Особистий'}
+
+# data_type → (префікс файлу, заголовки, метод DatabaseManager, рядок → клітинки)
+EXPORTS: Dict[str, Tuple[str, List[str], str, Callable]] = {
+    'streamers': (
+        'streamers',
+        ['ID', "Ім'я", 'Telegram', 'Instagram', 'Платформа', 'Ментор', 'Діаманти', 'Дата створення'],
+        'iter_streamers_for_export',
+        lambda r: (
+            r['user_id'], r['name'], r['tg_name'] or '', r['instagram_url'] or '',
+            r['platform'] or '', r['mentor_name'] or '', r['diamonds_now'] or 0,
+            _date(r['created_at']),
+        ),
+    ),
+    'users': (
+        'users',
+        ['Telegram ID', 'Username', 'ПІБ', 'Роль', 'Дата створення'],
+        'iter_users_for_export',
+        lambda r: (
+            r['telegram_id'], r['username'] or '', _full_name(r),
+            ROLES.get(r['role'], r['role']), _date(r['created_at']),
+        ),
+    ),
+    'audit': (
+        'audit',
+        ['Дата', 'Користувач', 'Дія', "Об'єкт", 'Ціль'],
+        'iter_audit_logs',
+        lambda r: (
+            r['created_at'], r['user_name'] or '', r['action_type'],
+            r['target_type'] or '', r['target_name'] or '',
+        ),
+    ),
+    'donors': (
+        'donors',
+        ['Тип', 'Власник', "Ім'я даруваника", 'Tango ID', 'Дата'],
+        'iter_donors_for_export',
+        lambda r: (
+            DONOR_KINDS.get(r['kind'], r['kind']), r['owner'] or '',
+            r['donor_name'], r['tango_id'], _date(r['created_at']),
+        ),
+    ),
+}
+
+# format_type з callback_data → розширення файлу
+FORMATS = {'csv': 'csv', 'excel': 'xlsx', 'xlsx': 'xlsx'}
+
+
+# ── CSV ───────────────────────────────────────────────────────────
+
+def write_csv(out, headers: List[str], rows: Iterable[tuple]) -> int:
+    """Пише CSV (utf-8-sig для Excel) у бінарний out; повертає кількість рядків"""
+    text = io.TextIOWrapper(out, encoding='utf-8-sig', newline='')
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    text.flush()
+    text.detach()  # out лишається відкритим
+    return count
+
+
+# ── XLSX ──────────────────────────────────────────────────────────
+
+# Екранування XML одним str.translate; символи, заборонені в XML 1.0, відкидаються
+_XML_ESCAPE = {ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;'}
+_XML_ESCAPE.update({c: None for c in range(0x20) if c not in (0x09, 0x0a, 0x0d)})
+
+# Скільки рядків аркуша збирати перед одним записом у zip
+_XLSX_ROWS_PER_WRITE = 500
+
+_XLSX_STATIC = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = str(value).translate(_XML_ESCAPE)
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_sheet(headers: List[str], rows: Iterable[tuple], counter: List[int]) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<sheetData>'
+    )
+    buffer = ['<row r="1">' + ''.join(_xlsx_cell(h) for h in headers) + '</row>']
+    for number, row in enumerate(rows, 2):
+        buffer.append(f'<row r="{number}">' + ''.join(_xlsx_cell(v) for v in row) + '</row>')
+        counter[0] += 1
+        if len(buffer) >= _XLSX_ROWS_PER_WRITE:
+            yield ''.join(buffer)
+            buffer.clear()
+    buffer.append('</sheetData></worksheet>')
+    yield ''.join(buffer)
+
+
+def write_xlsx(out, headers: List[str], rows: Iterable[tuple]) -> int:
+    """
+    Мінімальний XLSX (один аркуш, inline-рядки) без сторонніх бібліотек:
+    аркуш пишеться у zip потоково, рядок за рядком
+    """
+    counter = [0]
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _XLSX_STATIC.items():
+            zf.writestr(name, content)
+        with zf.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            for chunk in _xlsx_sheet(headers, rows, counter):
+                sheet.write(chunk.encode('utf-8'))
+    return counter[0]
+
+
+WRITERS = {'csv': write_csv, 'xlsx': write_xlsx}
+
+
+class ExportService:
+    """Збирає експорт у тимчасовий spool поза event loop"""
+
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def supports(data_type: str, format_type: str) -> bool:
+        return data_type in EXPORTS and format_type in FORMATS
+
+    def build(self, data_type: str, format_type: str) -> Tuple[SpooledTemporaryFile, str, int]:
+        """
+        Синхронно пише експорт; повертає (spool на початку, ім'я файлу, рядків).
+        Spool закриває викликач — після close() на диску нічого не лишається.
+        """
+        prefix, headers, method, to_cells = EXPORTS[data_type]
+        extension = FORMATS[format_type]
+        rows = (to_cells(r) for r in getattr(self.db, method)())
+
+        spool = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_MEMORY)
+        try:
+            count = WRITERS[extension](spool, headers, rows)
+            spool.seek(0)
+        except Exception:
+            spool.close()
+            raise
+        filename = f"{prefix}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        logging.info(f"Експорт {filename}: {count} рядків")
+        return spool, filename, count
+
+    async def export(self, data_type: str, format_type: str) -> Tuple[SpooledTemporaryFile, str, int]:
+        """build() у пулі потоків, щоб великий експорт не блокував бота"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.build, data_type, format_type
+        )
@@ -1,19 +1,120 @@
 import sys
 import os
 import json
+import asyncio
 import datetime
 import logging
-from selenium import webdriver 
-from selenium.webdriver.chrome.service import Service
 from time import sleep
 from configparser import ConfigParser
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import BROWSER_PROFILE_DIR, GIFTER_SEARCH_CONCURRENCY
+from services.snapshot_cache import SnapshotCache
+
+# Категорія пошуку → тег feed API
+FEED_TAGS = {
+    "Popular": "popular",
+    "Nearby": "nearby",
+    "Following": "following",
+    "Recommended": "hottest",
+}
+
+# Спільний для всіх пошуків кеш feed/topGifters (обидва рушії, усі задачі SearchJobRunner)
+SEARCH_SNAPSHOTS = SnapshotCache()
+
+
+def build_gifter_record(num: int, user_item: Dict, user_type: str, streamer_id: str,
+                        streamer_name: str, stream_id: str, category: str) -> Dict[str, Any]:
+    """Запис про знайденого дарувальника (однаковий для обох рушіїв пошуку)"""
+    account = user_item['account']
+    return {
+        "num": num,
+        "ID стрімера": streamer_id,
+        "ID дарувальника": account['encryptedAccountId'],
+        "Ім'я дарувальника": account.get('firstName', '-'),
+        "Кількість монет": user_item.get('creditsInStream', 'Глядач'),
+        "Посилання дарувальника": f"https://tango.me/profile/{account['encryptedAccountId']}",
+        "Ім'я стрімера": streamer_name,
+        "Посилання на стрімера": f"https://tango.me/profile/{streamer_id}",
+        "Посилання на стрім": f"https://tango.me/stream/{stream_id}",
+        "VIP статус": account.get('vipConfigId', '-'),
+        "Гендер": account.get('gender', '-'),
+        "Підписка на стрімера": user_item.get('isSubscriber', '-'),
+        "Фан рівень": user_item.get('subscriptionLevel', '-'),
+        "Інкогніто": user_item.get('incognito', '-'),
+        "Тип": user_type,
+        "Категорія": category
+    }
+
+
+def save_search_results(results: Dict[str, Any], save_path: str = None) -> Optional[str]:
+    """Збереження результатів пошуку в JSON файл"""
+    try:
+        if save_path is None:
+            save_path = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                f'search_results_{results.get("search_time")}.json'
+            )
+        
+        with open(save_path, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4, ensure_ascii=False)
+        
+        return save_path
+        
+    except Exception as ex:
+        logging.error(f"Помилка збереження: {ex}")
+        return None
+
+
+def _match_stream(struct: Dict, wanted: set) -> List[tuple]:
+    """
+    Шукані акаунти в topGifters одного стріму: [(user_type, user_item)].
+    Кожен запис стріму перевіряється одним хеш-пошуком у wanted; дарувальник,
+    що також є глядачем, потрапляє один раз — як дарувальник. Прохід
+    зупиняється, щойно в стрімі знайдено всіх шуканих.
+    """
+    found = []
+    matched = set()
+    for user_type in ("gifters", "viewers"):
+        for user_item in struct.get(user_type) or []:
+            account_id = (user_item.get('account') or {}).get('encryptedAccountId')
+            if account_id in wanted and account_id not in matched:
+                matched.add(account_id)
+                found.append((user_type, user_item))
+                if len(matched) == len(wanted):
+                    return found
+    return found
+
+
+def _find_key(obj: Any, key: str) -> Any:
+    """Перше входження ключа у вкладеному JSON (порядок як у документі)"""
+    if isinstance(obj, dict):
+        if key in obj:
+            return obj[key]
+        values = obj.values()
+    elif isinstance(obj, list):
+        values = obj
+    else:
+        return None
+    for value in values:
+        found = _find_key(value, key)
+        if found is not None:
+            return found
+    return None
+
 
 class GifterSearcher:
-    def __init__(self, config_path: str = "example.ini"):
+    def __init__(self, config_path: str = "example.ini", headless: bool = False,
+                 profile_dir: str = BROWSER_PROFILE_DIR, cache: SnapshotCache = None):
         self.config_path = config_path
+        self.headless = headless
+        self.profile_dir = profile_dir
+        self.cache = cache or SEARCH_SNAPSHOTS
         self.driver = None
         self.duration = 0.5
+        self.authenticated = False
         self.data = []
         self.current_time = datetime.datetime.now()
         self.setup_driver()
@@ -59,13 +160,18 @@ class GifterSearcher:
             chrome_driver_path = os.path.join(executable_path, driver_path)
             self.duration = float(config.get("delay", "seconds"))
             
+            # selenium імпортується тут, а не на рівні модуля: API-рушію він не потрібен
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+            
             # Налаштування Chrome опцій
             options = webdriver.ChromeOptions()
             options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36')
-            options.add_argument('user-data-dir=C:\\Users\\Admin\\\\AppData\\Local\\Google\\Chrome\\User Data\\Default')
+            options.add_argument(f'user-data-dir={self.profile_dir}')
             options.add_argument('--disable-blink-features=AutomationControlled')
             options.add_argument('--ignore-certificate-errors')
-            # options.add_argument('--headless')  # Безголовий режим для бота
+            if self.headless:
+                options.add_argument('--headless=new')  # Безголовий режим (пул браузерів бота)
             
             s = Service(chrome_driver_path)
             self.driver = webdriver.Chrome(service=s, options=options)
@@ -75,7 +181,34 @@ class GifterSearcher:
             logging.error(f"Помилка налаштування драйвера: {ex}")
             return False
     
-    def search_gifters(self, gifter_ids: List[str], num_streamers: int = 50, categories: List[str] = None) -> Dict[str, Any]:
+    def authenticate(self):
+        """Відкриває tango.me, щоб браузер отримав visitor-cookie (один раз на браузер)"""
+        self.driver.get("https://tango.me/live/recommended")
+        sleep(self.duration * 2)
+        self.authenticated = True
+    
+    def is_healthy(self) -> bool:
+        """Браузер живий і відповідає на команди драйвера"""
+        if not self.driver:
+            return False
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+    
+    def js_heap_mb(self) -> float:
+        """Зайнятий JS heap поточної сторінки, МБ (0 — якщо Chrome не віддає метрику)"""
+        try:
+            used = self.driver.execute_script(
+                "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0.0
+    
+    def search_gifters(self, gifter_ids: List[str], num_streamers: int = 50, categories: List[str] = None,
+                       progress: Optional[Callable[[int, int], None]] = None,
+                       cancel_event=None) -> Dict[str, Any]:
         """
         Пошук дарувальників у стрімах
         
@@ -83,6 +216,9 @@ class GifterSearcher:
             gifter_ids: Список ID дарувальників для пошуку
             num_streamers: Кількість стрімерів для перевірки в кожній категорії
             categories: Список категорій для пошуку (за замовчуванням всі)
+            progress: progress(done, total) після кожного перевіреного стріму
+            cancel_event: threading.Event — якщо встановлено, пошук зупиняється
+                          і повертає вже знайдене з "cancelled": True
         
         Returns:
             Словник з результатами пошуку
@@ -97,8 +233,10 @@ class GifterSearcher:
         if categories is None:
             categories = list(self.link_list.keys())
         
-        # Очищуємо дані перед початком пошуку
+        # Очищуємо дані перед початком пошуку (браузер з пулу виконує багато пошуків)
         self.data = []
+        self.current_time = datetime.datetime.now()
+        wanted = set(gifter_ids)
         
         # Розрахунок кількості сторінок
         pages_count = num_streamers // 50 + (1 if num_streamers % 50 > 0 else 0)
@@ -112,10 +250,17 @@ class GifterSearcher:
             "error": None
         }
         
+        total = num_streamers * len([c for c in categories if c in self.link_list])
+        checked = 0
+        fetched = 0   # реальних запитів topGifters через браузер (без кешу)
+        
+        def cancelled() -> bool:
+            return cancel_event is not None and cancel_event.is_set()
+        
         try:
-            # Авторизація (перехід на головну сторінку)
-            self.driver.get("https://tango.me/live/recommended")
-            sleep(self.duration * 2)
+            # Авторизація (перехід на головну сторінку) — прогрітий браузер її пропускає
+            if not self.authenticated:
+                self.authenticate()
             
             num_streamer = 1
             num_gifter = 1
@@ -130,26 +275,34 @@ class GifterSearcher:
                 
                 # Пошук по сторінках
                 for page in range(pages_count):
+                    if cancelled():
+                        break
                     print(f"Сторінка: {page + 1}")
                     
-                    # Перехід на API endpoint
+                    # Перехід на API endpoint (свіжа сторінка — з кешу, без браузера)
                     api_url = link + str(page) + '&pageSize=50'
-                    self.driver.get(api_url)
-                    sleep(self.duration)
-                    
-                    page_source = self.driver.page_source
-                    
-                    try:
-                        # Парсинг JSON відповіді
-                        dataform = '{"stream":' + str(page_source).partition('"stream":')[2].partition(',"settings":')[0] + '}'
-                        struct_streamer_id = json.loads(dataform)
+                    cached = self.cache.get(api_url)
+                    if cached:
+                        struct_streamer_id, struct_streamer_name = cached
+                    else:
+                        self.driver.get(api_url)
+                        sleep(self.duration)
                         
-                        dataform_streamer = '{"stream":' + str(page_source).partition('"basicProfile":')[2].partition(',"liveStats":')[0] + '}'
-                        struct_streamer_name = json.loads(dataform_streamer)
+                        page_source = self.driver.page_source
                         
-                    except Exception as ex:
-                        logging.error(f"Помилка парсингу JSON: {ex}")
-                        continue
+                        try:
+                            # Парсинг JSON відповіді
+                            dataform = '{"stream":' + str(page_source).partition('"stream":')[2].partition(',"settings":')[0] + '}'
+                            struct_streamer_id = json.loads(dataform)
+                            
+                            dataform_streamer = '{"stream":' + str(page_source).partition('"basicProfile":')[2].partition(',"liveStats":')[0] + '}'
+                            struct_streamer_name = json.loads(dataform_streamer)
+                        
+                        except Exception as ex:
+                            logging.error(f"Помилка парсингу JSON: {ex}")
+                            continue
+                        
+                        self.cache.put(api_url, (struct_streamer_id, struct_streamer_name))
                     
                     # Отримання списків ID
                     stream_id_list = [stream_info['id'] for stream_info in struct_streamer_id['stream'].values()]
@@ -157,91 +310,73 @@ class GifterSearcher:
                     
                     # Перевірка кожного стрім
                     for stream_id, streamer_id in zip(stream_id_list, streamer_id_list):
-                        if num_streamer > num_streamers:
+                        if num_streamer > num_streamers or cancelled():
                             break
                         
-                        if num_streamer % 25 == 0:
-                            sleep(2)  # Пауза кожні 25 стрімерів
-                        
                         print(f"Стрімер {num_streamer} з {num_streamers}: Знайдено {len(self.data)}")
                         
                         # Отримання списку дарувальників та глядачів стріму
                         gifters_url = f"https://gateway.tango.me/proxycador/api/public/v1/live/stream/social/v1/{stream_id}/topGifters?pageCount=0&pageSize=100&enableViewers=true"
-                        self.driver.get(gifters_url)
-                        sleep(self.duration)
-                        
-                        page_source = self.driver.page_source
-                        
-                        try:
-                            # Очищення HTML та парсинг JSON
-                            clean_data = str(page_source).replace('<html><head><meta name="color-scheme" content="light dark"><meta charset="utf-8"></head><body><pre>', '').replace('</pre><div class="json-formatter-container"></div></body></html>', '').replace("\n'", "").replace("\n'", "")
-                            struct = json.loads(clean_data)
+                        struct = self.cache.get(gifters_url)
+                        if struct is None:
+                            fetched += 1
+                            if fetched % 25 == 0:
+                                sleep(2)  # Пауза кожні 25 запитів до Tango (знімки з кешу не гальмуємо)
+                            self.driver.get(gifters_url)
+                            sleep(self.duration)
                             
-                        except Exception as ex:
-                            logging.error(f"Помилка парсингу відповіді стріму: {ex}")
-                            num_streamer += 1
-                            continue
-                        
-                        # Отримання списків ID дарувальників та глядачів
-                        try:
-                            gifters_in_stream = [gifter["account"]["encryptedAccountId"] for gifter in struct.get("gifters", [])]
-                        except Exception:
-                            gifters_in_stream = []
-                        
-                        try:
-                            viewers_in_stream = [viewer["account"]["encryptedAccountId"] for viewer in struct.get("viewers", [])]
-                        except Exception:
-                            viewers_in_stream = []
+                            page_source = self.driver.page_source
+                            
+                            try:
+                                # Очищення HTML та парсинг JSON
+                                clean_data = str(page_source).replace('<html><head><meta name="color-scheme" content="light dark"><meta charset="utf-8"></head><body><pre>', '').replace('</pre><div class="json-formatter-container"></div></body></html>', '').replace("\n'", "").replace("\n'", "")
+                                struct = json.loads(clean_data)
+                            
+                            except Exception as ex:
+                                logging.error(f"Помилка парсингу відповіді стріму: {ex}")
+                                num_streamer += 1
+                                checked += 1
+                                if progress:
+                                    progress(checked, total)
+                                continue
+                            
+                            self.cache.put(gifters_url, struct)
                         
-                        # Перевірка наявності шуканих дарувальників
-                        for search_id in gifter_ids:
-                            if search_id in gifters_in_stream or search_id in viewers_in_stream:
-                                # Визначаємо тип (дарувальник чи глядач)
-                                user_type = "gifters" if search_id in gifters_in_stream else "viewers"
+                        # Шукані дарувальники/глядачі стріму (хеш-пошук, див. _match_stream)
+                        for user_type, user_item in _match_stream(struct, wanted):
+                            try:
+                                # Збір даних про знайденого дарувальника
+                                streamer_name = struct_streamer_name['stream'][streamer_id].get('firstName', '-')
+                                gifter_data = build_gifter_record(
+                                    num_gifter, user_item, user_type, streamer_id,
+                                    streamer_name, stream_id, category
+                                )
+                                
+                                self.data.append(gifter_data)
+                                num_gifter += 1
                                 
-                                # Знаходимо дані користувача
-                                user_list = struct.get(user_type, [])
-                                for user_item in user_list:
-                                    if user_item['account']['encryptedAccountId'] == search_id:
-                                        try:
-                                            # Збір даних про знайденого дарувальника
-                                            gifter_data = {
-                                                "num": num_gifter,
-                                                "ID стрімера": streamer_id,
-                                                "ID дарувальника": user_item['account']['encryptedAccountId'],
-                                                "Ім'я дарувальника": user_item['account'].get('firstName', '-'),
-                                                "Кількість монет": user_item.get('creditsInStream', 'Глядач'),
-                                                "Посилання дарувальника": f"https://tango.me/profile/{user_item['account']['encryptedAccountId']}",
-                                                "Ім'я стрімера": struct_streamer_name['stream'][streamer_id].get('firstName', '-'),
-                                                "Посилання на стрімера": f"https://tango.me/profile/{streamer_id}",
-                                                "Посилання на стрім": f"https://tango.me/stream/{stream_id}",
-                                                "VIP статус": user_item['account'].get('vipConfigId', '-'),
-                                                "Гендер": user_item['account'].get('gender', '-'),
-                                                "Підписка на стрімера": user_item.get('isSubscriber', '-'),
-                                                "Фан рівень": user_item.get('subscriptionLevel', '-'),
-                                                "Інкогніто": user_item.get('incognito', '-'),
-                                                "Тип": user_type,
-                                                "Категорія": category
-                                            }
-                                            
-                                            self.data.append(gifter_data)
-                                            num_gifter += 1
-                                            
-                                            print(f"Знайдено: {gifter_data['Ім`я дарувальника']} -> {gifter_data['Ім`я стрімера']}")
-                                            
-                                        except Exception as ex:
-                                            logging.error(f"Помилка збору даних: {ex}")
-                                            continue
+                                print(f"Знайдено: {user_item['account'].get('firstName', '-')} -> {streamer_name}")
+                                
+                            except Exception as ex:
+                                logging.error(f"Помилка збору даних: {ex}")
+                                continue
                         
                         num_streamer += 1
                         results["searched_streamers"] = num_streamer - 1
+                        checked += 1
+                        if progress:
+                            progress(checked, total)
                 
                 # Скидаємо лічильник стрімерів для наступної категорії
                 num_streamer = 1
+                if cancelled():
+                    break
             
             # Підготовка результатів
             results["found_gifters"] = self.data
             results["total_found"] = len(self.data)
+            results["cancelled"] = cancelled()
+            logging.info(f"Кеш знімків пошуку: {self.cache.stats()}")
             
             return results
             
@@ -252,19 +387,10 @@ class GifterSearcher:
     
     def save_results(self, results: Dict[str, Any], save_path: str = None) -> str:
         """Збереження результатів пошуку в JSON файл"""
-        try:
-            if save_path is None:
-                executable_path = self.get_executable_path()
-                save_path = os.path.join(executable_path, f'search_results_{self.current_time.strftime("%d.%m.%Y_%H.%M")}.json')
-            
-            with open(save_path, 'w', encoding='utf-8') as file:
-                json.dump(results, file, indent=4, ensure_ascii=False)
-            
-            return save_path
-            
-        except Exception as ex:
-            logging.error(f"Помилка збереження: {ex}")
-            return None
+        if save_path is None:
+            executable_path = self.get_executable_path()
+            save_path = os.path.join(executable_path, f'search_results_{self.current_time.strftime("%d.%m.%Y_%H.%M")}.json')
+        return save_search_results(results, save_path)
     
     def close(self):
         """Закриття браузера"""
@@ -275,4 +401,135 @@ class GifterSearcher:
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
\ No newline at end of file
+        self.close()
+
+
+class ApiGifterSearcher:
+    """
+    Пошук дарувальників без браузера: ті самі feed і topGifters endpoints
+    напряму через AsyncTangoAPIClient (visitor token), JSON розбирається
+    нативно, стріми перевіряються паралельно.
+    Формат результату такий самий, як у GifterSearcher.search_gifters.
+    Сторінки feed і topGifters беруться зі спільного кешу SEARCH_SNAPSHOTS.
+    """
+    
+    def __init__(self, api_client, concurrency: int = GIFTER_SEARCH_CONCURRENCY,
+                 cache: SnapshotCache = None):
+        self.api_client = api_client
+        self.concurrency = concurrency
+        self.cache = cache or SEARCH_SNAPSHOTS
+        self.current_time = datetime.datetime.now()
+    
+    async def _fetch_streams(self, tag: str, num_streamers: int) -> List[tuple]:
+        """Перші num_streamers стрімів категорії: [(stream_id, streamer_id, streamer_name)]"""
+        pages_count = num_streamers // 50 + (1 if num_streamers % 50 > 0 else 0)
+        pages = await asyncio.gather(
+            *(self._get_feed_page(tag, page) for page in range(pages_count)),
+            return_exceptions=True
+        )
+        
+        streams = []
+        for page in pages:
+            if isinstance(page, Exception) or not page:
+                logging.error(f"Помилка завантаження feed '{tag}': {page}")
+                continue
+            stream_map = _find_key(page, 'stream') or {}
+            profiles = _find_key(page, 'basicProfile') or {}
+            for stream_info in stream_map.values():
+                streamer_id = stream_info.get('broadcasterId')
+                streamer_name = (profiles.get(streamer_id) or {}).get('firstName', '-')
+                streams.append((stream_info.get('id'), streamer_id, streamer_name))
+        
+        return streams[:num_streamers]
+    
+    def _get_feed_page(self, tag: str, page: int):
+        return self.cache.get_or_fetch(
+            ('feed', tag, page), lambda: self.api_client.get_live_feed(tag, page)
+        )
+    
+    def _get_top_gifters(self, stream_id: str):
+        return self.cache.get_or_fetch(
+            ('topGifters', stream_id), lambda: self.api_client.get_top_gifters(stream_id)
+        )
+    
+    async def search_gifters(self, gifter_ids: List[str], num_streamers: int = 50,
+                             categories: List[str] = None,
+                             progress: Optional[Callable[[int, int], None]] = None,
+                             cancel_event=None) -> Dict[str, Any]:
+        """Пошук дарувальників у стрімах (аргументи як у GifterSearcher.search_gifters)"""
+        if not gifter_ids:
+            return {"error": "Список ID дарувальників порожній"}
+        
+        if categories is None:
+            categories = list(FEED_TAGS.keys())
+        
+        wanted = set(gifter_ids)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        data = []
+        total = num_streamers * len([c for c in categories if c in FEED_TAGS])
+        checked = 0
+        
+        def cancelled() -> bool:
+            return cancel_event is not None and cancel_event.is_set()
+        
+        results = {
+            "found_gifters": [],
+            "total_found": 0,
+            "searched_streamers": 0,
+            "categories_searched": categories,
+            "search_time": self.current_time.strftime("%d.%m.%Y_%H.%M"),
+            "error": None
+        }
+        
+        async def fetch_top_gifters(stream_id: str) -> Optional[Dict]:
+            nonlocal checked
+            async with semaphore:
+                if cancelled():
+                    return None
+                try:
+                    return await self._get_top_gifters(stream_id)
+                except Exception as ex:
+                    logging.error(f"Помилка topGifters {stream_id}: {ex}")
+                    return None
+                finally:
+                    checked += 1
+                    if progress:
+                        progress(checked, total)
+        
+        try:
+            for category in categories:
+                if category not in FEED_TAGS:
+                    continue
+                if cancelled():
+                    break
+                
+                streams = await self._fetch_streams(FEED_TAGS[category], num_streamers)
+                structs = await asyncio.gather(
+                    *(fetch_top_gifters(stream_id) for stream_id, _, _ in streams)
+                )
+                
+                for (stream_id, streamer_id, streamer_name), struct in zip(streams, structs):
+                    results["searched_streamers"] += 1
+                    if not struct:
+                        continue
+                    
+                    for user_type, user_item in _match_stream(struct, wanted):
+                        data.append(build_gifter_record(
+                            len(data) + 1, user_item, user_type, streamer_id,
+                            streamer_name, stream_id, category
+                        ))
+            
+            results["found_gifters"] = data
+            results["total_found"] = len(data)
+            results["cancelled"] = cancelled()
+            logging.info(f"Кеш знімків пошуку: {self.cache.stats()}")
+            return results
+            
+        except Exception as ex:
+            logging.error(f"Помилка пошуку: {ex}")
+            results["error"] = str(ex)
+            return results
+    
+    def save_results(self, results: Dict[str, Any], save_path: str = None) -> Optional[str]:
+        """Збереження результатів пошуку в JSON файл"""
+        return save_search_results(results, save_path)
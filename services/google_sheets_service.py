@@ -3,11 +3,10 @@
 """
 import asyncio
 import logging
+import threading
+import time
 from datetime import datetime
-from typing import Optional
-
-import gspread
-from google.oauth2.service_account import Credentials
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
 from config import (
     GOOGLE_CREDENTIALS_PATH,
@@ -18,9 +17,15 @@ from config import (
     SHEET_GIFTERS,
     SHEET_MENTORS,
     SHEET_STREAMERS,
+    SHEETS_FULL_RESYNC_INTERVAL,
     SHEETS_SYNC_INTERVAL,
+    SHEETS_SYNC_MODE,
 )
 
+# gspread і google-auth важкі — імпортуються при першому зверненні до Sheets
+if TYPE_CHECKING:
+    import gspread
+
 SCOPES = [
     "https://spreadsheets.google.com/feeds",
     "https://www.googleapis.com/auth/drive",
@@ -44,6 +49,18 @@ HEADERS_ERRORS = [
     "Дата", "Стрімер ID", "Ім'я стрімера", "Помилка", "Спроби",
 ]
 
+# Ім'я consumer'а в change_journal і розмір сторінки читання
+CHANGES_CONSUMER = 'sheets'
+CHANGES_BATCH = 1000
+
+# Таблиця БД → аркуші, які залежать від її рядків
+SHEETS_BY_TABLE = {
+    'streamers':       {'streamers'},
+    'mentors':         {'mentors'},
+    'gifters':         {'gifters'},
+    'diamonds_errors': {'errors'},
+}
+
 
 class GoogleSheetsService:
     """Batch-синхронізація бази даних з Google Sheets"""
@@ -51,30 +68,41 @@ class GoogleSheetsService:
     def __init__(self, db, bot=None):
         self.db = db
         self.bot = bot
-        self._client: Optional[gspread.Client] = None
-        self._spreadsheet: Optional[gspread.Spreadsheet] = None
+        self._client: Optional['gspread.Client'] = None
+        self._spreadsheet: Optional['gspread.Spreadsheet'] = None
         self._pending_sync: set = set()   # {'streamers', 'mentors', 'gifters', 'errors'}
+        self._failed_sheets: set = set()  # аркуші, остання синхронізація яких впала
         self._sync_task: Optional[asyncio.Task] = None
+        # Знімок вмісту аркушів для інкрементальної синхронізації:
+        # {title: {'slots': [key, ...], 'rows': {key: tuple}, 'full_at': float}}
+        # slots[i] — ключ рядка, що лежить у рядку i + 2 аркуша (1 — заголовки)
+        self._snapshots: Dict[str, Dict] = {}
+        self._write_lock = threading.Lock()
 
     # ================================================================
     # ІНІЦІАЛІЗАЦІЯ
     # ================================================================
 
-    def _get_client(self) -> gspread.Client:
+    def _get_client(self) -> 'gspread.Client':
         if self._client is None:
+            import gspread
+            from google.oauth2.service_account import Credentials
+
             creds = Credentials.from_service_account_file(
                 GOOGLE_CREDENTIALS_PATH, scopes=SCOPES
             )
             self._client = gspread.authorize(creds)
         return self._client
 
-    def _get_spreadsheet(self) -> gspread.Spreadsheet:
+    def _get_spreadsheet(self) -> 'gspread.Spreadsheet':
         if self._spreadsheet is None:
             self._spreadsheet = self._get_client().open_by_key(GOOGLE_SHEET_ID)
         return self._spreadsheet
 
-    def _get_or_create_worksheet(self, title: str, headers: list) -> gspread.Worksheet:
+    def _get_or_create_worksheet(self, title: str, headers: list) -> 'gspread.Worksheet':
         """Отримує аркуш або створює його з заголовками"""
+        import gspread
+
         ss = self._get_spreadsheet()
         try:
             ws = ss.worksheet(title)
@@ -110,13 +138,60 @@ class GoogleSheetsService:
     async def _sync_loop(self) -> None:
         while True:
             await asyncio.sleep(SHEETS_SYNC_INTERVAL)
-            if not self._pending_sync:
-                continue
-            sheets_to_sync = self._pending_sync.copy()
-            self._pending_sync.clear()
-            await self._process_sync(sheets_to_sync)
+            try:
+                cursor = await self._collect_changes()
+            except Exception as exc:
+                logging.error(f"Sheets: читання журналу змін: {exc}")
+                cursor = None
+            failed = set()
+            if self._pending_sync:
+                sheets_to_sync = self._pending_sync.copy()
+                self._pending_sync.clear()
+                failed = await self._process_sync(sheets_to_sync)
+                # Невдалі аркуші — на повтор у наступному циклі
+                self._pending_sync.update(failed)
+            # Курсор зсувається лише коли всі зміни реально записані в аркуші,
+            # інакше після рестарту бота вони б загубились
+            if cursor and not failed:
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self._ack_changes, cursor
+                )
 
-    async def _process_sync(self, sheets: set) -> None:
+    async def _collect_changes(self) -> int:
+        """
+        Читає change_journal після курсора 'sheets' і ставить у чергу
+        аркуші, рядки яких змінились. Повертає курсор для ack.
+        """
+        loop = asyncio.get_event_loop()
+        cursor = None
+        while True:
+            changes, cursor = await loop.run_in_executor(
+                None, self.db.get_changes,
+                CHANGES_CONSUMER, list(SHEETS_BY_TABLE), CHANGES_BATCH, cursor
+            )
+            for change in changes:
+                self._pending_sync.update(self._sheets_for_change(change))
+            if len(changes) < CHANGES_BATCH:   # неповна сторінка — журнал вичитано
+                return cursor
+
+    @staticmethod
+    def _sheets_for_change(change: dict) -> set:
+        sheets = set(SHEETS_BY_TABLE.get(change['table_name'], ()))
+        if change['table_name'] == 'streamers':
+            # К-ть стрімерів у аркуші менторів змінюється лише при
+            # додаванні/видаленні або зміні ментора
+            row = change['row']
+            if change['op'] != 'update' or row.get('mentor_name') != row.get('old', {}).get('mentor_name'):
+                sheets.add('mentors')
+        return sheets
+
+    def _ack_changes(self, cursor: int) -> None:
+        self.db.ack_changes(CHANGES_CONSUMER, cursor)
+        self.db.prune_change_journal()
+
+    async def _process_sync(self, sheets: set) -> set:
+        """Синхронізує аркуші; повертає ті, що не вдалось синхронізувати"""
+        failed = set()
         for sheet in sheets:
             try:
                 if sheet == 'streamers':
@@ -137,7 +212,12 @@ class GoogleSheetsService:
                     )
             except Exception as exc:
                 logging.error(f"Sheets sync '{sheet}' failed: {exc}")
-                await self._notify_admins_error(sheet, str(exc))
+                failed.add(sheet)
+                # Адмінів сповіщаємо один раз, а не на кожному повторі
+                if sheet not in self._failed_sheets:
+                    await self._notify_admins_error(sheet, str(exc))
+        self._failed_sheets = (self._failed_sheets - sheets) | failed
+        return failed
 
     # ================================================================
     # ПРЯМИЙ ВИКЛИК (для diamonds_service після оновлення)
@@ -198,8 +278,7 @@ class GoogleSheetsService:
                 created_str,
             ])
 
-        ws.clear()
-        ws.update(rows, value_input_option='RAW')
+        self._write_rows(ws, rows, key=lambda r: r[0])
         logging.info(f"Sheets: синхронізовано {len(streamers)} стрімерів")
 
     def _sync_mentors_sync(self) -> None:
@@ -231,33 +310,27 @@ class GoogleSheetsService:
                 created_str,
             ])
 
-        ws.clear()
-        ws.update(rows, value_input_option='RAW')
+        self._write_rows(ws, rows, key=lambda r: r[0])
         logging.info(f"Sheets: синхронізовано {len(mentors)} менторів")
 
     def _sync_gifters_sync(self) -> None:
         ws = self._get_or_create_worksheet(SHEET_GIFTERS, HEADERS_GIFTERS)
-        gifters = self.db.get_all_gifters()
+        # Ім'я власника приходить з JOIN — без запиту на кожен рядок
+        gifters = self.db.get_all_gifters_with_owners()
 
         rows = [HEADERS_GIFTERS]
         for g in gifters:
-            name, uid, profile_url, owner_id, created_at, *_ = g
-            # Отримуємо ім'я власника
-            owner_user = self.db.get_bot_user_by_telegram_id(owner_id)
-            owner_name = ''
-            if owner_user:
-                owner_name = (
-                    owner_user.get('first_name') or owner_user.get('username') or str(owner_id)
-                )
+            created_at = g['created_at']
             try:
                 created_str = datetime.fromisoformat(created_at).strftime('%d.%m.%Y')
             except Exception:
                 created_str = created_at or ''
 
-            rows.append([str(uid), name, profile_url, owner_name, created_str])
+            rows.append([
+                str(g['user_id']), g['name'], g['profile_url'], g['owner_name'], created_str,
+            ])
 
-        ws.clear()
-        ws.update(rows, value_input_option='RAW')
+        self._write_rows(ws, rows)
         logging.info(f"Sheets: синхронізовано {len(gifters)} дарувальників")
 
     def _sync_errors_sync(self) -> None:
@@ -274,10 +347,158 @@ class GoogleSheetsService:
                 str(e.get('retries', 0)),
             ])
 
-        ws.clear()
-        ws.update(rows, value_input_option='RAW')
+        self._write_rows(ws, rows)
         logging.info(f"Sheets: синхронізовано {len(errors)} помилок")
 
+    # ================================================================
+    # ЗАПИС В АРКУШ: ІНКРЕМЕНТАЛЬНИЙ АБО ПОВНИЙ
+    # ================================================================
+
+    @staticmethod
+    def _normalize_row(row, width: int) -> tuple:
+        """Рядок у тому вигляді, в якому його повертає Sheets: str, без None, фіксована ширина"""
+        values = ['' if v is None else str(v) for v in list(row)[:width]]
+        values += [''] * (width - len(values))
+        return tuple(values)
+
+    @staticmethod
+    def _coalesce(indexes: List[int]) -> List[tuple]:
+        """[1, 2, 3, 7, 8] → [(1, 3), (7, 8)] — суцільні діапазони для batch_update"""
+        ranges = []
+        for i in indexes:
+            if ranges and ranges[-1][1] == i - 1:
+                ranges[-1] = (ranges[-1][0], i)
+            else:
+                ranges.append((i, i))
+        return ranges
+
+    def _write_rows(self, ws, rows: list, key: Optional[Callable] = None) -> None:
+        """
+        rows[0] — заголовки, далі дані в порядку БД.
+        key(row) — стабільний ідентифікатор рядка (за замовчуванням — весь рядок).
+        """
+        headers = self._normalize_row(rows[0], len(rows[0]))
+        data = [self._normalize_row(r, len(headers)) for r in rows[1:]]
+        key = key or (lambda r: r)
+
+        with self._write_lock:
+            try:
+                if SHEETS_SYNC_MODE == 'incremental' and self._write_incremental(
+                    ws, headers, data, key
+                ):
+                    return
+                self._write_full(ws, headers, data, key)
+            except Exception:
+                # Стан аркуша невідомий — наступна синхронізація перечитає його
+                self._snapshots.pop(ws.title, None)
+                raise
+
+    def _write_full(self, ws, headers: tuple, data: List[tuple], key: Callable) -> None:
+        ws.clear()
+        ws.update([list(headers)] + [list(r) for r in data], value_input_option='RAW')
+
+        rows_by_key = {key(r): r for r in data}
+        if len(rows_by_key) == len(data):
+            self._snapshots[ws.title] = {
+                'slots': [key(r) for r in data],
+                'rows': rows_by_key,
+                'full_at': time.monotonic(),
+            }
+        else:
+            self._snapshots.pop(ws.title, None)
+
+    def _load_snapshot(self, ws, headers: tuple, key: Callable) -> Optional[Dict]:
+        """Знімок з поточного вмісту аркуша — одне читання після рестарту замість перезапису"""
+        values = ws.get_all_values()
+        if not values or self._normalize_row(values[0], len(headers)) != headers:
+            return None
+
+        data = [self._normalize_row(r, len(headers)) for r in values[1:]]
+        if any(not any(r) for r in data):
+            return None   # порожні рядки всередині — простіше перезаписати
+        rows_by_key = {key(r): r for r in data}
+        if len(rows_by_key) != len(data):
+            return None
+
+        return {
+            'slots': [key(r) for r in data],
+            'rows': rows_by_key,
+            'full_at': time.monotonic(),
+        }
+
+    def _write_incremental(self, ws, headers: tuple, data: List[tuple], key: Callable) -> bool:
+        """
+        Надсилає лише різницю між знімком і БД: змінені рядки оновлюються на місці,
+        нові дописуються в кінець, на місце видаленого переноситься останній рядок.
+        Повертає False, якщо потрібен повний перезапис.
+        """
+        from gspread.utils import rowcol_to_a1
+
+        new_rows = {key(r): r for r in data}
+        if len(new_rows) != len(data):
+            return False   # неунікальні ключі — диф неоднозначний
+
+        snapshot = self._snapshots.get(ws.title)
+        if snapshot is None:
+            snapshot = self._load_snapshot(ws, headers, key)
+            if snapshot is None:
+                return False
+        if time.monotonic() - snapshot['full_at'] > SHEETS_FULL_RESYNC_INTERVAL:
+            return False   # періодично відновлюємо порядок рядків як у БД
+
+        slots = list(snapshot['slots'])
+        old_rows = snapshot['rows']
+        old_count = len(slots)
+        pos = {k: i for i, k in enumerate(slots)}
+        dirty = set()
+
+        for k in [k for k in slots if k not in new_rows]:
+            i = pos.pop(k)
+            last = slots.pop()
+            if last != k:
+                slots[i] = last
+                pos[last] = i
+                dirty.add(i)
+
+        for k, i in pos.items():
+            if old_rows.get(k) != new_rows[k]:
+                dirty.add(i)
+
+        for k in new_rows:
+            if k not in pos:
+                pos[k] = len(slots)
+                slots.append(k)
+                dirty.add(pos[k])
+
+        new_count = len(slots)
+        width = len(headers)
+
+        if new_count + 1 > ws.row_count:
+            ws.add_rows(new_count + 1 - ws.row_count)
+
+        updates = [
+            {
+                'range': f"{rowcol_to_a1(start + 2, 1)}:{rowcol_to_a1(end + 2, width)}",
+                'values': [list(new_rows[slots[i]]) for i in range(start, end + 1)],
+            }
+            for start, end in self._coalesce(sorted(i for i in dirty if i < new_count))
+        ]
+        if updates:
+            ws.batch_update(updates, value_input_option='RAW')
+        if new_count < old_count:
+            ws.batch_clear([
+                f"{rowcol_to_a1(new_count + 2, 1)}:{rowcol_to_a1(old_count + 1, width)}"
+            ])
+
+        snapshot['slots'] = slots
+        snapshot['rows'] = new_rows
+        self._snapshots[ws.title] = snapshot
+        logging.debug(
+            f"Sheets '{ws.title}': змінено {len(dirty)} рядків, "
+            f"очищено {max(0, old_count - new_count)}"
+        )
+        return True
+
     # ================================================================
     # СПОВІЩЕННЯ ПРО ПОМИЛКУ СИНХРОНІЗАЦІЇ
     # ================================================================
@@ -0,0 +1,268 @@
+"""
+Фонові задачі пошуку дарувальників.
+
+Callback лише ставить задачу в чергу — пошук іде поза обробкою апдейтів:
+selenium-рушій у власному пулі потоків, API-рушій корутиною в event loop.
+Воркери беруть задачі по колу між користувачами, тож довгий пошук одного
+користувача не тримає чергу інших. Стан задач — у таблиці search_jobs:
+після рестарту незавершені задачі ставляться в чергу знову.
+"""
+import asyncio
+import contextlib
+import logging
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import (
+    BROWSER_POOL_SIZE,
+    GIFTER_SEARCH_ENGINE,
+    SEARCH_JOBS_MAX_CONCURRENT,
+    SEARCH_JOBS_PER_USER,
+    SEARCH_PROGRESS_INTERVAL,
+)
+from services.browser_pool import BrowserPool
+from services.gifter_search import ApiGifterSearcher, save_search_results
+
+# Параметри пошуку, однакові для всіх задач
+SEARCH_PARAMS = dict(num_streamers=100, categories=["Popular", "Recommended"])
+
+
+class SearchJob:
+    """Задача пошуку; done/total оновлює рушій (зокрема з потоку selenium)"""
+
+    def __init__(self, job_id: int, user_id: int, chat_id: int, message_id: int,
+                 gifter_ids: List[str], engine: str = GIFTER_SEARCH_ENGINE):
+        self.id = job_id
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.gifter_ids = gifter_ids
+        self.engine = engine
+        self.status = 'queued'   # queued → running → done / failed / cancelled
+        self.done = 0
+        self.total = 0
+        self.result_path: Optional[str] = None
+        self.cancel_event = threading.Event()
+
+    def report(self, done: int, total: int) -> None:
+        """progress-колбек для search_gifters"""
+        self.done, self.total = done, total
+
+
+class SearchJobRunner:
+    """Черга пошуків: справедлива між користувачами, з лімітом на користувача"""
+
+    def __init__(self, bot, max_concurrent: int = SEARCH_JOBS_MAX_CONCURRENT,
+                 per_user: int = SEARCH_JOBS_PER_USER):
+        self.bot = bot
+        self.max_concurrent = max_concurrent
+        self.per_user = per_user
+        self._jobs: Dict[int, SearchJob] = {}   # активні: у черзі + виконуються
+        # user_id → його задачі в черзі; порядок ключів — черговість обслуговування
+        self._queues: 'OrderedDict[int, deque]' = OrderedDict()
+        self._available: Optional[asyncio.Semaphore] = None   # задач у черзі
+        self._workers: List[asyncio.Task] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.browser_pool: Optional[BrowserPool] = None   # лише для selenium-рушія
+
+    # ── життєвий цикл ─────────────────────────────────────────────
+
+    async def start(self) -> None:
+        self._available = asyncio.Semaphore(0)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrent)
+        ]
+
+        # Браузери прогріваються у фоні — старт бота їх не чекає
+        if GIFTER_SEARCH_ENGINE == 'selenium':
+            asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), self._get_browser_pool().warm
+            )
+
+        # Задачі, перервані зупинкою бота, виконуються заново
+        for row in await self.bot.adb.get_unfinished_search_jobs():
+            job = SearchJob(
+                row['id'], row['user_telegram_id'], row['chat_id'],
+                row['message_id'], row['gifter_ids'], row['engine']
+            )
+            await self.bot.adb.update_search_job(job.id, status='queued', done=0)
+            self._enqueue(job)
+            await self.bot.search_handlers.show_job_progress(job)
+
+        logging.info(f"SearchJobRunner запущено (відновлено задач: {len(self._jobs)})")
+
+    async def stop(self) -> None:
+        """
+        Зупиняє воркери; пошуки в потоках зупиняються на найближчій перевірці.
+        Статус у БД лишається queued/running — start() відновить задачі.
+        """
+        for job in self._jobs.values():
+            job.cancel_event.set()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self.browser_pool is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.browser_pool.close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    # ── публічний інтерфейс ───────────────────────────────────────
+
+    def active_count(self, user_id: int) -> int:
+        return sum(1 for job in self._jobs.values() if job.user_id == user_id)
+
+    def can_submit(self, user_id: int) -> bool:
+        return self.active_count(user_id) < self.per_user
+
+    def jobs_ahead(self, job: SearchJob) -> int:
+        """Скільки задач у черзі створено раніше (орієнтовна позиція)"""
+        return sum(
+            1 for other in self._jobs.values()
+            if other.status == 'queued' and other.id < job.id
+        )
+
+    async def submit(self, user_id: int, chat_id: int, message_id: int,
+                     gifter_ids: List[str]) -> Optional[SearchJob]:
+        """Ставить пошук у чергу; None — ліміт користувача або помилка БД"""
+        if not self.can_submit(user_id):
+            return None
+        job_id = await self.bot.adb.create_search_job(
+            user_id, chat_id, message_id, gifter_ids, GIFTER_SEARCH_ENGINE
+        )
+        if job_id is None:
+            return None
+        job = SearchJob(job_id, user_id, chat_id, message_id, gifter_ids, GIFTER_SEARCH_ENGINE)
+        self._enqueue(job)
+        return job
+
+    async def cancel(self, job_id: int, user_id: int) -> bool:
+        """
+        Скасовує задачу користувача. Задача в черзі знімається одразу,
+        пошук, що виконується, зупиняється на наступному стрімі.
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return False
+        job.cancel_event.set()
+        if job.status == 'queued':
+            queue = self._queues.get(job.user_id)
+            if queue is not None and job in queue:
+                queue.remove(job)
+                if not queue:
+                    del self._queues[job.user_id]
+            await self._finish(job, 'cancelled')
+            await self.bot.search_handlers.show_job_result(job, None)
+        return True
+
+    # ── черга ─────────────────────────────────────────────────────
+
+    def _enqueue(self, job: SearchJob) -> None:
+        self._jobs[job.id] = job
+        self._queues.setdefault(job.user_id, deque()).append(job)
+        self._available.release()
+
+    def _next_job(self) -> Optional[SearchJob]:
+        """Round-robin: перша задача першого користувача, користувач — у кінець кола"""
+        if not self._queues:
+            return None   # задачу скасували, поки вона чекала
+        user_id, queue = self._queues.popitem(last=False)
+        job = queue.popleft()
+        if queue:
+            self._queues[user_id] = queue
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            await self._available.acquire()
+            job = self._next_job()
+            if job is not None:
+                await self._run(job)
+
+    # ── виконання ─────────────────────────────────────────────────
+
+    async def _run(self, job: SearchJob) -> None:
+        job.status = 'running'
+        await self.bot.adb.update_search_job(job.id, status='running', started_at='now')
+        await self.bot.search_handlers.show_job_progress(job)
+        reporter = asyncio.create_task(self._report_progress(job))
+
+        try:
+            results = await self._search(job)
+            if job.cancel_event.is_set():
+                status = 'cancelled'
+            elif results.get('error'):
+                status = 'failed'
+            else:
+                status = 'done'
+            if status == 'done' and results.get('found_gifters'):
+                job.result_path = await asyncio.get_running_loop().run_in_executor(
+                    None, save_search_results, results
+                )
+        except asyncio.CancelledError:
+            raise   # зупинка бота: задача лишається 'running' і відновиться
+        except Exception as exc:
+            logging.error(f"Помилка пошукової задачі {job.id}: {exc}")
+            results, status = {'error': str(exc)}, 'failed'
+        finally:
+            reporter.cancel()
+            # Дочікуємося: пізнє оновлення прогресу не має перетерти результат
+            with contextlib.suppress(asyncio.CancelledError):
+                await reporter
+
+        await self._finish(job, status, results)
+        await self.bot.search_handlers.show_job_result(job, results)
+
+    async def _search(self, job: SearchJob) -> Dict:
+        params = dict(
+            SEARCH_PARAMS, gifter_ids=job.gifter_ids,
+            progress=job.report, cancel_event=job.cancel_event
+        )
+
+        if job.engine == 'selenium':
+            pool = self._get_browser_pool()
+
+            def search():
+                with pool.searcher() as searcher:
+                    return searcher.search_gifters(**params)
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), search)
+
+        searcher = ApiGifterSearcher(self.bot.async_api_client)
+        return await searcher.search_gifters(**params)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # +1 потік — на прогрів пулу браузерів паралельно з пошуками
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent + 1, thread_name_prefix='gifter-search'
+            )
+        return self._executor
+
+    def _get_browser_pool(self) -> BrowserPool:
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool(size=max(BROWSER_POOL_SIZE, self.max_concurrent))
+        return self.browser_pool
+
+    async def _report_progress(self, job: SearchJob) -> None:
+        """Не частіше ніж раз на SEARCH_PROGRESS_INTERVAL: прогрес у БД і в чат"""
+        shown = (job.done, job.total)
+        while True:
+            await asyncio.sleep(SEARCH_PROGRESS_INTERVAL)
+            current = (job.done, job.total)
+            if current == shown:
+                continue
+            shown = current
+            await self.bot.adb.update_search_job(job.id, done=job.done, total=job.total)
+            await self.bot.search_handlers.show_job_progress(job)
+
+    async def _finish(self, job: SearchJob, status: str, results: Optional[Dict] = None) -> None:
+        job.status = status
+        self._jobs.pop(job.id, None)
+        results = results or {}
+        await self.bot.adb.update_search_job(
+            job.id, status=status, done=job.done, total=job.total,
+            found=results.get('total_found', 0), error=results.get('error'),
+            result_path=job.result_path, finished_at='now'
+        )
@@ -0,0 +1,165 @@
+"""
+Сховище сесій користувачів (user_states, temp_data) з TTL, лімітом розміру
+та необов'язковим збереженням у SQLite
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import SESSION_MAX_SIZE, SESSION_TTL
+
+
+def _deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Приблизний розмір об'єкта разом із вкладеними контейнерами (байти)"""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+class SessionStore(MutableMapping):
+    """
+    dict-сумісне сховище user_id → значення сесії.
+
+    - TTL: запис, до якого не зверталися `ttl` секунд, вилучається
+      (touch_on_read=False — відлік лише від запису, як для станів розмови)
+    - max_size: понад ліміт вилучається найдавніший запис (LRU)
+    - dump()/load() — знімок для SQLite-бекенда (див. DatabaseManager.save_sessions)
+    """
+
+    def __init__(
+        self, namespace: str, ttl: Optional[float] = SESSION_TTL,
+        max_size: int = SESSION_MAX_SIZE, touch_on_read: bool = True
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_size = max_size
+        self.touch_on_read = touch_on_read
+        # key → (value, stamp); stamp — time.time(), щоб переживати рестарт
+        self._data: 'OrderedDict[Any, Tuple[Any, float]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.evicted_ttl = 0
+        self.evicted_size = 0
+
+    # ── MutableMapping ────────────────────────────────────────────
+
+    def __getitem__(self, key):
+        with self._lock:
+            value, stamp = self._data[key]
+            if self._expired(stamp):
+                del self._data[key]
+                self.evicted_ttl += 1
+                raise KeyError(key)
+            if self.touch_on_read:
+                self._data[key] = (value, time.time())
+                self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evicted_size += 1
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+
+    # __iter__/__len__ спершу вилучають прострочені записи: інакше ключ з
+    # ітерації кидав би KeyError у __getitem__ (values(), dict(store), ...)
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            self.evict_expired()
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.evict_expired()
+            return len(self._data)
+
+    def items(self) -> List[Tuple[Any, Any]]:
+        """Знімок живих пар без оновлення часу звернення"""
+        with self._lock:
+            return [(k, v) for k, (v, stamp) in self._data.items() if not self._expired(stamp)]
+
+    def __repr__(self) -> str:
+        return f"SessionStore({self.namespace!r}, live={len(self)})"
+
+    # ── TTL ───────────────────────────────────────────────────────
+
+    def _expired(self, stamp: float) -> bool:
+        return self.ttl is not None and time.time() - stamp > self.ttl
+
+    def age(self, key) -> float:
+        """Секунди з останнього запису (або звернення, якщо touch_on_read)"""
+        entry = self._data.get(key)
+        return time.time() - entry[1] if entry else 0.0
+
+    def evict_expired(self) -> int:
+        """Вилучає всі записи зі сплилим TTL; повертає кількість"""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            expired = [k for k, (_, stamp) in self._data.items() if self._expired(stamp)]
+            for key in expired:
+                del self._data[key]
+            self.evicted_ttl += len(expired)
+            return len(expired)
+
+    # ── Метрики ───────────────────────────────────────────────────
+
+    def stats(self) -> Dict:
+        """Кількість живих сесій, вилучення та приблизна пам'ять"""
+        with self._lock:
+            self.evict_expired()
+            return {
+                'namespace': self.namespace,
+                'live': len(self._data),
+                'evicted_ttl': self.evicted_ttl,
+                'evicted_size': self.evicted_size,
+                'approx_bytes': _deep_sizeof(self._data),
+            }
+
+    # ── Збереження (SQLite-бекенд) ────────────────────────────────
+
+    def dump(self) -> List[Tuple[str, str, float]]:
+        """
+        Знімок для запису в БД: [(key_json, value_json, stamp)].
+        Значення, які не серіалізуються в JSON, пропускаються.
+        """
+        rows = []
+        with self._lock:
+            for key, (value, stamp) in self._data.items():
+                try:
+                    rows.append((json.dumps(key), json.dumps(value), stamp))
+                except (TypeError, ValueError):
+                    logging.debug(f"SessionStore {self.namespace}: пропущено {key!r}")
+        return rows
+
+    def load(self, rows: List[Tuple[str, str, float]]) -> int:
+        """Відновлює записи зі знімка (прострочені пропускаються)"""
+        loaded = 0
+        with self._lock:
+            for key_json, value_json, stamp in sorted(rows, key=lambda r: r[2]):
+                if self._expired(stamp):
+                    continue
+                try:
+                    self._data[json.loads(key_json)] = (json.loads(value_json), stamp)
+                    loaded += 1
+                except ValueError as exc:
+                    logging.error(f"SessionStore {self.namespace} load: {exc}")
+        return loaded
@@ -0,0 +1,100 @@
+"""
+Короткоживучий кеш знімків Tango для пошуку дарувальників.
+
+Кілька менторів, що шукають з різницею в хвилини, отримують ті самі
+сторінки feed (byTags) і ті самі topGifters стрімів. Кеш тримає ці
+відповіді SEARCH_SNAPSHOT_TTL секунд (не більше SEARCH_SNAPSHOT_SIZE
+записів, LRU), а однакові запити, що летять одночасно, об'єднує в один.
+Значення спільні для всіх пошуків — їх лише читають, не змінюють.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from config import SEARCH_SNAPSHOT_SIZE, SEARCH_SNAPSHOT_TTL
+
+
+class SnapshotCache:
+    """
+    TTL + LRU кеш ключ → знімок. None не кешується (помилка або порожня
+    відповідь запитується знову). Потокобезпечний: ним користуються
+    event loop (API-рушій) і потоки selenium-пошуку.
+    """
+
+    def __init__(self, ttl: float = SEARCH_SNAPSHOT_TTL, maxsize: int = SEARCH_SNAPSHOT_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0   # промахи, що дочекалися чужого запиту замість свого
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Свіжий знімок або None"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if value is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            # Прострочені записи звільняють пам'ять одразу, не чекаючи витіснення
+            while self._data:
+                oldest_key, (expires, _) = next(iter(self._data.items()))
+                if expires >= now and len(self._data) <= self.maxsize:
+                    break
+                del self._data[oldest_key]
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Знімок з кешу; інакше — результат fetch(). Поки fetch для ключа
+        виконується, інші виклики з тим самим ключем чекають його ж.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.joined += 1
+        else:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._fetched(key, done))
+        # shield: скасування одного пошуку не зриває запит для інших
+        return await asyncio.shield(task)
+
+    def _fetched(self, key: Hashable, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self.put(key, task.result())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'joined': self.joined,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+            }
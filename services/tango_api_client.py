@@ -1,17 +1,33 @@
+import asyncio
 import requests
 import uuid
 import json
 import base64
 import re
 from datetime import datetime
-from typing import Tuple, Optional
+from typing import TYPE_CHECKING, Tuple, Optional
+
+from config import TANGO_GATEWAY, TANGO_HTTP_KEEPALIVE, TANGO_HTTP_MAX_CONNECTIONS, TANGO_HTTP_TIMEOUT
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "application/json",
+    "Referer": "https://tango.me/",
+}
+
+# aiohttp імпортується при першому async-запиті (див. AsyncTangoAPIClient._get_session)
+if TYPE_CHECKING:
+    import aiohttp
+
 
 class TangoAPIClient:
-    def __init__(self, token_file="tango_token.json"):
+    def __init__(self, token_file="tango_token.json", gateway: str = TANGO_GATEWAY):
         self.token_file = token_file
+        self.gateway = gateway
         self.device_id = None
         self.visitor_token = None
         self.token_expires = 0
+        self.session = requests.Session()  # keep-alive між запитами
         self._load_token()
     
     def _load_token(self):
@@ -49,7 +65,7 @@ class TangoAPIClient:
         if not self.device_id:
             self.device_id = str(uuid.uuid4()).replace("-", "")
         
-        url = "https://gateway.tango.me/visitor-lobby/api/public/visitors/v1/check-in"
+        url = f"{self.gateway}/visitor-lobby/api/public/visitors/v1/check-in"
         
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
@@ -60,11 +76,12 @@ class TangoAPIClient:
             "Cookie": f"Tango-DeviceId={self.device_id}"
         }
         
-        response = requests.post(
+        response = self.session.post(
             url,
             headers=headers,
             params={"appId": "tango"},
-            json={}
+            json={},
+            timeout=TANGO_HTTP_TIMEOUT
         )
         
         if response.status_code != 200:
@@ -99,14 +116,9 @@ class TangoAPIClient:
         """Виконує API запит з автоматичним оновленням токену"""
         self._ensure_valid_token()
         
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-            "Accept": "application/json",
-            "Referer": "https://tango.me/",
-            "Cookie": f"Tango-VT={self.visitor_token}"
-        }
+        headers = {**DEFAULT_HEADERS, "Cookie": f"Tango-VT={self.visitor_token}"}
         
-        response = requests.get(url, headers=headers, params=params)
+        response = self.session.get(url, headers=headers, params=params, timeout=TANGO_HTTP_TIMEOUT)
         
         if response.status_code in [401, 403]:
             # Токен недійсний, примусово оновлюємо
@@ -114,13 +126,13 @@ class TangoAPIClient:
             self._refresh_visitor_token()
             # Повторюємо запит з новим токеном
             headers["Cookie"] = f"Tango-VT={self.visitor_token}"
-            response = requests.get(url, headers=headers, params=params)
+            response = self.session.get(url, headers=headers, params=params, timeout=TANGO_HTTP_TIMEOUT)
         
         return response
     
     def convert_alias(self, alias: str) -> Optional[str]:
         """Конвертує alias в account ID"""
-        url = "https://gateway.tango.me/visitors/profilealias/api/alias/convert"
+        url = f"{self.gateway}/visitors/profilealias/api/alias/convert"
         response = self._make_api_request(url, params={"alias": alias})
         
         if response.status_code == 200:
@@ -129,7 +141,7 @@ class TangoAPIClient:
     
     def get_profile(self, account_id: str) -> Optional[dict]:
         """Отримує інформацію про профіль користувача"""
-        url = f"https://gateway.tango.me/proxycador/api/profiles/v2/single?id={account_id}&basicProfile=true&liveStats=true&followStats=true"
+        url = f"{self.gateway}/proxycador/api/profiles/v2/single?id={account_id}&basicProfile=true&liveStats=true&followStats=true"
 
         response = self._make_api_request(url)
         
@@ -142,12 +154,27 @@ class TangoAPIClient:
         Повертає кількість діамантів (liveStats.points) для стрімера.
         Використовує той самий токен що й get_profile().
         """
-        profile = self.get_profile(account_id)
+        return self.extract_diamonds(self.get_profile(account_id))
+
+    @staticmethod
+    def extract_diamonds(profile: Optional[dict]) -> Optional[int]:
+        """liveStats.points з відповіді профілю"""
         if not profile:
             return None
         points = profile.get("liveStats", {}).get("points")
         return int(points) if points is not None else None
 
+    @staticmethod
+    def extract_user_name(profile: dict) -> str:
+        """Ім'я користувача з відповіді профілю"""
+        return (
+            profile.get("displayName")
+            or profile.get("name")
+            or profile.get("basicProfile", {}).get("firstName")
+            or (profile.get("basicProfile", {}).get("aliases", [{}])[0].get("alias"))
+            or "Unknown"
+        )
+
     def extract_id_from_url(self, url: str) -> Optional[Tuple[str, str]]:
         """
         Витягує ID або alias з URL Tango.me
@@ -202,23 +229,168 @@ class TangoAPIClient:
             raise Exception(f"Не вдалося завантажити профіль {account_id}")
         
         # Витягуємо ім'я
-        user_name = (
-            profile.get("displayName")
-            or profile.get("name")
-            or profile.get("basicProfile", {}).get("firstName")
-            or (profile.get("basicProfile", {}).get("aliases", [{}])[0].get("alias"))
-            or "Unknown"
-        )
+        user_name = self.extract_user_name(profile)
         
         return account_id, user_name
     
+    def close(self):
+        """Закриває HTTP-сесію"""
+        self.session.close()
+    
     def __enter__(self):
         """Context manager enter"""
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        pass
+        self.close()
+
+
+class AsyncTangoAPIClient:
+    """
+    Асинхронний клієнт Tango API на aiohttp.
+    Один пул keep-alive з'єднань на весь бот, таймаут на кожен запит
+    і обмеження кількості одночасних запитів.
+    Токен (visitor token) ділиться з синхронним TangoAPIClient.
+    """
+
+    def __init__(
+        self, token_client: Optional[TangoAPIClient] = None,
+        max_connections: int = TANGO_HTTP_MAX_CONNECTIONS,
+        timeout: float = TANGO_HTTP_TIMEOUT,
+    ):
+        self.token_client = token_client or TangoAPIClient()
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._token_lock = asyncio.Lock()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Створює сесію при першому запиті (потрібен запущений event loop)"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=TANGO_HTTP_KEEPALIVE,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=DEFAULT_HEADERS,
+            )
+        return self._session
+
+    async def _refresh_token(self, force: bool = False, stale: Optional[str] = None) -> None:
+        """
+        Оновлення токену через синхронний клієнт (рідко, тому в executor).
+        stale — токен, з яким запит отримав 401/403: якщо поки ми чекали
+        на замок його вже замінив інший запит, повторна реєстрація не потрібна.
+        """
+        async with self._token_lock:
+            if force and stale is not None and self.token_client.visitor_token != stale:
+                return
+            loop = asyncio.get_running_loop()
+            if force:
+                await loop.run_in_executor(None, self.token_client._refresh_visitor_token)
+            else:
+                await loop.run_in_executor(None, self.token_client._ensure_valid_token)
+
+    async def _make_api_request(self, url: str, params: dict = None) -> Tuple[int, Optional[str]]:
+        """Виконує GET-запит, повертає (status, body) з повтором при 401/403"""
+        if not self.token_client._is_token_valid():
+            await self._refresh_token()
+
+        session = self._get_session()
+        async with self._semaphore:
+            for attempt in range(2):
+                sent_token = self.token_client.visitor_token
+                async with session.get(url, params=params, cookies={"Tango-VT": sent_token}) as response:
+                    if response.status not in (401, 403) or attempt > 0:
+                        body = await response.text() if response.status == 200 else None
+                        return response.status, body
+                # Відповідь уже закрита, з'єднання не тримається під час оновлення
+                await self._refresh_token(force=True, stale=sent_token)
+        return 0, None
+
+    async def convert_alias(self, alias: str) -> Optional[str]:
+        """Конвертує alias в account ID"""
+        url = f"{self.token_client.gateway}/visitors/profilealias/api/alias/convert"
+        status, body = await self._make_api_request(url, params={"alias": alias})
+        if status == 200 and body:
+            return body.strip().strip('"')
+        return None
+
+    async def get_profile(self, account_id: str) -> Optional[dict]:
+        """Отримує інформацію про профіль користувача"""
+        url = (
+            f"{self.token_client.gateway}/proxycador/api/profiles/v2/single"
+            f"?id={account_id}&basicProfile=true&liveStats=true&followStats=true"
+        )
+        status, body = await self._make_api_request(url)
+        if status == 200 and body:
+            return json.loads(body)
+        return None
+
+    async def get_diamonds(self, account_id: str) -> Optional[int]:
+        """Кількість діамантів (liveStats.points) для стрімера"""
+        return TangoAPIClient.extract_diamonds(await self.get_profile(account_id))
+
+    async def get_live_feed(self, tag: str, page: int, page_size: int = 50) -> Optional[dict]:
+        """Сторінка стрімів у категорії (popular, nearby, following, hottest)"""
+        url = f"{self.token_client.gateway}/proxycador/api/live/feeds/v1/byTags"
+        status, body = await self._make_api_request(
+            url, params={"tag": tag, "pageCount": page, "pageSize": page_size}
+        )
+        if status == 200 and body:
+            return json.loads(body)
+        return None
+
+    async def get_top_gifters(self, stream_id: str, page_size: int = 100) -> Optional[dict]:
+        """Дарувальники та глядачі стріму"""
+        url = (
+            f"{self.token_client.gateway}/proxycador/api/public/v1/live/stream/social/v1/"
+            f"{stream_id}/topGifters"
+        )
+        status, body = await self._make_api_request(
+            url, params={"pageCount": 0, "pageSize": page_size, "enableViewers": "true"}
+        )
+        if status == 200 and body:
+            return json.loads(body)
+        return None
+
+    async def get_user_id_from_url(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Отримує user ID та ім'я з URL
+        Повертає: (user_id, user_name)
+        """
+        extracted = self.token_client.extract_id_from_url(url)
+
+        if not extracted:
+            raise ValueError("Не вдалося розпізнати URL")
+
+        identifier, id_type = extracted
+
+        if id_type == 'alias':
+            account_id = await self.convert_alias(identifier)
+            if not account_id:
+                raise Exception(f"Не вдалося конвертувати alias '{identifier}'")
+        else:
+            account_id = identifier
+
+        profile = await self.get_profile(account_id)
+
+        if not profile:
+            raise Exception(f"Не вдалося завантажити профіль {account_id}")
+
+        return account_id, TangoAPIClient.extract_user_name(profile)
+
+    async def close(self) -> None:
+        """Закриває пул з'єднань"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
 
 
 # Тестування